@@ -1,5 +1,6 @@
 import os
 from dotenv import load_dotenv
+from src.utils.db_engine import dispose_engines
 
 ENVS = ["dev", "test", "prod"]
 
@@ -69,7 +70,12 @@ def cleanup_previous_env():
     variables to avoid any potential conflicts
     or confusion when switching between different
     environments.
+    Cached database engines are disposed as well so
+    no pooled connections to the previous environment
+    are reused.
     """
+    dispose_engines()
+
     keys_to_clear = [
         "SOURCE_DB_NAME",
         "SOURCE_DB_USER",
@@ -0,0 +1,242 @@
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.utils.instrumentation import stage
+from src.utils.json_files import write_json_atomic
+
+RAW_DIR = Path(__file__).resolve().parents[2] / "data" / "raw"
+
+# Validators (ETag / Last-Modified) and checksums of every downloaded file,
+# keyed by path relative to the raw folder
+STATE_PATH = RAW_DIR / "download_state.json"
+
+# Defaults, overridable with EXTRACT_WORKERS, EXTRACT_TIMEOUT and EXTRACT_RETRIES
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 60      # seconds per request
+DEFAULT_RETRIES = 3
+BLOCK_SIZE = 1024 * 1024
+
+
+def extract_ae_data(catalogue: str | Path | list[dict] | None = None, raw_dir: Path = RAW_DIR,
+                    state_path: Path | None = None, max_workers: int | None = None) -> list[dict]:
+    """
+    Download the monthly A&E CSVs listed in a catalogue into the raw data folder.
+
+    Files are downloaded concurrently with at most `max_workers` requests in
+    flight. Each request is conditional (If-None-Match / If-Modified-Since)
+    on the validators saved from the previous download, so unchanged files
+    are skipped and keep their modification time, which in turn keeps the
+    incremental transform from reprocessing them. Downloads stream to a
+    .part file that is resumed with a Range request after a failure, and are
+    checked against the catalogue's sha256 (when given) before replacing the
+    raw file.
+
+    Catalogue entries are dicts with:
+        url: where to download the CSV from
+        period: "YYYY-MM", saved as ae_YYYY/ae_YYYY_MM.csv
+        path: raw file path relative to raw_dir, instead of period (optional)
+        sha256: expected checksum of the file (optional)
+
+    Args:
+        catalogue: Catalogue entries, or a JSON file holding them. Defaults to
+            the EXTRACT_CATALOGUE environment variable; with no catalogue
+            nothing is downloaded.
+        raw_dir (Path): Raw data folder the files are saved under.
+        state_path (Path | None): Download state file. Defaults to
+            download_state.json in raw_dir.
+        max_workers (int | None): Concurrent downloads. Defaults to the
+            EXTRACT_WORKERS environment variable, then 4.
+
+    Returns:
+        list[dict]: One result per entry with its path, status ("downloaded",
+        "resumed", "not_modified" or "failed"), bytes transferred and any error.
+    """
+    catalogue = catalogue if catalogue is not None else os.getenv("EXTRACT_CATALOGUE")
+    if not catalogue:
+        print("No extract catalogue configured, skipping download.")
+        return []
+
+    entries = load_catalogue(catalogue) if isinstance(catalogue, (str, Path)) else catalogue
+    raw_dir = Path(raw_dir)
+    state_path = Path(state_path) if state_path else raw_dir / STATE_PATH.name
+    if max_workers is None:
+        max_workers = int(os.getenv("EXTRACT_WORKERS") or DEFAULT_WORKERS)
+
+    state = _load_state(state_path)
+    lock = threading.Lock()
+
+    def download(entry):
+        key = catalogue_path(entry)
+        try:
+            result, record = download_file(entry["url"], raw_dir / key, state["files"].get(key),
+                                           entry.get("sha256"))
+        except Exception as e:
+            return {"path": key, "status": "failed", "bytes": 0, "error": f"{type(e).__name__}: {e}"}
+
+        # Saved after every file so completed downloads survive an interrupted run
+        with lock:
+            state["files"][key] = record
+            write_json_atomic(state, state_path, indent=2, sort_keys=True)
+        return {"path": key, **result}
+
+    with stage("extract", files=len(entries)) as record:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(entries) or 1))) as executor:
+            results = list(executor.map(download, entries))
+
+        for status in ("downloaded", "resumed", "not_modified", "failed"):
+            record[status] = sum(r["status"] == status for r in results)
+        record["bytes_downloaded"] = sum(r["bytes"] for r in results)
+
+    print(
+        f"Extract complete: {record['downloaded'] + record['resumed']} downloaded, "
+        f"{record['not_modified']} unchanged, {record['failed']} failed "
+        f"({record['bytes_downloaded'] / (1024 * 1024):.1f} MB)"
+    )
+    for result in results:
+        if result["status"] == "failed":
+            print(f"- {result['path']}: {result['error']}")
+    return results
+
+
+def load_catalogue(path: str | Path) -> list[dict]:
+    """Read catalogue entries from a JSON file holding a list (or {"files": [...]})."""
+    with open(path) as f:
+        catalogue = json.load(f)
+    return catalogue["files"] if isinstance(catalogue, dict) else catalogue
+
+
+def catalogue_path(entry: dict) -> str:
+    """Return the raw file path (relative to the raw folder) a catalogue entry is saved to."""
+    if entry.get("path"):
+        return entry["path"]
+    year, month = entry["period"].split("-")[:2]
+    return f"ae_{year}/ae_{year}_{int(month):02d}.csv"
+
+
+def download_file(url: str, target: Path, previous: dict | None = None, sha256: str | None = None,
+                  retries: int | None = None, timeout: float | None = None) -> tuple[dict, dict]:
+    """
+    Download one file, skipping it if unchanged and resuming a partial download.
+
+    The partial download is kept in <target>.part, with the validators needed
+    to resume it in <target>.part.json.
+
+    Args:
+        url (str): URL to download.
+        target (Path): File to write.
+        previous (dict | None): State recorded by the last download of this
+            file, used for the conditional request.
+        sha256 (str | None): Expected checksum of the complete file.
+        retries (int | None): Attempts after a network error. Defaults to
+            EXTRACT_RETRIES, then 3. Each retry resumes where the last stopped.
+        timeout (float | None): Seconds per request. Defaults to EXTRACT_TIMEOUT, then 60.
+
+    Returns:
+        tuple[dict, dict]: The result (status and bytes transferred) and the
+        state to record for the file.
+
+    Raises:
+        ValueError: If the downloaded file does not match `sha256`.
+        urllib.error.URLError: If the download still fails after the retries.
+    """
+    if retries is None:
+        retries = int(os.getenv("EXTRACT_RETRIES") or DEFAULT_RETRIES)
+    if timeout is None:
+        timeout = float(os.getenv("EXTRACT_TIMEOUT") or DEFAULT_TIMEOUT)
+
+    for attempt in range(retries + 1):
+        try:
+            return _download(url, Path(target), previous or {}, sha256, timeout)
+        except (urllib.error.URLError, http.client.HTTPException, TimeoutError, ConnectionError) as e:
+            if (isinstance(e, urllib.error.HTTPError) and e.code < 500) or attempt == retries:
+                raise
+            time.sleep(min(2 ** attempt, 30))
+
+
+def _download(url: str, target: Path, previous: dict, sha256: str | None, timeout: float) -> tuple[dict, dict]:
+    """Make one download attempt, see download_file."""
+    part = target.with_name(target.name + ".part")
+    part_validators = target.with_name(target.name + ".part.json")
+    headers = {}
+
+    # Only send validators if the file they describe is still on disk
+    if target.exists() and previous.get("sha256"):
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+    # Resume a partial download, as long as the server's copy has not changed since
+    partial = json.loads(part_validators.read_text()) if part_validators.exists() else {}
+    if part.exists() and part.stat().st_size and (partial.get("etag") or partial.get("last_modified")):
+        headers["Range"] = f"bytes={part.stat().st_size}-"
+        headers["If-Range"] = partial.get("etag") or partial["last_modified"]
+
+    try:
+        response = urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return {"status": "not_modified", "bytes": 0}, previous
+        if e.code == 416:
+            # The partial file no longer lines up with the server's copy: start again
+            part.unlink(missing_ok=True)
+            part_validators.unlink(missing_ok=True)
+            return _download(url, target, previous, sha256, timeout)
+        raise
+
+    with response:
+        validators = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        resumed = response.status == 206
+
+        digest = hashlib.sha256()
+        if resumed:
+            with open(part, "rb") as f:
+                for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+                    digest.update(block)
+
+        # Record the validators first so an interrupted download can be resumed, even by a later run
+        target.parent.mkdir(parents=True, exist_ok=True)
+        part_validators.write_text(json.dumps({"etag": validators["etag"], "last_modified": validators["last_modified"]}))
+        received = 0
+        with open(part, "ab" if resumed else "wb") as f:
+            for block in iter(lambda: response.read(BLOCK_SIZE), b""):
+                f.write(block)
+                digest.update(block)
+                received += len(block)
+
+        length = response.headers.get("Content-Length")
+        if length is not None and received != int(length):
+            raise ConnectionError(f"Connection closed after {received} of {length} bytes")
+
+    checksum = digest.hexdigest()
+    if sha256 and checksum != sha256.lower():
+        part.unlink(missing_ok=True)
+        part_validators.unlink(missing_ok=True)
+        raise ValueError(f"Checksum mismatch for {url}: expected {sha256}, got {checksum}")
+
+    os.replace(part, target)
+    part_validators.unlink(missing_ok=True)
+    record = {**validators, "sha256": checksum, "size": target.stat().st_size}
+    return {"status": "resumed" if resumed else "downloaded", "bytes": received}, record
+
+
+def _load_state(path: Path) -> dict:
+    """Load the download state, or an empty one if nothing has been downloaded yet."""
+    if not Path(path).exists():
+        return {"files": {}}
+    with open(path) as f:
+        state = json.load(f)
+    state.setdefault("files", {})
+    return state
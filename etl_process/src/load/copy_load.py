@@ -0,0 +1,134 @@
+import io
+import os
+
+import pandas as pd  # type: ignore
+from sqlalchemy import bindparam, text
+
+from src.load.ddl import COLUMN_TYPES, create_year_partitions, partition_by_year, prepare_target_table
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def copy_load(df, engine, schema: str, table: str,
+              periods: list[str] | None = None, chunk_size: int | None = None):
+    """
+    Load a DataFrame into Postgres with COPY FROM STDIN via a staging table.
+
+    The target table is created with its managed DDL if needed. The frame is
+    streamed into a temporary staging table in CSV chunks, then, in the same
+    transaction, the target rows for `periods` (or all rows for a full load)
+    are deleted and replaced from staging. The table, its keys and indexes
+    survive the load, and readers see the old rows until the commit.
+
+    Args:
+        df (pd.DataFrame | Iterable[pd.DataFrame]): Data to load, either one
+            frame or batches of it (e.g. from read.iter_input), which are
+            copied into staging one at a time.
+        engine: SQLAlchemy engine for a Postgres database (psycopg2 or psycopg 3).
+        schema (str): Target schema.
+        table (str): Target table.
+        periods (list[str] | None): ISO dates of the periods to upsert. Default
+            is None, which replaces every row.
+        chunk_size (int | None): Rows per COPY chunk. Defaults to the
+            TARGET_COPY_CHUNK_SIZE environment variable, then 50,000.
+    """
+    if chunk_size is None:
+        chunk_size = int(os.getenv("TARGET_COPY_CHUNK_SIZE") or DEFAULT_CHUNK_SIZE)
+
+    staging = f'"{table}_staging"'
+
+    with engine.begin() as conn:
+        frames, periods = prepare_batches(conn, schema, table, df, periods)
+
+        conn.execute(text(
+            f'CREATE TEMP TABLE {staging} (LIKE "{schema}"."{table}") ON COMMIT DROP'
+        ))
+        with conn.connection.cursor() as cursor:
+            for frame in frames:
+                copy_dataframe(cursor, frame, staging, chunk_size)
+
+        delete_periods(conn, schema, table, periods)
+        # The staging table is LIKE the target, so its columns line up
+        conn.execute(text(f'INSERT INTO "{schema}"."{table}" SELECT * FROM {staging}'))
+
+
+def prepare_batches(conn, schema: str, table: str, df, periods: list[str] | None):
+    """
+    Prepare the target table and the frames to load into it.
+
+    Args:
+        conn: SQLAlchemy connection inside the load transaction.
+        schema (str): Target schema.
+        table (str): Target table.
+        df (pd.DataFrame | Iterable[pd.DataFrame]): Data to load.
+        periods (list[str] | None): ISO dates of the periods to upsert.
+
+    Returns:
+        tuple: A generator of prepared frames, filtered to `periods`, and the
+        periods to replace, which is None if the table was just (re)created
+        and so needs every row.
+    """
+    batches = [df] if isinstance(df, pd.DataFrame) else df
+    created = prepare_target_table(conn, schema, table)
+    # A freshly created table has nothing to merge into, so every period is loaded
+    if created:
+        periods = None
+
+    def frames():
+        for batch in batches:
+            frame = prepare_frame(batch)
+            if partition_by_year():
+                create_year_partitions(conn, schema, table, frame["period"].dt.year.unique())
+            if periods is not None:
+                frame = filter_periods(frame, periods)
+            if len(frame):
+                yield frame
+
+    return frames(), periods
+
+
+def copy_dataframe(cursor, df: pd.DataFrame, qualified_table: str, chunk_size: int):
+    """Stream a DataFrame into an existing table with COPY FROM STDIN, one CSV chunk at a time."""
+    columns = ", ".join(f'"{c}"' for c in df.columns)
+    copy_sql = f"COPY {qualified_table} ({columns}) FROM STDIN WITH (FORMAT csv)"
+
+    for start in range(0, len(df), chunk_size):
+        buffer = io.StringIO()
+        df.iloc[start:start + chunk_size].to_csv(
+            buffer, index=False, header=False, date_format="%Y-%m-%d"
+        )
+        buffer.seek(0)
+        if hasattr(cursor, "copy_expert"):
+            cursor.copy_expert(copy_sql, buffer)  # psycopg2
+        else:
+            with cursor.copy(copy_sql) as copy:  # psycopg 3
+                copy.write(buffer.getvalue())
+
+
+def delete_periods(conn, schema: str, table: str, periods: list[str] | None):
+    """Delete the target rows for `periods`, or every row when periods is None."""
+    if periods is None:
+        conn.execute(text(f'DELETE FROM "{schema}"."{table}"'))
+        return
+
+    conn.execute(
+        text(f'DELETE FROM "{schema}"."{table}" WHERE period IN :periods')
+        .bindparams(bindparam("periods", expanding=True)),
+        {"periods": pd.to_datetime(pd.Series(periods)).dt.date.tolist()},
+    )
+
+
+def filter_periods(df: pd.DataFrame, periods: list[str]) -> pd.DataFrame:
+    """Keep only the rows whose period is one of `periods`."""
+    return df[df["period"].isin(pd.to_datetime(pd.Series(periods)))]
+
+
+def prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Keep the target table's columns and coerce them to match their Postgres types."""
+    df = df[[c for c in COLUMN_TYPES if c in df.columns]].copy()
+    df["period"] = pd.to_datetime(df["period"])
+    for col, col_type in COLUMN_TYPES.items():
+        if col in df.columns and col_type.startswith("INTEGER"):
+            # CSV round trips turn counts into floats (21420.0), which COPY rejects
+            df[col] = pd.to_numeric(df[col]).round().astype("Int64")
+    return df
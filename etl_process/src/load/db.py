@@ -1,5 +1,5 @@
-import os
-from src.utils.db_engine import db_engine
+from sqlalchemy import text
+from src.utils.db_engine import db_engine, get_target as get_db_target
 
 # This file wraps my existing database engine 
 # This file is used by load.py to connect to the database. 
@@ -12,6 +12,30 @@ def get_engine(db="TARGET"):
 
 def get_target():
     """Return schema and table name for target database."""
-    schema = os.getenv("TARGET_DB_SCHEMA") or "public"
-    table = os.getenv("TARGET_DB_TABLE") or "ae_attendances"
-    return schema, table
+    return get_db_target()
+
+# And records a load version so dashboard caches know when the data changed
+
+def record_load_version(engine, schema: str, periods: list[str] | None = None):
+    """
+    Insert a new row into {schema}.etl_load_version after a successful load.
+
+    The dashboard's query cache compares the latest version with the one its
+    cached results were loaded under and discards them when it moves on.
+
+    Args:
+        engine: SQLAlchemy engine for the target database.
+        schema (str): Target schema.
+        periods (list[str] | None): Periods that were loaded, or None for a full load.
+    """
+    with engine.begin() as conn:
+        conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{schema}".etl_load_version ('
+            "version BIGSERIAL PRIMARY KEY, "
+            "loaded_at TIMESTAMPTZ NOT NULL DEFAULT now(), "
+            "periods TEXT)"
+        ))
+        conn.execute(
+            text(f'INSERT INTO "{schema}".etl_load_version (periods) VALUES (:periods)'),
+            {"periods": ",".join(periods) if periods is not None else None},
+        )
@@ -0,0 +1,134 @@
+import os
+
+from sqlalchemy import text
+
+# Explicit Postgres types for the target table, in column order
+COLUMN_TYPES = {
+    "period": "DATE NOT NULL",
+    "org_code": "TEXT NOT NULL",
+    "org_name": "TEXT",
+    "ae_attendances_type_1": "INTEGER",
+    "attendances_over_4hrs_type_1": "INTEGER",
+    "patients_12hr_wait": "INTEGER",
+    "emergency_admissions_type_1": "INTEGER",
+    "postcode": "TEXT",
+    "latitude": "DOUBLE PRECISION",
+    "longitude": "DOUBLE PRECISION",
+}
+
+PRIMARY_KEY = ("period", "org_code")
+
+# Secondary indexes: {name suffix: columns}. The primary key already serves
+# latest-period lookups (MAX(period)) and period filters.
+INDEXES = {
+    "org_code_period_idx": ("org_code", "period"),
+}
+
+
+def partition_by_year() -> bool:
+    """Return True if TARGET_PARTITION_BY_YEAR asks for a table range-partitioned by period year."""
+    return os.getenv("TARGET_PARTITION_BY_YEAR", "").lower() in ("1", "true", "yes")
+
+
+def prepare_target_table(conn, schema: str, table: str, years=(), partitioned: bool | None = None) -> bool:
+    """
+    Make sure the target table exists with the managed DDL.
+
+    The table, its primary key, indexes and (when partitioned) the yearly
+    partitions for `years` are created if missing. A table that exists but
+    was not created by this module, e.g. one left behind by
+    DataFrame.to_sql(if_exists="replace") or one whose partitioning no longer
+    matches the setting, is dropped and recreated.
+
+    Args:
+        conn: SQLAlchemy connection inside a transaction.
+        schema (str): Target schema.
+        table (str): Target table.
+        years: Calendar years of the rows about to be loaded.
+        partitioned (bool | None): Range-partition by period year. Defaults to
+            the TARGET_PARTITION_BY_YEAR environment variable.
+
+    Returns:
+        bool: True if the table was (re)created and so needs a full load.
+    """
+    if partitioned is None:
+        partitioned = partition_by_year()
+
+    state = _table_state(conn, schema, table)
+
+    created = False
+    if not _is_managed(state, partitioned):
+        if state is not None:
+            print(f"Recreating {schema}.{table} with the managed table definition")
+            conn.execute(text(f'DROP TABLE "{schema}"."{table}"'))
+        conn.execute(text(create_table_sql(schema, table, partitioned)))
+        created = True
+
+    if partitioned:
+        create_year_partitions(conn, schema, table, years)
+
+    for suffix, columns in INDEXES.items():
+        column_list = ", ".join(f'"{c}"' for c in columns)
+        conn.execute(text(
+            f'CREATE INDEX IF NOT EXISTS "{table}_{suffix}" '
+            f'ON "{schema}"."{table}" ({column_list})'
+        ))
+
+    return created
+
+
+def create_year_partitions(conn, schema: str, table: str, years):
+    """Create the yearly partitions of a partitioned target table for `years`, if missing."""
+    for year in sorted(set(int(y) for y in years)):
+        conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{schema}"."{table}_{year}" '
+            f'PARTITION OF "{schema}"."{table}" '
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        ))
+
+
+def is_managed_table(conn, schema: str, table: str, partitioned: bool | None = None) -> bool:
+    """
+    Return True if the target table exists with the managed DDL.
+
+    When it does not, the next load recreates it and so needs every period.
+    """
+    if partitioned is None:
+        partitioned = partition_by_year()
+    return _is_managed(_table_state(conn, schema, table), partitioned)
+
+
+def create_table_sql(schema: str, table: str, partitioned: bool = False) -> str:
+    """Return the CREATE TABLE statement for the target table."""
+    column_defs = ",\n    ".join(f'"{c}" {t}' for c, t in COLUMN_TYPES.items())
+    key = ", ".join(f'"{c}"' for c in PRIMARY_KEY)
+    partition_clause = " PARTITION BY RANGE (period)" if partitioned else ""
+    return (
+        f'CREATE TABLE "{schema}"."{table}" (\n'
+        f"    {column_defs},\n"
+        f'    CONSTRAINT "{table}_pkey" PRIMARY KEY ({key})\n'
+        f"){partition_clause}"
+    )
+
+
+def _table_state(conn, schema: str, table: str):
+    """Return the table's relkind and whether it has a primary key, or None if it does not exist."""
+    return conn.execute(text("""
+        SELECT
+            c.relkind,
+            EXISTS (
+                SELECT 1 FROM pg_constraint k WHERE k.conrelid = c.oid AND k.contype = 'p'
+            ) AS has_primary_key
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = :schema AND c.relname = :table
+    """), {"schema": schema, "table": table}).fetchone()
+
+
+def _is_managed(state, partitioned: bool) -> bool:
+    """Return True if a table in `state` has a primary key and the expected partitioning."""
+    return (
+        state is not None
+        and state.has_primary_key
+        and (state.relkind == "p") == partitioned
+    )
@@ -1,31 +1,89 @@
+import os
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-from src.load.db import get_engine, get_target
-from src.load.read import read_input
+import pandas as pd  # type: ignore
 
-def load_data(limit: int | None = None):
-    """Load processed CSV into target database."""
-    # 1. Read data
-    df = read_input(limit)
+from src.load.copy_load import copy_load, delete_periods, prepare_batches
+from src.load.db import get_engine, get_target, record_load_version
+from src.load.ddl import COLUMN_TYPES, is_managed_table
+from src.load.read import iter_input, read_input
+from src.load.summaries import refresh_summary_tables
+from src.utils.instrumentation import stage
 
-    # 2. Get engine + target table info
+LOAD_METHODS = ["copy", "insert"]
+
+def load_data(limit: int | None = None, periods: list[str] | None = None,
+              method: str | None = None, streaming: bool = False):
+    """
+    Load the processed dataset into the target database.
+
+    The target table is created and maintained with explicit types, a
+    (period, org_code) primary key and indexes (see src.load.ddl), so loads
+    replace rows rather than dropping and recreating the table.
+
+    Args:
+        limit (int | None): Only load the first `limit` rows.
+        periods (list[str] | None): ISO dates of the periods to upsert. Rows for
+            these periods are deleted and re-inserted in one transaction, leaving
+            the rest of the table untouched. Default is None, which replaces
+            every row.
+        method (str | None): "copy" streams the data through COPY FROM STDIN into
+            a staging table that is merged into the target; "insert" uses
+            DataFrame.to_sql. Defaults to the TARGET_LOAD_METHOD environment
+            variable, then "copy".
+        streaming (bool): Read and load the processed data in batches instead
+            of reading it all into memory first. Default is False.
+    """
+    method = method or os.getenv("TARGET_LOAD_METHOD") or "copy"
+    if method not in LOAD_METHODS:
+        raise ValueError(f"Unknown load method '{method}'. Expected one of {LOAD_METHODS}")
+
+    # 1. Get engine + target table info
     engine = get_engine("TARGET")
     schema, table = get_target()
 
+    # 2. Read only the table's columns, and only the changed periods unless
+    #    the table is about to be (re)created and needs a full load
+    with engine.connect() as conn:
+        if not is_managed_table(conn, schema, table):
+            periods = None
+    read = iter_input if streaming else read_input
+    df = read(limit, periods=periods, columns=list(COLUMN_TYPES))
+
     # 3. Load into SQL
-    df.to_sql(
-        name=table,
-        con=engine,
-        schema=schema,
-        if_exists="replace",   # replace table
-        index=False
-    )
+    with stage("load", method=method, periods=None if periods is None else len(periods)) as record:
+        if isinstance(df, pd.DataFrame):
+            record["rows_in"] = len(df)
+        if method == "copy":
+            copy_load(df, engine, schema, table, periods=periods)
+        else:
+            insert_load(df, engine, schema, table, periods=periods)
+
+    # 4. Refresh the dashboard summaries and tell dashboard caches the data changed
+    with stage("refresh_summaries"):
+        refresh_summary_tables(engine, schema, table, periods)
+        record_load_version(engine, schema, periods)
 
-    print(f"Data successfully loaded into {schema}.{table}!")
+    print(f"Data successfully loaded into {schema}.{table} with {method}!")
+
+def insert_load(df, engine, schema: str, table: str,
+                periods: list[str] | None = None):
+    """Load a DataFrame (or batches of one) with DataFrame.to_sql, replacing `periods` (or every row) in one transaction."""
+    # Readers keep seeing the old rows until the transaction commits
+    with engine.begin() as conn:
+        frames, periods = prepare_batches(conn, schema, table, df, periods)
+        delete_periods(conn, schema, table, periods)
+        for frame in frames:
+            frame.to_sql(
+                name=table,
+                con=conn,
+                schema=schema,
+                if_exists="append",
+                index=False
+            )
 
 if __name__ == "__main__":
     load_data()
-
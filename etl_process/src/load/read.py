@@ -3,19 +3,53 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 import pandas as pd # type: ignore
-from pathlib import Path
 
-def read_input(limit: int | None = None):
-    """Read cleaned CSV from processed data folder."""
-    file_path = Path(__file__).resolve().parents[2] / "data" / "processed" / "location_ae_combined.csv"
+from src.utils.processed_store import iter_processed, read_processed
+
+def read_input(limit: int | None = None, periods: list[str] | None = None,
+               columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Read the combined A&E dataset from the processed Parquet store.
 
+    Only the requested columns and periods are read from disk. Falls back to
+    data/processed/location_ae_combined.csv if no Parquet dataset exists yet.
 
-    if not file_path.exists():
-        raise FileNotFoundError(f"No input found at {file_path}")
+    Args:
+        limit (int | None): Only return the first `limit` rows.
+        periods (list[str] | None): ISO dates of the periods to read. Default is None (all).
+        columns (list[str] | None): Columns to read. Default is None (all).
 
-    df = pd.read_csv(file_path)
+    Returns:
+        pd.DataFrame: Data with the compact dataset dtypes (see src.utils.dataset_schema).
+    """
+    df = read_processed("location_ae_combined", columns=columns, periods=periods)
 
     if limit and len(df) > limit:
         df = df.head(limit)
 
     return df
+
+
+def iter_input(limit: int | None = None, periods: list[str] | None = None,
+               columns: list[str] | None = None, batch_size: int = 100_000):
+    """
+    Yield the combined A&E dataset in batches instead of reading it all at once.
+
+    Args:
+        limit (int | None): Stop after `limit` rows.
+        periods (list[str] | None): ISO dates of the periods to read. Default is None (all).
+        columns (list[str] | None): Columns to read. Default is None (all).
+        batch_size (int): Maximum rows per batch.
+
+    Yields:
+        pd.DataFrame: Batches with the compact dataset dtypes.
+    """
+    remaining = limit or None
+    for batch in iter_processed("location_ae_combined", columns=columns, periods=periods,
+                                batch_size=batch_size):
+        if remaining is not None:
+            batch = batch.head(remaining)
+            remaining -= len(batch)
+        yield batch
+        if remaining is not None and remaining <= 0:
+            return
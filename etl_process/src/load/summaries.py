@@ -0,0 +1,244 @@
+from sqlalchemy import bindparam, text
+
+import pandas as pd  # type: ignore
+
+# Summary tables the dashboard reads instead of aggregating ae_attendances per request.
+# Each entry holds the table DDL, its indexes, the column its periods are keyed by and the
+# query that rebuilds it; {schema} and {table} refer to the loaded target table
+# and {where} restricts the rebuild to the affected periods. The SQL also runs on
+# DuckDB for the embedded dashboard backend, so casts spell out their precision
+# (a bare ::numeric is DECIMAL(18, 3) there, which rounds twice).
+SUMMARY_TABLES = {
+    "ae_national_monthly": {
+        "ddl": """
+            CREATE TABLE IF NOT EXISTS "{schema}".ae_national_monthly (
+                month DATE PRIMARY KEY,
+                attendances_type_1 BIGINT,
+                breaches BIGINT,
+                patients_12hr_wait BIGINT,
+                pct_seen_within_4hrs DOUBLE PRECISION
+            )
+        """,
+        "indexes": {},
+        "period_column": "month",
+        "refresh": """
+            INSERT INTO "{schema}".ae_national_monthly
+            SELECT
+                period AS month,
+                SUM(ae_attendances_type_1),
+                SUM(attendances_over_4hrs_type_1),
+                SUM(patients_12hr_wait),
+                ROUND(
+                    (
+                        100.0 * (
+                            SUM(ae_attendances_type_1) - SUM(attendances_over_4hrs_type_1)
+                        ) / NULLIF(SUM(ae_attendances_type_1), 0)
+                    )::numeric(20, 10),
+                    1
+                )
+            FROM "{schema}"."{table}"
+            {where}
+            GROUP BY period
+        """,
+    },
+    "ae_trust_monthly": {
+        "ddl": """
+            CREATE TABLE IF NOT EXISTS "{schema}".ae_trust_monthly (
+                period DATE NOT NULL,
+                org_code TEXT NOT NULL,
+                org_name TEXT,
+                attendances_type_1 BIGINT,
+                over_4hrs_type_1 BIGINT,
+                pct_seen_within_4hrs DOUBLE PRECISION
+            )
+        """,
+        "indexes": {
+            "ae_trust_monthly_period_idx": "(period)",
+            "ae_trust_monthly_org_code_period_idx": "(org_code, period)",
+        },
+        "period_column": "period",
+        "refresh": """
+            INSERT INTO "{schema}".ae_trust_monthly
+            SELECT
+                period,
+                org_code,
+                org_name,
+                SUM(ae_attendances_type_1),
+                SUM(attendances_over_4hrs_type_1),
+                CASE
+                    WHEN SUM(ae_attendances_type_1) = 0 THEN NULL
+                    ELSE 100.0 * (SUM(ae_attendances_type_1) - SUM(attendances_over_4hrs_type_1))
+                               / SUM(ae_attendances_type_1)
+                END
+            FROM "{schema}"."{table}"
+            {where}
+            GROUP BY period, org_code, org_name
+        """,
+    },
+}
+
+# Hex bin levels for the geospatial map, coarsest first: level -> hex radius in
+# degrees of latitude. Each level is a separate grid, so the map can fetch the
+# one that suits its zoom instead of every trust.
+GEO_BIN_LEVELS = {1: 1.0, 2: 0.5, 3: 0.2}
+
+# Longitude is scaled by cos(54°), roughly England's mid latitude, so the hexes
+# are close to regular on the map.
+GEO_BIN_LON_SCALE = 0.5878
+
+# Pointy-top hex grid in axial (q, r) coordinates: each point is projected,
+# divided by the hex radius and rounded to the nearest hex with cube rounding
+# (round all three cube coordinates, then fix the one that moved furthest).
+# FLOOR(x + 0.5) rounds the same way on Postgres and DuckDB.
+GEO_BINS_REFRESH = """
+    INSERT INTO "{schema}".ae_geo_bins
+    SELECT
+        period,
+        level,
+        q,
+        r,
+        size * 1.5 * r,
+        size * 1.7320508075688772 * (q + r / 2.0) / <lon_scale>,
+        COUNT(*),
+        SUM(ae_attendances_type_1),
+        SUM(attendances_over_4hrs_type_1),
+        SUM(patients_12hr_wait),
+        SUM(emergency_admissions_type_1)
+    FROM (
+        SELECT
+            *,
+            CAST(CASE WHEN dq > dr AND dq > ds THEN -rr - rs ELSE rq END AS INTEGER) AS q,
+            CAST(CASE WHEN dq > dr AND dq > ds THEN rr WHEN dr > ds THEN -rq - rs ELSE rr END AS INTEGER) AS r
+        FROM (
+            SELECT *, ABS(rq - qf) AS dq, ABS(rr - rf) AS dr, ABS(rs + qf + rf) AS ds
+            FROM (
+                SELECT *, FLOOR(qf + 0.5) AS rq, FLOOR(rf + 0.5) AS rr, FLOOR(0.5 - qf - rf) AS rs
+                FROM (
+                    SELECT
+                        points.period,
+                        points.ae_attendances_type_1,
+                        points.attendances_over_4hrs_type_1,
+                        points.patients_12hr_wait,
+                        points.emergency_admissions_type_1,
+                        levels.level,
+                        levels.size,
+                        (0.5773502691896258 * points.longitude * <lon_scale> - points.latitude / 3.0) / levels.size AS qf,
+                        (2.0 / 3.0 * points.latitude) / levels.size AS rf
+                    FROM (SELECT * FROM "{schema}"."{table}" {where}) AS points
+                    CROSS JOIN (VALUES <levels>) AS levels (level, size)
+                    WHERE points.latitude IS NOT NULL
+                      AND points.longitude IS NOT NULL
+                      AND (
+                          points.ae_attendances_type_1 > 0
+                          OR points.attendances_over_4hrs_type_1 > 0
+                          OR points.patients_12hr_wait > 0
+                      )
+                ) AS projected
+            ) AS rounded
+        ) AS distances
+    ) AS binned
+    GROUP BY period, level, size, q, r
+""".replace("<lon_scale>", str(GEO_BIN_LON_SCALE)).replace("<levels>", ", ".join(
+    f"({level}, CAST({size} AS DOUBLE PRECISION))" for level, size in GEO_BIN_LEVELS.items()
+))
+
+SUMMARY_TABLES["ae_geo_bins"] = {
+    "ddl": """
+        CREATE TABLE IF NOT EXISTS "{schema}".ae_geo_bins (
+            period DATE NOT NULL,
+            level SMALLINT NOT NULL,
+            q INTEGER NOT NULL,
+            r INTEGER NOT NULL,
+            latitude DOUBLE PRECISION,
+            longitude DOUBLE PRECISION,
+            trusts INTEGER,
+            ae_attendances_type_1 BIGINT,
+            attendances_over_4hrs_type_1 BIGINT,
+            patients_12hr_wait BIGINT,
+            emergency_admissions_type_1 BIGINT
+        )
+    """,
+    "indexes": {
+        "ae_geo_bins_period_level_idx": "(period, level)",
+    },
+    "period_column": "period",
+    "refresh": GEO_BINS_REFRESH,
+}
+
+# The latest-period ranking is small and depends on which period is latest,
+# so it is always rebuilt in full.
+LATEST_12HR_DDL = """
+    CREATE TABLE IF NOT EXISTS "{schema}".ae_latest_12hr (
+        month DATE NOT NULL,
+        org_code TEXT NOT NULL,
+        org_name TEXT,
+        patients_12hr_wait INTEGER,
+        latitude DOUBLE PRECISION,
+        longitude DOUBLE PRECISION,
+        rank_12hr INTEGER
+    )
+"""
+
+LATEST_12HR_REFRESH = """
+    INSERT INTO "{schema}".ae_latest_12hr
+    SELECT
+        period,
+        org_code,
+        org_name,
+        patients_12hr_wait,
+        latitude,
+        longitude,
+        RANK() OVER (ORDER BY patients_12hr_wait DESC NULLS LAST)
+    FROM "{schema}"."{table}"
+    WHERE period = (
+        SELECT MAX(period) FROM "{schema}"."{table}"
+    )
+"""
+
+
+def refresh_summary_tables(engine, schema: str, table: str, periods: list[str] | None = None):
+    """
+    Create and refresh the dashboard summary tables from the loaded target table.
+
+    Args:
+        engine: SQLAlchemy engine for the target database.
+        schema (str): Target schema.
+        table (str): Loaded A&E table the summaries are built from.
+        periods (list[str] | None): ISO dates of the periods that changed. Only
+            those periods are rebuilt. Default is None, which rebuilds everything.
+    """
+    params = {}
+    where = ""
+    if periods is not None:
+        params["periods"] = pd.to_datetime(pd.Series(periods)).dt.date.tolist()
+        where = "WHERE period IN :periods"
+
+    with engine.begin() as conn:
+        for summary, sql in SUMMARY_TABLES.items():
+            conn.execute(text(sql["ddl"].format(schema=schema)))
+            for index, columns in sql["indexes"].items():
+                conn.execute(text(
+                    f'CREATE INDEX IF NOT EXISTS {index} ON "{schema}".{summary} {columns}'
+                ))
+
+            delete_sql = f'DELETE FROM "{schema}".{summary}'
+            if periods is not None:
+                delete_sql += f' WHERE {sql["period_column"]} IN :periods'
+            conn.execute(_with_periods(delete_sql, periods), params)
+
+            refresh_sql = sql["refresh"].format(schema=schema, table=table, where=where)
+            conn.execute(_with_periods(refresh_sql, periods), params)
+
+        conn.execute(text(LATEST_12HR_DDL.format(schema=schema)))
+        conn.execute(text(f'DELETE FROM "{schema}".ae_latest_12hr'))
+        conn.execute(text(LATEST_12HR_REFRESH.format(schema=schema, table=table)))
+
+    print(f"Summary tables refreshed for {'all' if periods is None else len(periods)} periods")
+
+
+def _with_periods(sql: str, periods: list[str] | None):
+    """Build a text clause, expanding :periods into a bound IN list when filtering."""
+    clause = text(sql)
+    if periods is not None:
+        clause = clause.bindparams(bindparam("periods", expanding=True))
+    return clause
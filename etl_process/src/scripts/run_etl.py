@@ -7,25 +7,92 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from config.env_config import setup_env
+from src.extract.extract import extract_ae_data
 from src.transform.transform_ae import transform_ae_data
+from src.transform.enrich import enrich_ae_data
+from src.transform.manifest import clear_pending_periods, pending_periods
 from src.load.load import load_data
+from src.utils.instrumentation import run_report, stage
+
+# The dashboard figures and snapshot import through the etl_process package (see build_dashboard_outputs)
+REPO_ROOT = Path(__file__).resolve().parents[3]
 
 def main():
     setup_env(sys.argv)
     env = os.getenv('ENV', 'error')
     print(f"ETL pipeline starting in '{env}' environment...")
 
+    # Set ETL_FULL_REFRESH=1 to rebuild every raw file and replace the whole table
+    full_refresh = os.getenv('ETL_FULL_REFRESH', '').lower() in ('1', 'true', 'yes')
+
+    # Set ETL_STREAMING=1 to process data in batches when it is too large for memory
+    streaming = os.getenv('ETL_STREAMING', '').lower() in ('1', 'true', 'yes')
+
     try:
-        # Transform step
-        cleaned_df = transform_ae_data()
-        print(f"Transformation complete. Rows: {len(cleaned_df)}")
+        # Each stage's timings and resource use go to logs/etl.log and a JSON report in data/output
+        with run_report():
+            # Extract step (downloads new or changed files listed in EXTRACT_CATALOGUE, if set)
+            extract_ae_data()
+
+            # Transform step (only new or changed raw files unless doing a full refresh)
+            cleaned_df = transform_ae_data(incremental=not full_refresh, streaming=streaming)
+            if cleaned_df is not None:
+                print(f"Transformation complete. Rows: {len(cleaned_df)}")
 
-        # Load step (reads from saved CSV)
-        load_data()
-        print("ETL pipeline completed successfully.")
+            # Enrich step (adds trust postcodes and coordinates for the geospatial views)
+            enrich_ae_data(cleaned_df, streaming=streaming)
+
+            # Load step (reads the enriched Parquet dataset)
+            periods = pending_periods()
+            if full_refresh:
+                load_data(streaming=streaming)
+            elif periods:
+                load_data(periods=periods, streaming=streaming)
+            else:
+                print("No changed periods to load.")
+
+            # Prebuild the dashboard's figures and static snapshot for the newly loaded data
+            if full_refresh or periods:
+                build_dashboard_outputs()
+            clear_pending_periods()
+            print("ETL pipeline completed successfully.")
 
     except Exception as e:
         print(f"ETL pipeline failed: {e}")
 
+def build_dashboard_outputs():
+    """
+    Prebuild the dashboard figures, export the static snapshot and warm the
+    default dashboard queries for the loaded data.
+
+    Skipped if the dashboard dependencies (plotly) are not installed. The data
+    is already loaded, so a failure here is reported without failing the ETL;
+    the dashboard then builds its figures itself.
+    """
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.append(str(REPO_ROOT))
+    try:
+        from etl_process.src.transform.figures import prebuild_figures
+        from etl_process.src.transform.snapshot import export_snapshot
+        from etl_process.src.transform.warmup import warm_caches
+    except ImportError as e:
+        print(f"Skipping dashboard figures, snapshot and warmup: {e}")
+        return
+
+    try:
+        with stage("prebuild_figures") as record:
+            record["figures"] = prebuild_figures()
+        print(f"Prebuilt {record['figures']} dashboard figures.")
+
+        with stage("export_snapshot") as record:
+            record.update(export_snapshot())
+
+        # Runs the default page queries so the database has the rewritten tables cached
+        with stage("warm_caches") as record:
+            report = warm_caches()
+            record.update(queries=report["queries"], figures=report["figures"], errors=len(report["errors"]))
+    except Exception as e:
+        print(f"Dashboard figures, snapshot or warmup failed: {e}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,125 @@
+import hashlib
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from etl_process.src.load.summaries import LATEST_12HR_DDL, LATEST_12HR_REFRESH, SUMMARY_TABLES
+
+# The processed dataset the ETL loads into the target table, in the ETL's processed
+# store (see src.utils.processed_store, which is imported through the ETL's own paths)
+PROCESSED_DIR = Path(__file__).resolve().parents[2] / "data" / "processed"
+LOADED_DATASET = "location_ae_combined"
+
+# :name bind parameters, but not Postgres-style ::casts
+_BIND_PARAM = re.compile(r"(?<![:\w]):(\w+)")
+
+# One in-memory database per process, rebuilt when the processed files change
+_DATABASE = {"key": None, "connection": None}
+_DATABASE_LOCK = threading.Lock()
+
+
+def loaded_dataset() -> Path:
+    """Return the processed dataset the dashboard reads, under DASHBOARD_PROCESSED_DIR if set."""
+    return Path(os.getenv("DASHBOARD_PROCESSED_DIR") or PROCESSED_DIR) / LOADED_DATASET
+
+
+def data_version(dataset: Path) -> int | None:
+    """
+    Return a version number for a processed dataset, or None if it does not exist.
+
+    The number changes whenever a Parquet file in the dataset is added,
+    removed or rewritten, so it can stand in for the ETL load version.
+    """
+    files = sorted(Path(dataset).rglob("*.parquet"))
+    if not files:
+        return None
+
+    digest = hashlib.sha256()
+    for path in files:
+        stat = path.stat()
+        digest.update(f"{path.relative_to(dataset)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return int(digest.hexdigest()[:15], 16)
+
+
+def build_database(dataset: Path, schema: str, table: str):
+    """
+    Build an in-memory DuckDB database mirroring the tables the dashboard queries.
+
+    The processed Parquet dataset becomes "{schema}"."{table}", and the
+    summary tables are built from it with the same SQL the ETL runs
+    against Postgres, so the dashboard's SQL files run unchanged.
+
+    Args:
+        dataset (Path): Processed Parquet dataset directory.
+        schema (str): Schema name the SQL files refer to.
+        table (str): Name of the loaded A&E table.
+
+    Returns:
+        duckdb.DuckDBPyConnection: Connection to the new database.
+    """
+    import duckdb  # optional: only needed for the duckdb dashboard backend
+
+    if data_version(dataset) is None:
+        raise FileNotFoundError(f"No processed data at {dataset}; run the ETL first")
+
+    con = duckdb.connect()
+    con.execute(f'CREATE SCHEMA "{schema}"')
+    source = str(Path(dataset) / "**" / "*.parquet").replace("'", "''")
+    con.execute(
+        f'CREATE TABLE "{schema}"."{table}" AS '
+        f"SELECT * EXCLUDE (year) FROM read_parquet('{source}', hive_partitioning = true)"
+    )
+
+    for sql in SUMMARY_TABLES.values():
+        con.execute(sql["ddl"].format(schema=schema))
+        con.execute(sql["refresh"].format(schema=schema, table=table, where=""))
+    con.execute(LATEST_12HR_DDL.format(schema=schema))
+    con.execute(LATEST_12HR_REFRESH.format(schema=schema, table=table))
+    return con
+
+
+@contextmanager
+def connect(schema: str, table: str):
+    """
+    Open a cursor on the process-wide DuckDB database.
+
+    The database is built on first use and rebuilt whenever the processed
+    files change. Each caller gets its own cursor, so concurrent sessions
+    can query it safely.
+
+    Args:
+        schema (str): Schema name the SQL files refer to.
+        table (str): Name of the loaded A&E table.
+
+    Yields:
+        duckdb.DuckDBPyConnection: A cursor for read_sql.
+    """
+    dataset = loaded_dataset()
+    key = (str(dataset), schema, table, data_version(dataset))
+
+    with _DATABASE_LOCK:
+        if _DATABASE["key"] != key:
+            # Cursors still open on the old database keep it alive until they close
+            _DATABASE["connection"] = build_database(dataset, schema, table)
+            _DATABASE["key"] = key
+        cursor = _DATABASE["connection"].cursor()
+
+    try:
+        yield cursor
+    finally:
+        cursor.close()
+
+
+def read_sql(con, query: str, params: dict | None = None) -> pd.DataFrame:
+    """Run a query written with :name bind parameters on a DuckDB cursor."""
+    names = set(_BIND_PARAM.findall(query))
+    if not names:
+        return con.execute(query).df()
+
+    # DuckDB rejects parameters the query does not use
+    params = {name: value for name, value in (params or {}).items() if name in names}
+    return con.execute(_BIND_PARAM.sub(r"$\1", query), params).df()
@@ -0,0 +1,18 @@
+SELECT
+    period,
+    level,
+    q,
+    r,
+    latitude,
+    longitude,
+    trusts,
+    ae_attendances_type_1,
+    attendances_over_4hrs_type_1,
+    patients_12hr_wait,
+    emergency_admissions_type_1
+FROM {schema}.ae_geo_bins
+WHERE
+    level = :level
+    AND period = (SELECT MAX(period) FROM {schema}.ae_geo_bins)
+ORDER BY
+    patients_12hr_wait DESC;
@@ -10,7 +10,7 @@ SELECT
     latitude,
     longitude
 FROM
-    de_2506_a.ae_attendances
+    {schema}.{table}
 WHERE
     (ae_attendances_type_1 > 0 OR attendances_over_4hrs_type_1 > 0 OR patients_12hr_wait > 0)
     AND latitude IS NOT NULL
@@ -0,0 +1,2 @@
+SELECT MAX(version) AS version
+FROM {schema}.etl_load_version;
@@ -0,0 +1,15 @@
+SELECT
+  period,
+  org_code,
+  org_name,
+  attendances_type_1,
+  over_4hrs_type_1,
+  pct_seen_within_4hrs
+FROM {schema}.ae_trust_monthly
+WHERE period IN (
+  SELECT DISTINCT period
+  FROM {schema}.ae_trust_monthly
+  ORDER BY period DESC
+  LIMIT :n_periods
+)
+ORDER BY period, org_name;
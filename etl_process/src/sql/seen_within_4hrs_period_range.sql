@@ -0,0 +1,10 @@
+SELECT
+  period,
+  org_code,
+  org_name,
+  attendances_type_1,
+  over_4hrs_type_1,
+  pct_seen_within_4hrs
+FROM {schema}.ae_trust_monthly
+WHERE period BETWEEN :start_period AND :end_period
+ORDER BY period, org_name;
@@ -1,9 +1,224 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 import pandas as pd
 from pathlib import Path
-from etl_process.src.utils.db_engine import db_engine
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from etl_process.src.sql import duckdb_backend
+from etl_process.src.utils.dataset_schema import compact_frame
+from etl_process.src.utils.db_engine import db_engine, get_target
+from etl_process.src.utils.query_cache import QueryCache
 
-def run_sql_query(query_path: str) -> pd.DataFrame:
-    engine = db_engine(db="TARGET")
-    query = Path(query_path).read_text()
-    df = pd.read_sql(query, engine)
+# Folder holding the .sql query files
+SQL_DIR = Path(__file__).resolve().parent
+
+# Where the dashboard queries run (DASHBOARD_BACKEND): the shared target Postgres,
+# or an in-process DuckDB database built from the processed Parquet files
+BACKENDS = ("postgres", "duckdb")
+
+# Results are cached per query file and parameters until the ETL loads new data
+_QUERY_CACHE = QueryCache(
+    maxsize=int(os.getenv("QUERY_CACHE_SIZE") or 128),
+    ttl=float(os.getenv("QUERY_CACHE_TTL") or 3600),
+)
+
+# How often to ask the database whether the ETL has loaded a new version
+VERSION_CHECK_SECONDS = float(os.getenv("QUERY_CACHE_VERSION_CHECK_SECONDS") or 30)
+_load_version = {"value": None, "checked_at": None}
+
+# Page queries run concurrently on a shared pool, each on its own pooled connection.
+# DASHBOARD_QUERY_TIMEOUT (seconds) bounds how long a page waits for any one query,
+# and is set as the statement timeout of every dashboard query on Postgres. The
+# engines themselves have no timeout, as the ETL shares them for long loads.
+QUERY_WORKERS = int(os.getenv("DASHBOARD_QUERY_WORKERS") or 8)
+QUERY_TIMEOUT_SECONDS = float(os.getenv("DASHBOARD_QUERY_TIMEOUT") or 30)
+_QUERY_EXECUTOR = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="dashboard-query")
+
+
+def run_sql_query(query_path: str, params: dict | None = None, use_cache: bool = True,
+                  timeout: float | None = None) -> pd.DataFrame:
+    """
+    Run a SQL file against the dashboard backend and return the results.
+
+    Results are cached by query file and parameters. The cache is emptied
+    whenever the load version written by the ETL changes, and entries also
+    expire after QUERY_CACHE_TTL seconds.
+
+    Args:
+        query_path (str): Path to the .sql file.
+        params (dict | None): Bind parameters referenced in the query as :name.
+        use_cache (bool): Set to False to always query the database.
+        timeout (float | None): Seconds after which Postgres cancels the query.
+            Defaults to DASHBOARD_QUERY_TIMEOUT, then 30. 0 disables it.
+
+    Returns:
+        pd.DataFrame: Query results with the compact dataset dtypes
+        (see src.utils.dataset_schema). Each call gets its own copy.
+    """
+    return run_sql_queries([query_path], params, use_cache, timeout)[0]
+
+
+def run_sql_queries(query_paths: list, params: dict | None = None, use_cache: bool = True,
+                    timeout: float | None = None) -> list[pd.DataFrame]:
+    """
+    Run several SQL files and return their results in the same order.
+
+    Cached results are reused; the remaining queries all run over a single
+    pooled connection rather than checking one out per query.
+
+    Args:
+        query_paths (list): Paths to the .sql files.
+        params (dict | None): Bind parameters shared by the queries.
+        use_cache (bool): Set to False to always query the database.
+        timeout (float | None): Seconds after which Postgres cancels each query.
+            Defaults to DASHBOARD_QUERY_TIMEOUT, then 30. 0 disables it.
+
+    Returns:
+        list[pd.DataFrame]: One DataFrame per query. Each call gets its own copies.
+    """
+    backend = query_backend()
+    timeout = QUERY_TIMEOUT_SECONDS if timeout is None else timeout
+    version = current_load_version() if use_cache else None
+    frozen_params = _freeze(params)
+
+    results = {}
+    for query_path in query_paths:
+        if use_cache:
+            results[query_path] = _QUERY_CACHE.get((backend, str(query_path), frozen_params), version)
+
+    missing = [p for p in query_paths if results.get(p) is None]
+    if missing:
+        with _connect(backend) as conn:
+            if timeout and backend == "postgres":
+                # Scoped to this connection's transaction, which is rolled back when it returns to the pool
+                conn.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(timeout * 1000))}")
+            for query_path in missing:
+                results[query_path] = compact_frame(_execute_sql_file(conn, query_path, params, backend))
+                if use_cache:
+                    _QUERY_CACHE.set((backend, str(query_path), frozen_params), results[query_path], version)
+
+    return [results[p].copy() for p in query_paths]
+
+
+def run_sql_queries_concurrently(queries: dict, timeout: float | None = None,
+                                 use_cache: bool = True) -> tuple[dict[str, pd.DataFrame], dict[str, str]]:
+    """
+    Run a page's queries at the same time and wait for all of them to finish.
+
+    Each query runs on the shared query thread pool with its own pooled
+    connection, so a page waits for its slowest query rather than the sum of
+    all of them. A query that fails, or is still running after `timeout`
+    seconds, is reported in the errors instead of failing the whole page.
+    Postgres also cancels queries that run past the timeout.
+
+    Args:
+        queries (dict): Dataset name to a .sql path, or to a (path, params) tuple.
+        timeout (float | None): Seconds to wait for each query. Defaults to
+            DASHBOARD_QUERY_TIMEOUT, then 30.
+        use_cache (bool): Set to False to always query the database.
+
+    Returns:
+        tuple[dict[str, pd.DataFrame], dict[str, str]]: The results of the
+        queries that finished, and an error message for each one that did not,
+        both keyed by dataset name.
+    """
+    timeout = QUERY_TIMEOUT_SECONDS if timeout is None else timeout
+    if use_cache:
+        # Check the load version once up front rather than from every worker
+        current_load_version()
+
+    futures = {}
+    for name, query in queries.items():
+        query_path, params = query if isinstance(query, tuple) else (query, None)
+        futures[name] = _QUERY_EXECUTOR.submit(run_sql_query, query_path, params, use_cache, timeout)
+
+    # The queries run in parallel, so one deadline covers them all
+    wait(futures.values(), timeout=timeout)
+
+    results, errors = {}, {}
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            errors[name] = f"Timed out after {timeout:g} seconds"
+        elif future.exception() is not None:
+            error = future.exception()
+            # DBAPI errors repeat the whole statement; the first line says what went wrong
+            errors[name] = f"{type(error).__name__}: {str(error).splitlines()[0] if str(error) else ''}"
+        else:
+            results[name] = future.result()
+    return results, errors
+
+
+def current_load_version():
+    """
+    Return the latest load version recorded by the ETL, or None if there is none.
+
+    With the duckdb backend this is a fingerprint of the processed files
+    instead. Either is checked at most once every VERSION_CHECK_SECONDS.
+    """
+    now = time.monotonic()
+    checked_at = _load_version["checked_at"]
+    if checked_at is None or now - checked_at > VERSION_CHECK_SECONDS:
+        if query_backend() == "duckdb":
+            _load_version["value"] = duckdb_backend.data_version(duckdb_backend.loaded_dataset())
+        else:
+            try:
+                engine = db_engine(db="TARGET")
+                version = _execute_sql_file(engine, SQL_DIR / "load_version.sql").iloc[0, 0]
+                _load_version["value"] = None if pd.isna(version) else int(version)
+            except DBAPIError:
+                # No marker table yet (or the database is unreachable): rely on the TTL
+                _load_version["value"] = None
+        _load_version["checked_at"] = now
+
+    return _load_version["value"]
+
+
+def clear_query_cache():
+    """Empty the query cache and force the next query to re-check the load version."""
+    _QUERY_CACHE.clear()
+    _load_version["checked_at"] = None
+
+
+def query_backend() -> str:
+    """Return the configured dashboard backend, "postgres" (default) or "duckdb"."""
+    backend = (os.getenv("DASHBOARD_BACKEND") or "postgres").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown DASHBOARD_BACKEND {backend!r}; expected one of {BACKENDS}")
+    return backend
+
+
+def render_sql(query_path) -> str:
+    """
+    Read a SQL file and fill in its {schema} and {table} placeholders.
+
+    The schema and table are the target the ETL loads, from TARGET_DB_SCHEMA
+    (default public) and TARGET_DB_TABLE (default ae_attendances); see
+    src.utils.db_engine.get_target.
+    """
+    schema, table = get_target()
+    return Path(query_path).read_text().format(schema=schema, table=table)
+
+
+def _connect(backend: str):
+    """Open a connection to the given backend, for use in a with block."""
+    if backend == "duckdb":
+        return duckdb_backend.connect(*get_target())
+    return db_engine(db="TARGET").connect()
+
+
+def _execute_sql_file(con, query_path, params: dict | None = None, backend: str = "postgres") -> pd.DataFrame:
+    query = render_sql(query_path)
+    if backend == "duckdb":
+        return duckdb_backend.read_sql(con, query, params)
+    df = pd.read_sql(text(query), con, params=params)
     return df
+
+
+def _freeze(params: dict | None) -> tuple:
+    """Turn query parameters into a hashable cache key."""
+    return tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in sorted((params or {}).items())
+    )
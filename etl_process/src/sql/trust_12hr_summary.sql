@@ -1,12 +1,9 @@
 SELECT
-    CAST(period AS DATE) AS month,
+    month,
     org_code,
     org_name,
     patients_12hr_wait,
     latitude,
     longitude
-FROM de_2506_a.ae_attendances
-WHERE CAST(period AS DATE) = (
-    SELECT MAX(CAST(period AS DATE)) FROM de_2506_a.ae_attendances
-)
-ORDER BY patients_12hr_wait DESC
+FROM {schema}.ae_latest_12hr
+ORDER BY rank_12hr
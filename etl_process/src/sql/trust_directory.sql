@@ -0,0 +1,12 @@
+SELECT
+  org_code,
+  org_name
+FROM (
+  SELECT DISTINCT ON (org_code)
+    org_code,
+    org_name
+  FROM {schema}.ae_trust_monthly
+  WHERE pct_seen_within_4hrs IS NOT NULL
+  ORDER BY org_code, period DESC
+) AS latest_names
+ORDER BY org_name;
@@ -0,0 +1,283 @@
+import difflib
+import json
+from pathlib import Path
+
+import pandas as pd  # type: ignore
+
+from src.transform.manifest import file_fingerprint
+from src.utils.instrumentation import path_size, stage
+from src.utils.json_files import write_json_atomic
+from src.utils.processed_store import (
+    PROCESSED_DIR,
+    iter_processed,
+    read_processed,
+    write_processed,
+    write_processed_batches,
+)
+
+RAW_DIR = Path(__file__).resolve().parents[2] / "data" / "raw"
+
+# Reference data: trust name -> postcode/coordinates, and the NHS hospital sites list
+ORG_NAMES_PATH = RAW_DIR / "unique_org_names.csv"
+HOSPITAL_PATH = RAW_DIR / "hospital.csv"
+
+# Resolved (org_code, org_name) -> location pairs, reused while the reference files are unchanged
+LOOKUP_CACHE_PATH = PROCESSED_DIR / "geo_lookup.json"
+
+INPUT_NAME = "ae_data_cleaned"
+OUTPUT_NAME = "location_ae_combined"
+
+GEO_COLUMNS = ["postcode", "latitude", "longitude"]
+
+# Minimum difflib similarity for a fuzzy trust name match
+FUZZY_CUTOFF = 0.9
+
+
+def enrich_ae_data(ae_df: pd.DataFrame | None = None, org_names_path: Path = ORG_NAMES_PATH,
+                   hospital_path: Path = HOSPITAL_PATH, cache_path: Path = LOOKUP_CACHE_PATH,
+                   processed_dir: Path = PROCESSED_DIR, streaming: bool = False) -> pd.DataFrame | None:
+    """
+    Add postcode, latitude and longitude to the cleaned A&E data.
+
+    Each distinct (org_code, org_name) pair is resolved once, in order:
+        1. name: exact match on the normalised trust name in unique_org_names.csv
+        2. org_code: an NHS hospital site in hospital.csv with that code or parent code
+        3. fuzzy: closest trust name in unique_org_names.csv (difflib, FUZZY_CUTOFF)
+    The resolved pairs are cached on disk and reused until either reference
+    file changes, then joined onto the rows in a single merge. Match counts
+    are printed so fuzzy and unmatched trusts are visible in every run.
+
+    Args:
+        ae_df (pd.DataFrame | None): Cleaned A&E data. Defaults to the
+            ae_data_cleaned dataset in the processed store.
+        org_names_path (Path): Trust name -> location reference CSV.
+        hospital_path (Path): Hospital sites reference CSV.
+        cache_path (Path): JSON file caching the resolved lookup.
+        processed_dir (Path): Folder holding the processed datasets.
+        streaming (bool): Read ae_data_cleaned and write the output one batch
+            at a time instead of in memory. `ae_df` is ignored. Default is False.
+
+    Returns:
+        pd.DataFrame | None: The A&E rows with postcode, latitude and longitude,
+        also saved as the location_ae_combined dataset. None when streaming,
+        unless the input has no rows.
+    """
+    with stage("enrich", streaming=streaming) as record:
+        key_batches = []
+        if streaming:
+            key_batches = [
+                batch.drop_duplicates()
+                for batch in iter_processed(INPUT_NAME, columns=["org_code", "org_name"], processed_dir=processed_dir)
+            ]
+        if key_batches:
+            keys = pd.concat(key_batches).drop_duplicates()
+            lookup = geo_lookup(keys, org_names_path, hospital_path, cache_path)
+
+            batches = (
+                _add_locations(batch, lookup)
+                for batch in iter_processed(INPUT_NAME, processed_dir=processed_dir)
+            )
+            output_path, rows = write_processed_batches(batches, OUTPUT_NAME, processed_dir)
+            located = read_processed(OUTPUT_NAME, columns=["latitude"], processed_dir=processed_dir)["latitude"]
+            record.update(_report_matches(lookup, located))
+            record["rows_out"] = rows
+            record["bytes_written"] = path_size(output_path)
+            print(f"Enriched A&E data streamed to {output_path}. Rows: {rows}")
+            return None
+
+        # A streamed dataset with no rows yields no batches to concatenate, so
+        # it is enriched in memory instead, keeping its columns in the output
+        if ae_df is None or streaming:
+            ae_df = read_processed(INPUT_NAME, processed_dir=processed_dir)
+        record["rows_in"] = len(ae_df)
+
+        keys = ae_df[["org_code", "org_name"]].drop_duplicates()
+        lookup = geo_lookup(keys, org_names_path, hospital_path, cache_path)
+        enriched = _add_locations(ae_df, lookup)
+        record.update(_report_matches(lookup, enriched["latitude"]))
+
+        output_path = write_processed(enriched, OUTPUT_NAME, processed_dir)
+        record["rows_out"] = len(enriched)
+        record["bytes_written"] = path_size(output_path)
+        print(f"Enriched A&E data saved to {output_path}")
+
+    return enriched
+
+
+def geo_lookup(keys: pd.DataFrame, org_names_path: Path = ORG_NAMES_PATH,
+               hospital_path: Path = HOSPITAL_PATH, cache_path: Path = LOOKUP_CACHE_PATH) -> pd.DataFrame:
+    """
+    Return the location of each (org_code, org_name) pair, using the on-disk cache.
+
+    The cache is keyed by the SHA-256 of both reference files and the fuzzy
+    cutoff; if any of them changed it is rebuilt. Pairs missing from a valid
+    cache are resolved and added to it.
+
+    Args:
+        keys (pd.DataFrame): Distinct 'org_code' / 'org_name' pairs.
+        org_names_path (Path): Trust name -> location reference CSV.
+        hospital_path (Path): Hospital sites reference CSV.
+        cache_path (Path): JSON file caching the resolved lookup.
+
+    Returns:
+        pd.DataFrame: One row per pair with postcode, latitude, longitude and
+        'match' ("name", "org_code", "fuzzy" or "unmatched").
+    """
+    cache_key = {
+        "org_names_sha256": file_fingerprint(org_names_path)["sha256"],
+        "hospital_sha256": file_fingerprint(hospital_path)["sha256"],
+        "fuzzy_cutoff": FUZZY_CUTOFF,
+    }
+    cached = _load_lookup_cache(cache_path, cache_key)
+
+    missing = keys.merge(cached[["org_code", "org_name"]], how="left", indicator=True)
+    missing = missing.loc[missing["_merge"] == "left_only", ["org_code", "org_name"]]
+    if missing.empty:
+        print(f"Geolocation lookup loaded from cache for {len(keys)} trusts")
+        lookup = cached
+    else:
+        print(f"Resolving locations for {len(missing)} trusts ({len(cached)} cached)")
+        names, sites = load_reference(org_names_path, hospital_path)
+        lookup = pd.concat([cached, resolve_locations(missing, names, sites)], ignore_index=True)
+        _save_lookup_cache(cache_path, cache_key, lookup)
+
+    return keys.merge(lookup, on=["org_code", "org_name"], how="left")
+
+
+def load_reference(org_names_path: Path = ORG_NAMES_PATH,
+                   hospital_path: Path = HOSPITAL_PATH) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Read the reference files into name- and code-indexed lookup tables.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Trust locations indexed by
+        normalised name, and NHS hospital site locations indexed by code
+        (each site under its own code and its parent trust's code).
+    """
+    names = pd.read_csv(org_names_path)
+    names["name_key"] = normalise_names(names["org_name"])
+    names = names.drop_duplicates("name_key").set_index("name_key")[GEO_COLUMNS]
+
+    hospitals = pd.read_csv(hospital_path)
+    hospitals = hospitals[hospitals["Sector"] == "NHS Sector"].sort_values("OrganisationCode")
+    hospitals = hospitals.rename(columns={
+        "Postcode": "postcode", "Latitude": "latitude", "Longitude": "longitude"
+    })
+    sites = pd.concat([
+        hospitals.assign(code=hospitals["OrganisationCode"]),
+        hospitals.assign(code=hospitals["ParentODSCode"]),
+    ])
+    sites["code"] = sites["code"].astype(str).str.strip().str.upper()
+    sites = sites.drop_duplicates("code").set_index("code")[GEO_COLUMNS]
+
+    return names, sites
+
+
+def resolve_locations(keys: pd.DataFrame, names: pd.DataFrame, sites: pd.DataFrame) -> pd.DataFrame:
+    """
+    Resolve (org_code, org_name) pairs against the reference tables.
+
+    Exact name and code matches are vectorised joins; only the pairs left
+    over are fuzzy matched, one distinct name at a time.
+
+    Returns:
+        pd.DataFrame: 'org_code', 'org_name', GEO_COLUMNS and 'match'.
+    """
+    resolved = keys[["org_code", "org_name"]].reset_index(drop=True)
+    name_keys = normalise_names(resolved["org_name"])
+    code_keys = resolved["org_code"].astype(str).str.strip().str.upper()
+
+    by_name = names.reindex(name_keys).reset_index(drop=True)
+    by_code = sites.reindex(code_keys).reset_index(drop=True)
+
+    fuzzy_keys = name_keys.where(by_name["latitude"].isna() & by_code["latitude"].isna())
+    candidates = list(names.index)
+    fuzzy_matches = {
+        key: next(iter(difflib.get_close_matches(key, candidates, n=1, cutoff=FUZZY_CUTOFF)), None)
+        for key in fuzzy_keys.dropna().unique()
+    }
+    by_fuzzy = names.reindex(fuzzy_keys.map(fuzzy_matches)).reset_index(drop=True)
+
+    # Stack the candidates in priority order and keep the first located one per pair
+    candidates = pd.concat(
+        {"name": by_name, "org_code": by_code, "fuzzy": by_fuzzy}, names=["match", "row"]
+    ).reset_index()
+    best = candidates.dropna(subset=["latitude"]).drop_duplicates("row").set_index("row")
+
+    resolved = resolved.join(best[GEO_COLUMNS + ["match"]])
+    resolved["match"] = resolved["match"].fillna("unmatched")
+    return resolved
+
+
+def geo_match_metrics(lookup: pd.DataFrame, latitudes: pd.Series) -> dict:
+    """
+    Summarise how the trusts were located.
+
+    Args:
+        lookup (pd.DataFrame): Resolved pairs with a 'match' column.
+        latitudes (pd.Series): Latitude of every enriched row.
+
+    Returns:
+        dict: Trust counts per match method (trusts_name, trusts_org_code,
+        trusts_fuzzy, trusts_unmatched), plus rows with and without coordinates.
+    """
+    metrics = {f"trusts_{match}": int(n) for match, n in lookup["match"].value_counts().items()}
+    metrics["rows_located"] = int(latitudes.notna().sum())
+    metrics["rows_unlocated"] = int(latitudes.isna().sum())
+    return metrics
+
+
+def normalise_names(names: pd.Series) -> pd.Series:
+    """Upper-case trust names and drop punctuation and repeated spaces, e.g. "WIGAN, AND LEIGH " -> "WIGAN AND LEIGH"."""
+    return (
+        names.astype("string")
+        .str.upper()
+        .str.replace(r"[^A-Z0-9' ]", " ", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def _load_lookup_cache(cache_path: Path, cache_key: dict) -> pd.DataFrame:
+    """Return the cached lookup, or an empty one if it is missing or was built from other reference files."""
+    empty = pd.DataFrame(columns=["org_code", "org_name"] + GEO_COLUMNS + ["match"])
+    cache_path = Path(cache_path)
+    if not cache_path.exists():
+        return empty
+
+    with open(cache_path) as f:
+        cache = json.load(f)
+    if cache.get("key") != cache_key:
+        print("Reference files changed, rebuilding the geolocation lookup")
+        return empty
+
+    return pd.DataFrame(cache["entries"], columns=empty.columns)
+
+
+def _save_lookup_cache(cache_path: Path, cache_key: dict, lookup: pd.DataFrame):
+    """Write the lookup cache atomically."""
+    entries = lookup.astype(object).where(lookup.notna(), None).to_dict(orient="records")
+    write_json_atomic({"key": cache_key, "entries": entries}, cache_path, indent=2)
+
+
+def _add_locations(ae_df: pd.DataFrame, lookup: pd.DataFrame) -> pd.DataFrame:
+    """Join the lookup's locations onto the rows that have a period."""
+    # Rows without a period cannot be keyed by month in the target table
+    ae_df = ae_df.dropna(subset=["period"])
+    return ae_df.drop(columns=GEO_COLUMNS, errors="ignore").merge(
+        lookup[["org_code", "org_name"] + GEO_COLUMNS],
+        on=["org_code", "org_name"],
+        how="left",
+    )
+
+
+def _report_matches(lookup: pd.DataFrame, latitudes: pd.Series) -> dict:
+    """Print the match metrics and any trusts without a location, and return the metrics."""
+    metrics = geo_match_metrics(lookup, latitudes)
+    print(f"Geolocation matches: {metrics}")
+    unmatched = lookup.loc[lookup["match"] == "unmatched", "org_name"]
+    if not unmatched.empty:
+        print("WARNING: No location found for these trusts:")
+        for name in unmatched:
+            print(f"- {name}")
+    return metrics
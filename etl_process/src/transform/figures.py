@@ -0,0 +1,182 @@
+import os
+
+import pandas as pd
+import plotly.express as px
+
+from etl_process.src.load.summaries import GEO_BIN_LEVELS
+from etl_process.src.sql.sql_utils import clear_query_cache, current_load_version
+from etl_process.src.transform.load_operational import (
+    load_geo_bins,
+    load_latest_geospatial_data,
+    load_latest_operational_data,
+    load_trust_directory,
+    load_trust_performance,
+)
+from etl_process.src.transform.load_summary import load_national_trends
+from etl_process.src.utils.figure_cache import FIGURE_DIR, FigureCache
+
+# Built figures are cached per data version and parameters, in memory and as JSON files
+# shared with the ETL, which prebuilds the common views after each load
+_FIGURE_CACHE = FigureCache(
+    directory=os.getenv("FIGURE_CACHE_DIR") or FIGURE_DIR,
+    maxsize=int(os.getenv("FIGURE_CACHE_SIZE") or 64),
+    ttl=float(os.getenv("QUERY_CACHE_TTL") or 3600),
+)
+
+# Map zoom that suits each hex level
+BIN_ZOOM = {1: 4.5, 2: 5, 3: 5}
+
+
+def national_trend_figure():
+    """Line chart of the national % of patients seen within 4 hours per month."""
+    trend_df = load_national_trends()
+    fig = px.line(
+        trend_df,
+        x="month",
+        y="pct_seen_within_4hrs",
+        title="National % Seen Within 4 Hours",
+        markers=True,
+        labels={"pct_seen_within_4hrs": "% Seen Within 4 Hours", "month": "Month"},
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+def performance_extremes_figure():
+    """Horizontal bar chart of the five best and five worst trusts in the latest month."""
+    df = load_latest_operational_data().dropna(subset=["pct_seen_within_4hrs"])
+    latest_df = df[df["attendances_type_1"] > 0]  # Exclude rows with no attendances
+
+    # Label them as "Top" or "Bottom" for chart colouring
+    top5 = latest_df.sort_values("pct_seen_within_4hrs", ascending=False).head(5).assign(Performance="Top")
+    bottom5 = latest_df.sort_values("pct_seen_within_4hrs").head(5).assign(Performance="Bottom")
+    combined = pd.concat([top5, bottom5])
+
+    fig = px.bar(
+        combined,
+        x="pct_seen_within_4hrs",
+        y="org_name",
+        orientation="h",
+        color="Performance",
+        color_discrete_map={"Top": "blue", "Bottom": "red"},
+        labels={"pct_seen_within_4hrs": "% Seen Within 4hrs", "org_name": "Trust"},
+    )
+    fig.update_layout(xaxis=dict(ticksuffix="%"), yaxis_title="", xaxis_title="Performance")
+    return fig
+
+
+def trust_trend_figure(org_code: str):
+    """Line chart of one trust's % of patients seen within 4 hours over time."""
+    trusts = load_trust_directory()
+    trust_name = dict(zip(trusts["org_code"], trusts["org_name"])).get(org_code, org_code)
+    trust_df = load_trust_performance(org_code).dropna(subset=["pct_seen_within_4hrs"])
+
+    fig = px.line(
+        trust_df,
+        x="period",
+        y="pct_seen_within_4hrs",
+        title=f"{trust_name} – % Seen Within 4 Hours Over Time",
+        markers=True,
+        labels={"pct_seen_within_4hrs": "% Seen Within 4hrs", "period": "Date"},
+    )
+    fig.update_layout(yaxis=dict(ticksuffix="%"), xaxis_title="Month", yaxis_title="Performance")
+    return fig
+
+
+def geo_map_figure(level: int | None = None):
+    """
+    Map of 12-hour waits in the latest period.
+
+    Args:
+        level (int | None): Hex bin level (see GEO_BIN_LEVELS), or None for one point per trust.
+    """
+    if level is None:
+        fig = px.scatter_mapbox(
+            load_latest_geospatial_data(),
+            lat="latitude",
+            lon="longitude",
+            hover_name="org_name",
+            hover_data=["patients_12hr_wait", "ae_attendances_type_1"],
+            color="patients_12hr_wait",
+            size="patients_12hr_wait",
+            color_continuous_scale="Reds",  # Red for high 12-hour waits
+            size_max=30,
+            zoom=5,
+            height=600,
+        )
+    else:
+        fig = px.scatter_mapbox(
+            load_geo_bins(level),
+            lat="latitude",
+            lon="longitude",
+            hover_data=["trusts", "patients_12hr_wait", "ae_attendances_type_1"],
+            color="patients_12hr_wait",
+            size="patients_12hr_wait",
+            color_continuous_scale="Reds",
+            size_max=45,
+            zoom=BIN_ZOOM[level],
+            height=600,
+        )
+
+    fig.update_layout(
+        mapbox_style="carto-positron",
+        margin={"r": 0, "t": 0, "l": 0, "b": 0},
+        coloraxis_colorbar=dict(title="12-Hour Waits"),
+    )
+    return fig
+
+
+# Figure name -> builder, called with the figure's parameters
+FIGURES = {
+    "national_trend": national_trend_figure,
+    "performance_extremes": performance_extremes_figure,
+    "trust_trend": trust_trend_figure,
+    "geo_map": geo_map_figure,
+}
+
+
+def get_figure(name: str, **params) -> dict:
+    """
+    Return a dashboard figure, building it only if the data has changed.
+
+    Figures are cached by name, parameters and the load version, so reruns
+    and other sessions reuse the serialised figure instead of rebuilding it
+    from the DataFrames.
+
+    Args:
+        name (str): One of FIGURES.
+        **params: Parameters passed to the figure's builder, e.g. org_code.
+
+    Returns:
+        dict: The figure as plotly JSON, ready for st.plotly_chart.
+    """
+    return _FIGURE_CACHE.get_or_build(name, params, current_load_version(), lambda: FIGURES[name](**params))
+
+
+def prebuild_figures(trust_trends: bool = True) -> int:
+    """
+    Build the dashboard's common views for the current load version.
+
+    Builds the national trend, the best/worst trusts chart, the map at every
+    level and (optionally) every trust's trend, then deletes figures left
+    over from earlier versions.
+
+    Args:
+        trust_trends (bool): Also build the trend of every trust in the directory.
+
+    Returns:
+        int: Number of figures built.
+    """
+    # Read the version (and data) the ETL has just loaded
+    clear_query_cache()
+
+    views = [("national_trend", {}), ("performance_extremes", {}), ("geo_map", {"level": None})]
+    views += [("geo_map", {"level": level}) for level in GEO_BIN_LEVELS]
+    if trust_trends:
+        views += [("trust_trend", {"org_code": str(code)}) for code in load_trust_directory()["org_code"]]
+
+    version = current_load_version()
+    for name, params in views:
+        _FIGURE_CACHE.set(name, params, version, FIGURES[name](**params).to_json())
+    _FIGURE_CACHE.prune(version)
+    return len(views)
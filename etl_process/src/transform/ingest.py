@@ -0,0 +1,236 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from src.utils.dataset_schema import COUNT_DTYPES
+
+# Different CSVs may use slightly different headers so they are mapped to a standard schema
+RENAME_MAP = {
+    # Period
+    "Period": "period",
+    "Reporting Period": "period",
+
+    # Org Code
+    "Org Code": "org_code",
+    "Organisation Code": "org_code",
+
+    # Org Name
+    "Org name": "org_name",
+    "Organisation Name": "org_name",
+
+    # Attendances (Type 1)
+    "Number of A&E attendances Type 1": "ae_attendances_type_1",
+    "A&E attendances Type 1": "ae_attendances_type_1",
+
+    # Attendances over 4hrs (Type 1)
+    "Number of attendances over 4hrs Type 1": "attendances_over_4hrs_type_1",
+    "Attendances over 4hrs Type 1": "attendances_over_4hrs_type_1",
+
+    # 12hr waits
+    "Patients who have waited 12+ hrs from DTA to admission": "patients_12hr_wait",
+    "12 hour waits": "patients_12hr_wait",
+
+    # Emergency admissions (Type 1)
+    "Emergency admissions via A&E - Type 1": "emergency_admissions_type_1",
+    "Emergency Admissions Type 1": "emergency_admissions_type_1",
+}
+
+# Compact dtypes for each standard column. Period holds one value per monthly
+# file so it is stored as a category; counts take their nullable integer dtype
+# from src.utils.dataset_schema, so blank cells do not force a float column.
+RAW_COUNT_COLUMNS = (
+    "ae_attendances_type_1",
+    "attendances_over_4hrs_type_1",
+    "patients_12hr_wait",
+    "emergency_admissions_type_1",
+)
+COLUMN_DTYPES = {
+    "period": "category",
+    "org_code": "string",
+    "org_name": "string",
+    **{col: COUNT_DTYPES[col] for col in RAW_COUNT_COLUMNS},
+}
+
+# Default rows per chunk when streaming a raw file
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Below this many bytes of raw CSV in total, starting worker processes costs
+# more than it saves, so the files are read serially
+DEFAULT_PARALLEL_READ_MIN_BYTES = 64 * 1024 * 1024
+
+# A header that only appears in one variant of the NHS monthly file
+HEADER_VARIANTS = {
+    "legacy": "Number of A&E attendances Type 1",  # early 2020 files
+    "current": "A&E attendances Type 1",           # April 2020 onwards
+}
+
+
+def detect_header_variant(file_path: str) -> tuple[str, dict[str, str]]:
+    """
+    Work out which header layout a raw A&E CSV uses.
+
+    Only the first line is read, with the csv module rather than a pandas
+    parser pass, so this is cheap even for large files.
+
+    Args:
+        file_path (str): Path to a raw A&E CSV.
+
+    Returns:
+        tuple[str, dict[str, str]]: The variant name ("legacy", "current" or
+        "unknown") and a mapping of the file's raw column names to the
+        standard column names they will be renamed to.
+    """
+    header = read_header(file_path)
+
+    columns = {raw: RENAME_MAP[raw.strip()] for raw in header if raw.strip() in RENAME_MAP}
+
+    stripped = {raw.strip() for raw in header}
+    variant = next(
+        (name for name, marker in HEADER_VARIANTS.items() if marker in stripped),
+        "unknown",
+    )
+    return variant, columns
+
+
+def read_header(file_path: str) -> list[str]:
+    """Return the column names in the first line of a CSV (empty if the file is empty)."""
+    # utf-8-sig drops a byte order mark, as pandas does
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        return next(csv.reader(f), [])
+
+
+def normalise_headers(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Resolve a raw file's columns to the canonical schema.
+
+    Columns are renamed through RENAME_MAP (ignoring surrounding whitespace)
+    and unmapped columns are dropped. If several headers in the file map to
+    the same canonical column, they are combined, keeping the first non-null
+    value of each row. The result never has duplicate columns, so frames
+    from different header variants can be concatenated directly. Numeric
+    count columns are cast to their nullable dtype in COLUMN_DTYPES.
+
+    Args:
+        df (pd.DataFrame): Columns as read from one raw file.
+
+    Returns:
+        pd.DataFrame: The canonical columns present in the file, in COLUMN_DTYPES order.
+    """
+    sources = {}
+    for raw in df.columns:
+        standard = RENAME_MAP.get(str(raw).strip())
+        if standard is not None:
+            sources.setdefault(standard, []).append(raw)
+
+    columns = {}
+    for standard in COLUMN_DTYPES:
+        raws = sources.get(standard)
+        if not raws:
+            continue
+        column = df[raws[0]]
+        for raw in raws[1:]:
+            other = df[raw]
+            if isinstance(column.dtype, pd.CategoricalDtype) or isinstance(other.dtype, pd.CategoricalDtype):
+                # A categorical can only be filled from its own categories, so
+                # the values are combined first and the category rebuilt after
+                column = column.astype(object).fillna(other.astype(object)).astype("category")
+            else:
+                column = column.fillna(other)
+        dtype = COLUMN_DTYPES[standard]
+        if dtype.startswith("Int") and pd.api.types.is_numeric_dtype(column.dtype):
+            # Building the array directly is about twice as fast as Series.astype on small files
+            column = pd.array(column.to_numpy(), dtype=dtype)
+        columns[standard] = column
+
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def read_ae_file(file_path: str) -> pd.DataFrame:
+    """
+    Read a single raw A&E CSV, keeping only the columns the transform needs.
+
+    The header variant is detected first so that only the mapped columns are
+    parsed. The columns are then resolved to the canonical names with
+    normalise_headers and cast to their compact dtypes.
+
+    Args:
+        file_path (str): Path to a raw A&E CSV.
+
+    Returns:
+        pd.DataFrame: The needed columns from the file, with canonical names.
+    """
+    _, columns = detect_header_variant(file_path)
+
+    df = pd.read_csv(file_path, usecols=list(columns), dtype=_parse_dtypes(columns))
+    return normalise_headers(df)
+
+
+def iter_ae_file(file_path: str, chunksize: int | None = None):
+    """
+    Read a raw A&E CSV in chunks, resolving each chunk to the canonical column names.
+
+    Only the mapped columns are parsed, with the same compact dtypes as
+    read_ae_file, so a file larger than memory can be processed chunk by chunk.
+
+    Args:
+        file_path (str): Path to a raw A&E CSV.
+        chunksize (int | None): Rows per chunk. Defaults to the
+            ETL_STREAM_CHUNK_SIZE environment variable, then 100,000.
+
+    Yields:
+        pd.DataFrame: Chunks with canonical column names.
+    """
+    if chunksize is None:
+        chunksize = int(os.getenv("ETL_STREAM_CHUNK_SIZE") or DEFAULT_CHUNK_SIZE)
+
+    _, columns = detect_header_variant(file_path)
+
+    with pd.read_csv(file_path, usecols=list(columns), dtype=_parse_dtypes(columns),
+                     chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield normalise_headers(chunk)
+
+
+def read_ae_files(file_paths: list[str], max_workers: int | None = None) -> list[pd.DataFrame]:
+    """
+    Read raw A&E CSVs, in parallel across a process pool when there is enough data.
+
+    Args:
+        file_paths (list[str]): Paths to raw A&E CSVs.
+        max_workers (int | None): Number of worker processes. Defaults to the
+            ETL_READ_WORKERS environment variable, then the CPU count, except
+            that files totalling less than ETL_PARALLEL_READ_MIN_BYTES (default
+            64 MiB) are read serially. A value of 1 reads the files serially
+            in this process.
+
+    Returns:
+        list[pd.DataFrame]: One DataFrame per file, in the same order as file_paths.
+    """
+    if max_workers is None:
+        max_workers = int(os.getenv("ETL_READ_WORKERS") or os.cpu_count() or 1)
+        min_bytes = int(os.getenv("ETL_PARALLEL_READ_MIN_BYTES") or DEFAULT_PARALLEL_READ_MIN_BYTES)
+        if sum(os.path.getsize(f) for f in file_paths) < min_bytes:
+            max_workers = 1
+    max_workers = max(1, min(max_workers, len(file_paths)))
+
+    if max_workers == 1:
+        return [read_ae_file(f) for f in file_paths]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(read_ae_file, file_paths))
+
+
+def _parse_dtypes(columns: dict[str, str]) -> dict[str, str]:
+    """
+    Return the dtypes to parse a file's mapped columns with.
+
+    Counts are left to the parser's default integer or float type and cast by
+    normalise_headers, which is faster than parsing straight to a nullable type.
+    """
+    return {
+        raw: COLUMN_DTYPES[standard] for raw, standard in columns.items()
+        if not COLUMN_DTYPES[standard].startswith("Int")
+    }
+
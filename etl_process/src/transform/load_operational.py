@@ -1,6 +1,5 @@
 import pandas as pd
-from pathlib import Path
-from etl_process.src.utils.db_engine import db_engine
+from etl_process.src.sql.sql_utils import SQL_DIR, run_sql_query
 
 
 def load_operational_data() -> pd.DataFrame:
@@ -8,27 +7,71 @@ def load_operational_data() -> pd.DataFrame:
     Load operational (A&E) data from the target database.
 
     This function:
-    - Establishes a connection to the target database.
-    - Reads a SQL query from the `seen_within_4hrs.sql` file.
-    - Executes the query against the database.
+    - Runs the `seen_within_4hrs.sql` query against the target database
+      (cached until the ETL loads new data).
     - Returns the results as a pandas DataFrame.
 
     Returns:
         pd.DataFrame: Query results containing operational A&E data.
     """
-    # Create a connection to the target database
-    engine = db_engine(db="TARGET")
+    # Execute the SQL file (keeps logic modular) and load results into a pandas DataFrame
+    df = run_sql_query(SQL_DIR / "seen_within_4hrs.sql")
+    return df
 
-    # Debugging: print the database URL (optional, can be commented out in production)
-    # print(engine.url)
 
-    # Load SQL query from external file (keeps logic modular)
-    sql_path = Path("etl_process/src/sql/seen_within_4hrs.sql")
-    query = sql_path.read_text()
+def load_trust_directory() -> pd.DataFrame:
+    """
+    Load the list of trusts with 4-hour performance data, for trust pickers.
 
-    # Execute query and load results into a pandas DataFrame
-    df = pd.read_sql(query, engine)
-    return df
+    Returns:
+        pd.DataFrame: One row per trust with 'org_code' and its latest 'org_name',
+        ordered by name.
+    """
+    return run_sql_query(SQL_DIR / "trust_directory.sql")
+
+
+def load_trust_performance(org_code: str) -> pd.DataFrame:
+    """
+    Load the monthly 4-hour performance history of a single trust.
+
+    Args:
+        org_code (str): ODS code of the trust.
+
+    Returns:
+        pd.DataFrame: The trust's rows from `seen_within_4hrs.sql`, ordered by period.
+    """
+    return run_sql_query(SQL_DIR / "seen_within_4hrs_trust.sql", {"org_code": org_code})
+
+
+def load_operational_period_range(start_period, end_period) -> pd.DataFrame:
+    """
+    Load every trust's 4-hour performance for the periods between two dates.
+
+    Args:
+        start_period: First period to include (date or ISO date string).
+        end_period: Last period to include (date or ISO date string).
+
+    Returns:
+        pd.DataFrame: Rows for periods in [start_period, end_period], ordered by period and trust.
+    """
+    params = {
+        "start_period": pd.Timestamp(start_period).date(),
+        "end_period": pd.Timestamp(end_period).date(),
+    }
+    return run_sql_query(SQL_DIR / "seen_within_4hrs_period_range.sql", params)
+
+
+def load_latest_operational_data(n_periods: int = 1) -> pd.DataFrame:
+    """
+    Load every trust's 4-hour performance for the most recent periods.
+
+    Args:
+        n_periods (int): Number of latest periods to return. Default is 1.
+
+    Returns:
+        pd.DataFrame: Rows for the latest `n_periods` periods, ordered by period and trust.
+    """
+    return run_sql_query(SQL_DIR / "seen_within_4hrs_latest.sql", {"n_periods": int(n_periods)})
 
 
 def load_geospatial_data() -> pd.DataFrame:
@@ -36,27 +79,48 @@ def load_geospatial_data() -> pd.DataFrame:
     Load geospatial A&E data from the target database.
 
     This function:
-    - Establishes a connection to the target database.
-    - Reads a SQL query from the `geospatial.sql` file.
-    - Executes the query against the database.
+    - Runs the `geospatial.sql` query against the target database
+      (cached until the ETL loads new data).
     - Converts the 'period' column to datetime if necessary.
     - Returns the results as a pandas DataFrame.
 
     Returns:
         pd.DataFrame: Query results containing geospatial A&E data.
     """
-    # Create a connection to the target database
-    engine = db_engine(db="TARGET")
-
-    # Load SQL query from external file
-    sql_path = Path("etl_process/src/sql/geospatial.sql")
-    query = sql_path.read_text()
-
-    # Execute query and load results into a pandas DataFrame
-    df = pd.read_sql(query, engine)
+    # Execute the SQL file and load results into a pandas DataFrame
+    df = run_sql_query(SQL_DIR / "geospatial.sql")
 
     # Ensure 'period' column is parsed as datetime for correct time-series handling
     if not pd.api.types.is_datetime64_any_dtype(df["period"]):
         df["period"] = pd.to_datetime(df["period"])
 
     return df
+
+
+def load_latest_geospatial_data() -> pd.DataFrame:
+    """
+    Load geospatial A&E data for the latest period only.
+
+    Returns:
+        pd.DataFrame: One row per trust with activity and coordinates in the
+        latest period, ordered by 12-hour waits (highest first).
+    """
+    return run_sql_query(SQL_DIR / "geospatial_latest.sql")
+
+
+def load_geo_bins(level: int) -> pd.DataFrame:
+    """
+    Load the hex-binned geospatial summary for the latest period.
+
+    The bins are built by the ETL alongside the other summary tables
+    (see GEO_BIN_LEVELS in src.load.summaries), so the map only receives
+    one row per occupied hex at the requested level.
+
+    Args:
+        level (int): Bin level, from 1 (coarsest) to the finest in GEO_BIN_LEVELS.
+
+    Returns:
+        pd.DataFrame: One row per hex with its centre 'latitude' and
+        'longitude', the number of 'trusts' in it and their summed counts.
+    """
+    return run_sql_query(SQL_DIR / "geo_bins_latest.sql", {"level": int(level)})
@@ -0,0 +1,137 @@
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from etl_process.src.sql.sql_utils import current_load_version
+from etl_process.src.transform.load_operational import load_latest_geospatial_data
+from etl_process.src.utils.spatial_index import SpatialIndex
+
+RAW_DIR = Path(__file__).resolve().parents[2] / "data" / "raw"
+
+# Reference files the ETL takes trust and hospital site locations from
+ORG_NAMES_PATH = RAW_DIR / "unique_org_names.csv"
+HOSPITAL_PATH = RAW_DIR / "hospital.csv"
+
+# The trust index is built once per load version and shared by every session
+_TRUST_INDEX = {"version": None, "index": None}
+_TRUST_INDEX_LOCK = threading.Lock()
+_POSTCODES = {"key": None, "locations": None}
+
+
+def load_trust_index() -> SpatialIndex:
+    """
+    Return the spatial index of trusts in the latest period.
+
+    The index is rebuilt only when the ETL loads a new version. Each point
+    carries the trust's latest counts plus 'pct_seen_within_4hrs'.
+
+    Returns:
+        SpatialIndex: Index over the trusts with coordinates.
+    """
+    version = current_load_version()
+    with _TRUST_INDEX_LOCK:
+        if _TRUST_INDEX["index"] is None or _TRUST_INDEX["version"] != version:
+            trusts = load_latest_geospatial_data()
+            trusts["org_code"] = trusts["org_code"].astype(str)
+            attendances = trusts["ae_attendances_type_1"].astype("Float64")
+            trusts["pct_seen_within_4hrs"] = (
+                100 * (attendances - trusts["attendances_over_4hrs_type_1"]) / attendances.where(attendances > 0)
+            ).astype(float)
+            _TRUST_INDEX["index"] = SpatialIndex(trusts)
+            _TRUST_INDEX["version"] = version
+        return _TRUST_INDEX["index"]
+
+
+def trusts_within(lat: float, lon: float, radius_km: float) -> pd.DataFrame:
+    """
+    Return the trusts within `radius_km` of a location in the latest period.
+
+    Returns:
+        pd.DataFrame: Trusts with their 'distance_km', nearest first.
+    """
+    return load_trust_index().within(lat, lon, radius_km)
+
+
+def compare_with_neighbours(org_code: str, k: int = 5) -> tuple[pd.Series, pd.DataFrame]:
+    """
+    Compare a trust with its `k` nearest trusts in the latest period.
+
+    Args:
+        org_code (str): ODS code of the trust.
+        k (int): Number of neighbouring trusts. Default is 5.
+
+    Returns:
+        tuple[pd.Series, pd.DataFrame]: The trust's row, and its neighbours
+        (nearest first) with their 'distance_km'.
+
+    Raises:
+        KeyError: If the trust has no location in the latest period.
+    """
+    index = load_trust_index()
+    matches = index.points[index.points["org_code"] == org_code]
+    if matches.empty:
+        raise KeyError(f"No location for trust {org_code} in the latest period")
+
+    trust = matches.iloc[0]
+    neighbours = index.nearest(trust["latitude"], trust["longitude"], k + 1)
+    neighbours = neighbours[neighbours["org_code"] != org_code].head(k).reset_index(drop=True)
+    return trust, neighbours
+
+
+def postcode_location(postcode: str) -> tuple[float, float] | None:
+    """
+    Look up the coordinates of a postcode from the trust and hospital reference files.
+
+    A postcode that is not in the reference files falls back to the average
+    location of the known postcodes in the same district (e.g. "NW3").
+
+    Args:
+        postcode (str): UK postcode, in any case and spacing.
+
+    Returns:
+        tuple[float, float] | None: (latitude, longitude), or None if neither
+        the postcode nor its district is known.
+    """
+    locations = _postcode_locations()
+    key = _normalise_postcode(postcode)
+    if not key:
+        return None
+
+    if key in locations.index:
+        row = locations.loc[key]
+        return float(row["latitude"]), float(row["longitude"])
+
+    # Outward code: everything before the 3-character inward code
+    district = key[:-3] if len(key) > 4 else key
+    nearby = locations[locations["district"] == district]
+    if nearby.empty:
+        return None
+    return float(nearby["latitude"].mean()), float(nearby["longitude"].mean())
+
+
+def _postcode_locations() -> pd.DataFrame:
+    """Postcode -> latitude/longitude from the reference files, re-read when either file changes."""
+    paths = [p for p in (ORG_NAMES_PATH, HOSPITAL_PATH) if p.exists()]
+    key = tuple((str(p), p.stat().st_mtime) for p in paths)
+    if _POSTCODES["key"] != key:
+        frames = []
+        if ORG_NAMES_PATH.exists():
+            frames.append(pd.read_csv(ORG_NAMES_PATH)[["postcode", "latitude", "longitude"]])
+        if HOSPITAL_PATH.exists():
+            hospitals = pd.read_csv(HOSPITAL_PATH)
+            frames.append(hospitals.rename(columns={
+                "Postcode": "postcode", "Latitude": "latitude", "Longitude": "longitude"
+            })[["postcode", "latitude", "longitude"]])
+
+        locations = pd.concat(frames) if frames else pd.DataFrame(columns=["postcode", "latitude", "longitude"])
+        locations = locations.dropna()
+        locations["postcode"] = locations["postcode"].map(_normalise_postcode)
+        locations = locations.drop_duplicates("postcode").set_index("postcode")
+        locations["district"] = [p[:-3] if len(p) > 4 else p for p in locations.index]
+        _POSTCODES.update(key=key, locations=locations)
+    return _POSTCODES["locations"]
+
+
+def _normalise_postcode(postcode) -> str:
+    return "".join(str(postcode).split()).upper()
@@ -1,29 +1,20 @@
 import pandas as pd
-from pathlib import Path
-from etl_process.src.utils.db_engine import db_engine
-from etl_process.src.sql.sql_utils import run_sql_query  # Fixed import
+from etl_process.src.sql.sql_utils import SQL_DIR, run_sql_queries_concurrently, run_sql_query
 
 def load_latest_summary() -> pd.DataFrame:
     """
     Load the latest summary data for the homepage from the target database.
 
     Steps:
-    - Connects to the target database using `db_engine`.
-    - Reads the SQL query from `latest_home.sql`.
-    - Executes the query and returns the results as a pandas DataFrame.
+    - Runs the `latest_home.sql` query using `run_sql_query`
+      (cached until the ETL loads new data).
+    - Returns the results as a pandas DataFrame.
 
     Returns:
         pd.DataFrame: Latest summary data for use on the homepage.
     """
-    # Establish connection to the target database
-    engine = db_engine(db="TARGET")
-
-    # Load SQL query from file
-    sql_path = Path("etl_process/src/sql/latest_home.sql")
-    query = sql_path.read_text()
-
     # Execute query and return results as DataFrame
-    df = pd.read_sql(query, engine)
+    df = run_sql_query(SQL_DIR / "latest_home.sql")
     return df
 
 
@@ -53,8 +44,40 @@ def load_trust_12hr_summary() -> pd.DataFrame:
         pd.DataFrame: DataFrame containing 12-hour wait summary by trust.
     """
     # Path to SQL query file
-    query_path = "etl_process/src/sql/trust_12hr_summary.sql"
+    query_path = SQL_DIR / "trust_12hr_summary.sql"
 
     # Execute SQL and return results
     df = run_sql_query(query_path)
     return df
+
+
+def load_home_data(timeout: float | None = None) -> tuple[dict[str, pd.DataFrame], dict[str, str]]:
+    """
+    Load every dataset the homepage needs at the same time.
+
+    Steps:
+    - Runs `latest_home.sql` and `trust_12hr_summary.sql` concurrently using
+      `run_sql_queries_concurrently` (cached until the ETL loads new data),
+      so the page waits for the slowest query rather than all of them in turn.
+    - Shares the one summary frame between the summary and national trends,
+      since both come from the same query.
+
+    Args:
+        timeout (float | None): Seconds to wait for each query. Defaults to
+            DASHBOARD_QUERY_TIMEOUT.
+
+    Returns:
+        tuple[dict[str, pd.DataFrame], dict[str, str]]: The "summary", "trends"
+        and "trust_12hr" datasets that loaded, and an error message for each
+        one that did not.
+    """
+    data, errors = run_sql_queries_concurrently({
+        "summary": SQL_DIR / "latest_home.sql",
+        "trust_12hr": SQL_DIR / "trust_12hr_summary.sql",
+    }, timeout=timeout)
+
+    if "summary" in data:
+        data["trends"] = data["summary"]
+    elif "summary" in errors:
+        errors["trends"] = errors["summary"]
+    return data, errors
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from src.utils.json_files import write_json_atomic
+
+# The manifest lives alongside the processed output it describes
+MANIFEST_PATH = Path(__file__).resolve().parents[2] / "data" / "processed" / "manifest.json"
+
+
+def file_fingerprint(file_path: str) -> dict:
+    """
+    Return the size, modification time and SHA-256 hash of a file.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        dict: {"size": int, "mtime": float, "sha256": str}
+    """
+    stat = os.stat(file_path)
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(block)
+
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha256.hexdigest()}
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> dict:
+    """
+    Load the processed-file manifest, or an empty one if none has been saved yet.
+
+    The manifest has two keys:
+        files: raw file path (relative to the raw folder) -> size, mtime,
+            sha256, row_count and the periods the file covers.
+        pending_periods: periods transformed but not yet loaded into the database.
+    """
+    path = Path(path)
+    if not path.exists():
+        return {"files": {}, "pending_periods": []}
+
+    with open(path) as f:
+        manifest = json.load(f)
+
+    manifest.setdefault("files", {})
+    manifest.setdefault("pending_periods", [])
+    return manifest
+
+
+def save_manifest(manifest: dict, path: Path = MANIFEST_PATH):
+    """Write the manifest atomically so an interrupted run never leaves it half written."""
+    write_json_atomic(manifest, path, indent=2, sort_keys=True)
+
+
+def diff_manifest(file_paths: list[str], manifest: dict, raw_dir: str) -> tuple[list[str], list[str]]:
+    """
+    Compare raw files on disk against the manifest.
+
+    A file whose size and mtime match its manifest entry is treated as
+    unchanged without being hashed. Otherwise its content hash decides, so
+    a file that was only touched is not reprocessed.
+
+    Args:
+        file_paths (list[str]): Raw files currently on disk.
+        manifest (dict): Manifest returned by load_manifest.
+        raw_dir (str): Raw data folder the manifest keys are relative to.
+
+    Returns:
+        tuple[list[str], list[str]]: Paths of new or changed files, and
+        manifest keys of files that no longer exist on disk.
+    """
+    entries = manifest["files"]
+    changed = []
+    seen = set()
+
+    for file_path in file_paths:
+        key = manifest_key(file_path, raw_dir)
+        seen.add(key)
+        entry = entries.get(key)
+
+        if entry is None:
+            changed.append(file_path)
+            continue
+
+        stat = os.stat(file_path)
+        if stat.st_size == entry["size"] and stat.st_mtime == entry["mtime"]:
+            continue
+
+        fingerprint = file_fingerprint(file_path)
+        if fingerprint["sha256"] != entry["sha256"]:
+            changed.append(file_path)
+        else:
+            # Only the timestamp moved, so remember it to skip hashing next time
+            entry["mtime"] = fingerprint["mtime"]
+
+    removed = [key for key in entries if key not in seen]
+    return changed, removed
+
+
+def manifest_key(file_path: str, raw_dir: str) -> str:
+    """Return the manifest key for a raw file: its path relative to the raw folder."""
+    return Path(os.path.relpath(file_path, raw_dir)).as_posix()
+
+
+def pending_periods(path: Path = MANIFEST_PATH) -> list[str]:
+    """Return the ISO dates of periods transformed but not yet loaded."""
+    return sorted(load_manifest(path)["pending_periods"])
+
+
+def clear_pending_periods(path: Path = MANIFEST_PATH):
+    """Mark all pending periods as loaded."""
+    manifest = load_manifest(path)
+    manifest["pending_periods"] = []
+    save_manifest(manifest, path)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+MONTH_MAP = {
+    'JANUARY': '01', 'FEBRUARY': '02', 'MARCH': '03', 'APRIL': '04',
+    'MAY': '05', 'JUNE': '06', 'JULY': '07', 'AUGUST': '08',
+    'SEPTEMBER': '09', 'OCTOBER': '10', 'NOVEMBER': '11', 'DECEMBER': '12'
+}
+
+# Monthly sitrep periods, e.g. "MSitAE-JANUARY-2020" or "January 2020"
+MONTHLY_PATTERN = rf"(?P<month>{'|'.join(MONTH_MAP)})[\s-]+(?P<year>\d{{4}})"
+
+# Weekly sitrep periods given as the week-ending date, e.g. "W/E 05/01/2025"
+WEEKLY_PATTERN = r"W/?E[\s-]*(?P<day>\d{1,2})/(?P<month>\d{1,2})/(?P<year>\d{4})"
+
+# NHS financial-year quarters, e.g. "Q1 2024-25" (Q1 starts in April)
+FINANCIAL_QUARTER_PATTERN = r"Q(?P<quarter>[1-4])[\s-]*(?P<year>\d{4})-\d{2}"
+
+# Calendar quarters, e.g. "2024-Q1" or "2024 Q1"
+CALENDAR_QUARTER_PATTERN = r"^(?P<year>\d{4})[\s-]*Q(?P<quarter>[1-4])$"
+
+# ISO dates or months, e.g. "2024-01-01" or "2024-01"
+ISO_PATTERN = r"^\d{4}-\d{2}(-\d{2})?"
+
+
+def parse_periods(periods: pd.Series) -> pd.Series:
+    """
+    Parse NHS period labels into timestamps.
+
+    Each distinct label is parsed once and the results are broadcast back to
+    every row through the categorical codes, so the cost depends on the number
+    of distinct periods rather than the number of rows.
+
+    Supported formats:
+        - Monthly: "MSitAE-JANUARY-2020" -> 2020-01-01
+        - Weekly: "W/E 05/01/2025" -> 2025-01-05 (week ending)
+        - Financial quarter: "Q1 2024-25" -> 2024-04-01
+        - Calendar quarter: "2024-Q1" -> 2024-01-01
+        - ISO: "2024-01" -> 2024-01-01, "2024-01-15" -> 2024-01-15
+
+    Args:
+        periods (pd.Series): Period labels. Missing values are allowed.
+
+    Returns:
+        pd.Series: Timestamps with the same index, NaT where a label could not be parsed.
+    """
+    categorical = pd.Categorical(periods)
+    parsed = _parse_distinct(pd.Series(categorical.categories.astype(str)))
+
+    # Code -1 marks a missing label; the trailing NaT makes it index to NaT
+    values = np.append(parsed.to_numpy(dtype="datetime64[ns]"), np.datetime64("NaT", "ns"))
+    return pd.Series(values[categorical.codes], index=periods.index, name=periods.name)
+
+
+def _parse_distinct(labels: pd.Series) -> pd.Series:
+    """Parse a Series of distinct period labels, trying each supported format in turn."""
+    labels = labels.str.strip().str.upper()
+    parsed = pd.Series(pd.NaT, index=labels.index, dtype="datetime64[ns]")
+
+    monthly = labels.str.extract(MONTHLY_PATTERN).dropna()
+    parsed.loc[monthly.index] = pd.to_datetime(
+        monthly["year"] + "-" + monthly["month"].map(MONTH_MAP) + "-01"
+    )
+
+    weekly = labels[parsed.isna()].str.extract(WEEKLY_PATTERN).dropna()
+    parsed.loc[weekly.index] = pd.to_datetime(
+        weekly["year"] + "-" + weekly["month"].str.zfill(2) + "-" + weekly["day"].str.zfill(2),
+        errors="coerce",
+    )
+
+    financial = labels[parsed.isna()].str.extract(FINANCIAL_QUARTER_PATTERN).dropna()
+    parsed.loc[financial.index] = _quarter_start(
+        financial["year"].astype(int), financial["quarter"].astype(int) + 1
+    )
+
+    calendar = labels[parsed.isna()].str.extract(CALENDAR_QUARTER_PATTERN).dropna()
+    parsed.loc[calendar.index] = _quarter_start(
+        calendar["year"].astype(int), calendar["quarter"].astype(int)
+    )
+
+    iso = labels[parsed.isna() & labels.str.match(ISO_PATTERN)]
+    parsed.loc[iso.index] = pd.to_datetime(iso, format="ISO8601", errors="coerce")
+
+    return parsed
+
+
+def _quarter_start(years: pd.Series, quarters: pd.Series) -> pd.Series:
+    """Return the first day of calendar quarter 1-4 (quarter 5 rolls into the next year)."""
+    months = (quarters - 1) * 3 + 1
+    years = years + (months - 1) // 12
+    months = (months - 1) % 12 + 1
+    return pd.to_datetime(pd.DataFrame({"year": years, "month": months, "day": 1}))
@@ -0,0 +1,215 @@
+import hashlib
+import html
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from etl_process.src.load.summaries import GEO_BIN_LEVELS
+from etl_process.src.transform.figures import get_figure
+from etl_process.src.transform.load_operational import (
+    load_latest_geospatial_data,
+    load_latest_operational_data,
+    load_operational_data,
+    load_trust_directory,
+)
+from etl_process.src.transform.load_summary import load_latest_summary
+from etl_process.src.utils.json_files import write_json_atomic
+
+# Static copy of the dashboard for read-only viewers, rebuilt by the ETL after each load
+SNAPSHOT_DIR = Path(__file__).resolve().parents[2] / "data" / "output" / "snapshot"
+
+# Bump when the page layout changes so every page is re-rendered
+SNAPSHOT_FORMAT = 1
+
+PAGES = {
+    "index": "Overview",
+    "operational": "Operational Pressure",
+    "geospatial": "Geospatial Mapping",
+}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title} – NHS A&amp;E Dashboard</title>
+<script src="{root}plotly.min.js"></script>
+<style>
+body {{ font-family: sans-serif; margin: 2rem auto; max-width: 1100px; padding: 0 1rem; }}
+nav a {{ margin-right: 1rem; }}
+.metrics {{ display: flex; gap: 2rem; }}
+.metric strong {{ display: block; font-size: 1.6rem; }}
+table {{ border-collapse: collapse; }}
+td, th {{ padding: 0.2rem 0.6rem; border-bottom: 1px solid #ddd; text-align: left; }}
+</style>
+</head>
+<body>
+<nav>{nav}</nav>
+<h1>{title}</h1>
+<p><em>Snapshot of data loaded up to {as_of}.</em></p>
+{body}
+</body>
+</html>
+"""
+
+
+def export_snapshot(output_dir: Path | None = None) -> dict:
+    """
+    Render the dashboard pages to static HTML and JSON under data/output/snapshot.
+
+    Writes the Overview (index.html), Operational Pressure and Geospatial pages
+    plus one page per trust (trusts/<org_code>.html). Every page also gets a
+    .json bundle with its figures and data. The page figures come from the
+    figure cache, so the ones the ETL has just prebuilt are reused.
+
+    Trust pages are only re-rendered when the trust's monthly figures have
+    changed since the last export (tracked in snapshot_manifest.json), and
+    pages of trusts that are no longer reported are deleted.
+
+    Args:
+        output_dir (Path | None): Folder to write to. Defaults to the
+            SNAPSHOT_DIR environment variable, then data/output/snapshot.
+
+    Returns:
+        dict: Counts of "pages", "trusts_rendered", "trusts_unchanged" and "trusts_removed".
+    """
+    output_dir = Path(output_dir or os.getenv("SNAPSHOT_DIR") or SNAPSHOT_DIR)
+    (output_dir / "trusts").mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / "snapshot_manifest.json"
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        manifest = {"format": SNAPSHOT_FORMAT, "trusts": {}}
+
+    # One copy of plotly.js shared by every page
+    plotly_js = output_dir / "plotly.min.js"
+    if not plotly_js.exists():
+        plotly_js.write_text(get_plotlyjs(), encoding="utf-8")
+
+    history = load_operational_data()
+    as_of = history["period"].max().strftime("%B %Y") if not history.empty else "no data"
+
+    _write_page(output_dir, "index", as_of, *_overview())
+    _write_page(output_dir, "operational", as_of, *_operational())
+    _write_page(output_dir, "geospatial", as_of, *_geospatial())
+
+    counts = {"pages": len(PAGES), "trusts_rendered": 0, "trusts_unchanged": 0, "trusts_removed": 0}
+    trusts = load_trust_directory()
+    for org_code, org_name in zip(trusts["org_code"].astype(str), trusts["org_name"].astype(str)):
+        trust_df = history[history["org_code"] == org_code].reset_index(drop=True)
+        fingerprint = _fingerprint(trust_df)
+        if manifest["trusts"].get(org_code) == fingerprint and (output_dir / "trusts" / f"{org_code}.html").exists():
+            counts["trusts_unchanged"] += 1
+            continue
+
+        figure = get_figure("trust_trend", org_code=org_code)
+        body = _figure_html(figure) + _table_html(trust_df.sort_values("period", ascending=False))
+        _write_page(output_dir, f"trusts/{org_code}", as_of, org_name, body,
+                    {"figures": {"trust_trend": figure}, "data": _records(trust_df)})
+        manifest["trusts"][org_code] = fingerprint
+        counts["trusts_rendered"] += 1
+
+    # Drop pages of trusts that have left the directory
+    for org_code in set(manifest["trusts"]) - set(trusts["org_code"].astype(str)):
+        for suffix in (".html", ".json"):
+            (output_dir / "trusts" / f"{org_code}{suffix}").unlink(missing_ok=True)
+        del manifest["trusts"][org_code]
+        counts["trusts_removed"] += 1
+
+    write_json_atomic(manifest, manifest_path, indent=2, sort_keys=True)
+    print(
+        f"Snapshot exported to {output_dir}: {counts['trusts_rendered']} trust pages rendered, "
+        f"{counts['trusts_unchanged']} unchanged, {counts['trusts_removed']} removed"
+    )
+    return counts
+
+
+def _overview() -> tuple[str, str, dict]:
+    """Title, HTML body and JSON bundle of the Overview page."""
+    summary_df = load_latest_summary()
+    figure = get_figure("national_trend")
+    body = ""
+    if not summary_df.empty:
+        latest = summary_df.sort_values("month").iloc[-1]
+        body += _metrics_html({
+            "Type 1 Attendances": f"{int(latest['attendances_type_1']):,}",
+            "% Seen Within 4 Hours": f"{latest['pct_seen_within_4hrs']:.1f}%",
+            "12-Hour Waits": f"{int(latest['patients_12hr_wait']):,}",
+        })
+    body += "<h2>National Performance Over Time</h2>" + _figure_html(figure)
+    return PAGES["index"], body, {"figures": {"national_trend": figure}, "data": _records(summary_df)}
+
+
+def _operational() -> tuple[str, str, dict]:
+    """Title, HTML body and JSON bundle of the Operational Pressure page."""
+    latest_df = load_latest_operational_data()
+    latest_df = latest_df[latest_df["attendances_type_1"] > 0].dropna(subset=["pct_seen_within_4hrs"])
+    figure = get_figure("performance_extremes")
+
+    body = _metrics_html({
+        "Total Attendances": f"{int(latest_df['attendances_type_1'].sum()):,}",
+        "Total Breaches": f"{int(latest_df['over_4hrs_type_1'].sum()):,}",
+        "Avg % Seen Within 4hrs": f"{latest_df['pct_seen_within_4hrs'].mean():.1f}%",
+    })
+    body += "<h2>Top vs Bottom Performing Trusts</h2>" + _figure_html(figure)
+
+    # Trust list linking to the per-trust pages
+    links = latest_df.sort_values("org_name")
+    links = links.assign(org_name=[
+        f'<a href="trusts/{html.escape(code)}.html">{html.escape(name)}</a>'
+        for code, name in zip(links["org_code"].astype(str), links["org_name"].astype(str))
+    ])
+    body += "<h2>Trusts</h2>" + _table_html(links, escape=False)
+    return PAGES["operational"], body, {"figures": {"performance_extremes": figure}, "data": _records(latest_df)}
+
+
+def _geospatial() -> tuple[str, str, dict]:
+    """Title, HTML body and JSON bundle of the Geospatial Mapping page, with a map per detail level."""
+    latest_df = load_latest_geospatial_data()
+    figures = {"trusts": get_figure("geo_map", level=None)}
+    figures.update({f"level_{level}": get_figure("geo_map", level=level) for level in GEO_BIN_LEVELS})
+
+    body = _metrics_html({"Total 12-Hour Waits": f"{int(latest_df['patients_12hr_wait'].sum()):,}"})
+    for name, figure in figures.items():
+        body += f"<h2>{name.replace('_', ' ').title()}</h2>" + _figure_html(figure)
+    return PAGES["geospatial"], body, {"figures": figures, "data": _records(latest_df)}
+
+
+def _write_page(output_dir: Path, name: str, as_of: str, title: str, body: str, bundle: dict):
+    """Write <name>.html and <name>.json, replacing any previous version atomically."""
+    root = "../" * name.count("/")
+    nav = "".join(f'<a href="{root}{page}.html">{label}</a>' for page, label in PAGES.items())
+    page = PAGE_TEMPLATE.format(title=html.escape(title), root=root, nav=nav, as_of=as_of, body=body)
+
+    for suffix, content in ((".html", page), (".json", json.dumps(bundle, default=str))):
+        path = output_dir / f"{name}{suffix}"
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+def _figure_html(figure: dict) -> str:
+    return pio.to_html(figure, full_html=False, include_plotlyjs=False)
+
+
+def _metrics_html(metrics: dict) -> str:
+    items = "".join(
+        f'<div class="metric">{html.escape(label)}<strong>{html.escape(value)}</strong></div>'
+        for label, value in metrics.items()
+    )
+    return f'<div class="metrics">{items}</div>'
+
+
+def _table_html(df: pd.DataFrame, escape: bool = True) -> str:
+    return df.to_html(index=False, escape=escape, na_rep="", float_format=lambda x: f"{x:.1f}")
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def _fingerprint(df: pd.DataFrame) -> str:
+    """Hash of a trust's rows, used to skip re-rendering unchanged trust pages."""
+    return hashlib.sha256(df.to_csv(index=False).encode()).hexdigest()
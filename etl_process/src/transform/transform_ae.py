@@ -1,21 +1,86 @@
 import pandas as pd
 import glob
+import itertools
 import os
 
-def transform_ae_data():
+from src.transform.ingest import DEFAULT_CHUNK_SIZE, RENAME_MAP, iter_ae_file, read_ae_files, read_header
+from src.transform.manifest import (
+    MANIFEST_PATH,
+    diff_manifest,
+    file_fingerprint,
+    load_manifest,
+    manifest_key,
+    save_manifest,
+)
+from src.transform.periods import parse_periods
+from src.utils.dataset_schema import COUNT_DTYPES, compact_frame
+from src.utils.instrumentation import path_size, stage
+from src.utils.processed_store import (
+    iter_processed,
+    processed_exists,
+    read_processed,
+    write_processed,
+    write_processed_batches,
+)
+
+# Name of the cleaned dataset in the processed Parquet store
+OUTPUT_NAME = "ae_data_cleaned"
+
+# The standardised schema we want to keep
+CLEANED_COLUMNS = [
+    "period",
+    "org_code",
+    "org_name",
+    "ae_attendances_type_1",
+    "attendances_over_4hrs_type_1",
+    "patients_12hr_wait",
+    "emergency_admissions_type_1"
+]
+
+
+def transform_ae_data(incremental: bool = False, streaming: bool = False,
+                      raw_dir: str | None = None, processed_dir: str | None = None,
+                      manifest_path: str | None = None):
+    """
+    Transform raw A&E CSVs into the cleaned dataset in data/processed.
+
+    With incremental=True only raw files that are new or changed since the
+    last run (according to the manifest) are read. Their periods are rebuilt
+    and merged into the existing processed output, and added to the
+    manifest's pending periods for the load step to upsert.
+
+    With streaming=True the raw files are read in chunks and cleaned, deduplicated
+    and written one batch at a time (see stream_clean_ae_data), so the
+    dataset never has to fit in memory.
+
+    Args:
+        incremental (bool): Reuse the existing processed output where the
+            raw files are unchanged. Default is False (full rebuild).
+        streaming (bool): Process the data in batches. Default is False.
+        raw_dir (str | None): Folder of raw CSVs. Defaults to data/raw.
+        processed_dir (str | None): Output folder. Defaults to data/processed.
+        manifest_path (str | None): Manifest file. Defaults to MANIFEST_PATH.
+
+    Returns:
+        pd.DataFrame | None: The full cleaned A&E dataset, or None when
+        streaming (read it back in batches with iter_processed).
+    """
     # Get the absolute path to the root of the project
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.abspath(os.path.join(script_dir, "..", ".."))
 
     # Define input and output folders for raw and processed data
-    RAW_DIR = os.path.join(project_root, "data", "raw")
-    PROCESSED_DIR = os.path.join(project_root, "data", "processed")
+    RAW_DIR = raw_dir or os.path.join(project_root, "data", "raw")
+    PROCESSED_DIR = processed_dir or os.path.join(project_root, "data", "processed")
+    manifest_path = manifest_path or MANIFEST_PATH
 
     print(f"Looking for raw CSVs in: {RAW_DIR}")
     print(f"Processed data will be saved in: {PROCESSED_DIR}")
 
     # Glob looks for any CSV starting with "ae_" inside raw data folders
-    ae_files = glob.glob(os.path.join(RAW_DIR, "**", "ae_*.csv"), recursive=True)
+    with stage("glob") as record:
+        ae_files = glob.glob(os.path.join(RAW_DIR, "**", "ae_*.csv"), recursive=True)
+        record["files"] = len(ae_files)
     print(f"Found {len(ae_files)} A&E CSV files:")
     print(ae_files)
 
@@ -23,133 +88,288 @@ def transform_ae_data():
     if not ae_files:
         raise FileNotFoundError("No A&E CSV files found. Check folder structure or filenames.")
 
-    # Read each CSV into a DataFrame, then merge into one big DataFrame
-    ae_df_list = [pd.read_csv(f) for f in ae_files]
-    ae_data = pd.concat(ae_df_list, ignore_index=True)
-    print("Combined dataframe shape:", ae_data.shape)
-
-    # Strip whitespace from column names. Standardise the column names by removing trailing spaces
-    ae_data.columns = ae_data.columns.str.strip()
-
-    # Different CSVs may use slightly different headers so they are mapped to a standard schema
-    rename_map = {
-        # Period
-        "Period": "period",
-        "Reporting Period": "period",
+    manifest = load_manifest(manifest_path)
+    entries = manifest["files"]
 
-        # Org Code
-        "Org Code": "org_code",
-        "Organisation Code": "org_code",
+    # Work out which raw files need reading
+    if incremental and processed_exists(OUTPUT_NAME, PROCESSED_DIR):
+        mtimes = {key: entry.get("mtime") for key, entry in entries.items()}
+        changed_files, removed_keys = diff_manifest(ae_files, manifest, RAW_DIR)
+    else:
+        incremental = False
+        changed_files, removed_keys = ae_files, []
+        entries.clear()
+
+    if incremental and not changed_files and not removed_keys:
+        print("No new or changed raw files. Processed data is up to date.")
+        # Touched but identical files have new mtimes, saved so they are not hashed again next run
+        if any(entry.get("mtime") != mtimes.get(key) for key, entry in entries.items()):
+            save_manifest(manifest, manifest_path)
+        return None if streaming else read_processed(OUTPUT_NAME, processed_dir=PROCESSED_DIR)
+
+    print(f"Raw files to process: {len(changed_files)} new or changed, {len(removed_keys)} removed")
+
+    # Periods covered by the old versions of changed or removed files need rebuilding too
+    affected_periods = set()
+    for key in removed_keys:
+        affected_periods.update(entries.pop(key)["periods"])
+    for f in changed_files:
+        affected_periods.update(entries.get(manifest_key(f, RAW_DIR), {}).get("periods", []))
+
+    if streaming:
+        # Only the period column is scanned up front; the data is read later in chunks
+        file_stats = [_scan_file(f) for f in changed_files]
+    else:
+        # Read the needed columns of each CSV in parallel
+        ae_df_list = _read_files(changed_files)
+        file_stats = [(len(df), _file_labels(df)) for df in ae_df_list]
+
+    # Every file's labels are parsed together, as parse_periods has a fixed cost per call
+    file_periods = _periods_by_file([labels for _, labels in file_stats])
+
+    # Record what each file contained in the manifest
+    for f, (row_count, _), periods in zip(changed_files, file_stats, file_periods):
+        entries[manifest_key(f, RAW_DIR)] = {
+            **file_fingerprint(f),
+            "row_count": row_count,
+            "periods": periods,
+        }
+        affected_periods.update(periods)
+
+    # Unchanged files that share an affected period are re-read so the period is rebuilt in full
+    overlapping_files = []
+    if incremental:
+        overlapping_files = [
+            f for f in ae_files
+            if f not in changed_files
+            and affected_periods.intersection(entries[manifest_key(f, RAW_DIR)]["periods"])
+        ]
+
+    if streaming:
+        # Reading, cleaning and writing are interleaved, so they are timed as one stage
+        files_to_read = changed_files + overlapping_files
+        with stage("stream_transform", files=len(files_to_read)) as record:
+            record["bytes_read"] = sum(path_size(f) for f in files_to_read)
+            batches = stream_clean_ae_data(files_to_read)
+            if incremental:
+                # Unaffected periods are copied over from the existing output batch by batch
+                existing = iter_processed(
+                    OUTPUT_NAME, exclude_periods=sorted(affected_periods), processed_dir=PROCESSED_DIR
+                )
+                batches = itertools.chain(existing, batches)
+
+            output_path, rows = write_processed_batches(batches, OUTPUT_NAME, PROCESSED_DIR)
+            record["rows_out"] = rows
+            record["bytes_written"] = path_size(output_path)
+        print(f"Cleaned A&E data streamed to {output_path}. Rows: {rows}")
+        _save_pending_periods(manifest, affected_periods, manifest_path)
+        return None
+
+    if overlapping_files:
+        ae_df_list += _read_files(overlapping_files)
+
+    cleaned_ae_data = clean_ae_data(ae_df_list) if ae_df_list else None
+
+    # Merge the rebuilt periods into the existing processed output
+    if incremental:
+        existing = read_processed(OUTPUT_NAME, processed_dir=PROCESSED_DIR)
+        existing = existing[~existing["period"].dt.strftime("%Y-%m-%d").isin(affected_periods)]
+        # Categories differ between the two frames, so the merged frame is compacted again
+        cleaned_ae_data = compact_frame(
+            pd.concat([existing, cleaned_ae_data], ignore_index=True)
+            .sort_values("period")
+            .reset_index(drop=True)
+        )
+        print("Processed dataframe shape after merging changed periods:", cleaned_ae_data.shape)
 
-        # Org Name
-        "Org name": "org_name",
-        "Organisation Name": "org_name",
+    # Ensure processed folder exists
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
 
-        # Attendances (Type 1)
-        "Number of A&E attendances Type 1": "ae_attendances_type_1",
-        "A&E attendances Type 1": "ae_attendances_type_1",
+    # Save cleaned data as year-partitioned Parquet with explicit column types
+    with stage("write", rows_in=len(cleaned_ae_data)) as record:
+        output_path = write_processed(cleaned_ae_data, OUTPUT_NAME, PROCESSED_DIR)
+        record["bytes_written"] = path_size(output_path)
+    print(f"Cleaned A&E data saved to {output_path}")
 
-        # Attendances over 4hrs (Type 1)
-        "Number of attendances over 4hrs Type 1": "attendances_over_4hrs_type_1",
-        "Attendances over 4hrs Type 1": "attendances_over_4hrs_type_1",
+    _save_pending_periods(manifest, affected_periods, manifest_path)
 
-        # 12hr waits
-        "Patients who have waited 12+ hrs from DTA to admission": "patients_12hr_wait",
-        "12 hour waits": "patients_12hr_wait",
+    '''
+    this script finds all raw A&E data
+    (or only the files that changed since the last run)
+    combines it into a single data frame
+    standardises col names 
+    parses period into datetime
+    keeps the cols I care about
+    drops duplicates and sorts chronologically
+    and finally exports it to data/processed as Parquet
+    '''
 
-        # Emergency admissions (Type 1)
-        "Emergency admissions via A&E - Type 1": "emergency_admissions_type_1",
-        "Emergency Admissions Type 1": "emergency_admissions_type_1",
-    }
+    return cleaned_ae_data
 
-    # This loops over rename_map and only includes pairs where the key exists 
-    existing_rename_map = {k: v for k, v in rename_map.items() if k in ae_data.columns}
 
-    # This builds a list of keys that are not present
-    missing_cols = [k for k in rename_map.keys() if k not in ae_data.columns]
+def _read_files(file_paths: list[str]) -> list[pd.DataFrame]:
+    """Read raw files with read_ae_files, recording a "read" stage."""
+    with stage("read", files=len(file_paths)) as record:
+        record["bytes_read"] = sum(path_size(f) for f in file_paths)
+        ae_df_list = read_ae_files(file_paths)
+        record["rows_out"] = sum(len(df) for df in ae_df_list)
+    return ae_df_list
+
+
+def _save_pending_periods(manifest: dict, affected_periods: set, manifest_path):
+    """Save the manifest with the affected periods added to its pending periods."""
+    # The load step upserts pending periods, then clears them
+    manifest["pending_periods"] = sorted(affected_periods.union(manifest["pending_periods"]))
+    save_manifest(manifest, manifest_path)
+
+
+def _scan_file(file_path: str) -> tuple[int, set[str]]:
+    """Return the row count and distinct period labels of a raw file, reading only its period column."""
+    row_count = 0
+    labels = set()
+    period_col = next(
+        (c for c in read_header(file_path) if RENAME_MAP.get(c.strip()) == "period"),
+        None,
+    )
+    with pd.read_csv(file_path, usecols=[period_col] if period_col else [0],
+                     dtype="category", chunksize=DEFAULT_CHUNK_SIZE) as reader:
+        for chunk in reader:
+            row_count += len(chunk)
+            if period_col:
+                labels.update(chunk[period_col].dropna().unique())
+    return row_count, labels
+
+
+def _file_labels(df: pd.DataFrame) -> set[str]:
+    """Return the distinct period labels found in one raw file."""
+    if "period" not in df.columns:
+        return set()
+    return set(df["period"].dropna().unique())
+
+
+def _periods_by_file(label_sets: list[set[str]]) -> list[list[str]]:
+    """
+    Parse the period labels of several files in one parse_periods call.
+
+    Args:
+        label_sets (list[set[str]]): Distinct period labels of each file.
+
+    Returns:
+        list[list[str]]: Sorted ISO dates of each file's parseable periods, in the same order.
+    """
+    labels = sorted(set().union(*label_sets))
+    parsed = parse_periods(pd.Series(labels, dtype="object")).dt.strftime("%Y-%m-%d")
+    iso_dates = {label: date for label, date in zip(labels, parsed) if isinstance(date, str)}
+    return [sorted({iso_dates[label] for label in file_labels if label in iso_dates})
+            for file_labels in label_sets]
+
+
+def clean_ae_data(ae_df_list: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Combine raw A&E DataFrames and clean them into the standard schema.
+
+    Args:
+        ae_df_list (list[pd.DataFrame]): DataFrames with canonical column
+            names, as returned by read_ae_files.
+
+    Returns:
+        pd.DataFrame: Cleaned rows with a parsed period, sorted by period.
+    """
+    # Every frame already has canonical, unique column names, so concat aligns them directly
+    with stage("normalise", rows_in=sum(len(df) for df in ae_df_list)) as record:
+        ae_data = pd.concat(ae_df_list, ignore_index=True)
+        record["rows_out"] = len(ae_data)
+    print("Combined dataframe shape:", ae_data.shape)
 
-    # And prints a warning if any expected columns are missing
+    # Prints a warning if any expected columns are missing from every file
+    missing_cols = [col for col in CLEANED_COLUMNS if col not in ae_data.columns]
     if missing_cols:
         print("WARNING: These columns were not found and will be skipped:")
         for col in missing_cols:
             print(f"- {col}")
 
-    ae_data = ae_data.rename(columns=existing_rename_map)
-
-    # Merge duplicate columns (keep all data, no NaNs)
-    for col in ae_data.columns[ae_data.columns.duplicated()]:
-        duplicate_cols = [c for c in ae_data.columns if c == col]
-        # Fill missing values from the next duplicate column
-        ae_data[col] = ae_data[duplicate_cols].bfill(axis=1).iloc[:, 0]
-
-    # This drops duplicate columns after merging
-    ae_data = ae_data.loc[:, ~ae_data.columns.duplicated()]
-    
-
     if 'period' in ae_data.columns:
-        ae_data['period'] = ae_data['period'].str.upper()  # normalise text to uppercase
-        month_map = {
-            'JANUARY': '01', 'FEBRUARY': '02', 'MARCH': '03', 'APRIL': '04',
-            'MAY': '05', 'JUNE': '06', 'JULY': '07', 'AUGUST': '08',
-            'SEPTEMBER': '09', 'OCTOBER': '10', 'NOVEMBER': '11', 'DECEMBER': '12'
-        }
-
-        # Try to convert date strings into timestamp
-        def parse_period(x):
-            try:
-                for month_name, month_num in month_map.items():
-                    if month_name in x:
-                        year = x.split('-')[-1]
-                        return pd.Timestamp(f"{year}-{month_num}-01")
-                return pd.NaT
-            except:
-                return pd.NaT
-
-        ae_data['period'] = ae_data['period'].apply(parse_period)
-        missing_dates = ae_data['period'].isna().sum()
-        print(f"Rows with unparsed periods: {missing_dates}")
+        with stage("parse_periods", rows_in=len(ae_data)) as record:
+            # Each distinct period label is parsed once and broadcast back to its rows
+            ae_data['period'] = parse_periods(ae_data['period'])
+            missing_dates = ae_data['period'].isna().sum()
+            print(f"Rows with unparsed periods: {missing_dates}")
+
+            # Rows without a period (e.g. the national TOTAL row) cannot be keyed by month
+            ae_data = ae_data.dropna(subset=['period'])
+            record["rows_out"] = len(ae_data)
     else:
         print("No 'period' column to parse!")
 
-    # This defines the standardised schema we want to keep 
-    cols_to_keep = [
-        "period",
-        "org_code",
-        "org_name",
-        "ae_attendances_type_1",
-        "attendances_over_4hrs_type_1",
-        "patients_12hr_wait",
-        "emergency_admissions_type_1"
-    ]
-
-    # Drops any cols we don't want to keep
-    existing_cols_to_keep = [col for col in cols_to_keep if col in ae_data.columns]
-    cleaned_ae_data = ae_data[existing_cols_to_keep]
+    # Drops any cols we don't want to keep, storing the rest compactly (categorical orgs, small ints)
+    existing_cols_to_keep = [col for col in CLEANED_COLUMNS if col in ae_data.columns]
+    cleaned_ae_data = compact_frame(ae_data[existing_cols_to_keep])
 
-    # Drop duplicate rows 
-    cleaned_ae_data = cleaned_ae_data.drop_duplicates()
+    with stage("dedupe", rows_in=len(cleaned_ae_data)) as record:
+        # Drop duplicate rows
+        cleaned_ae_data = cleaned_ae_data.drop_duplicates()
 
-    # Sort by period
-    cleaned_ae_data = cleaned_ae_data.sort_values("period").reset_index(drop=True)
+        # Sort by period
+        cleaned_ae_data = cleaned_ae_data.sort_values("period").reset_index(drop=True)
+        record["rows_out"] = len(cleaned_ae_data)
 
     print("Cleaned dataframe shape after dropping duplicates and sorting:", cleaned_ae_data.shape)
 
-    # Ensure processed folder exists
-    os.makedirs(PROCESSED_DIR, exist_ok=True)
-
-    # Save cleaned data
-    output_file = os.path.join(PROCESSED_DIR, "ae_data_cleaned.csv")
-    cleaned_ae_data.to_csv(output_file, index=False)
-    print(f"Cleaned A&E data saved to {output_file}")
+    return cleaned_ae_data
 
-    '''
-    this script finds all raw A&E data
-    combines it into a single data frame
-    standardises col names 
-    parses period into datetime
-    keeps the cols I care about
-    drops duplicates and sorts chronologically
-    and finally exports it to data/processed 
-    '''
 
-    return cleaned_ae_data
+def stream_clean_ae_data(file_paths: list[str], chunksize: int | None = None):
+    """
+    Clean raw A&E CSVs as a generator of batches instead of one combined frame.
+
+    Each file is read in chunks (see iter_ae_file), then each chunk is
+    normalised to the standard columns, filtered to rows with a period,
+    has its periods parsed and is deduplicated against every row already
+    emitted. Only one chunk and the set of row hashes are held in memory.
+
+    Args:
+        file_paths (list[str]): Paths to raw A&E CSVs.
+        chunksize (int | None): Rows per chunk, see iter_ae_file.
+
+    Yields:
+        pd.DataFrame: Cleaned batches with the CLEANED_COLUMNS columns.
+    """
+    chunks = (chunk for f in file_paths for chunk in iter_ae_file(f, chunksize))
+    yield from drop_seen_rows(_clean_chunk(chunk) for chunk in chunks)
+
+
+def drop_seen_rows(batches):
+    """
+    Drop rows that are duplicates of a row in the same or an earlier batch.
+
+    Rows are identified by a 64-bit hash of all their values, kept in a set,
+    which gives the result of drop_duplicates on the concatenated batches
+    without holding them all in memory.
+
+    Args:
+        batches: Iterable of DataFrames with the same columns and dtypes.
+
+    Yields:
+        pd.DataFrame: Each batch without previously seen rows, skipping empty batches.
+    """
+    seen = set()
+    for batch in batches:
+        hashes = pd.util.hash_pandas_object(batch, index=False)
+        is_new = ~(hashes.duplicated() | hashes.isin(seen))
+        seen.update(hashes[is_new])
+        if is_new.any():
+            yield batch[is_new.to_numpy()].reset_index(drop=True)
+
+
+def _clean_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Parse periods, drop rows without one and select the standard columns of one chunk."""
+    chunk = chunk.reindex(columns=CLEANED_COLUMNS)
+    chunk["period"] = parse_periods(chunk["period"])
+    chunk = chunk.dropna(subset=["period"])
+
+    # Reindexed columns missing from the file come back as float; keep every batch's dtypes equal
+    for col in CLEANED_COLUMNS[3:]:
+        chunk[col] = chunk[col].astype(COUNT_DTYPES[col])
+    for col in ("org_code", "org_name"):
+        chunk[col] = chunk[col].astype("string")
+    return chunk
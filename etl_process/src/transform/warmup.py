@@ -0,0 +1,92 @@
+import time
+
+from etl_process.src.sql.sql_utils import (
+    SQL_DIR,
+    VERSION_CHECK_SECONDS,
+    current_load_version,
+    run_sql_queries_concurrently,
+)
+from etl_process.src.transform.figures import get_figure
+
+# Queries behind the default view of every page (the operational page's default
+# trust is the first in the directory, warmed below once the directory is loaded)
+DEFAULT_QUERIES = {
+    "home_summary": SQL_DIR / "latest_home.sql",
+    "home_trust_12hr": SQL_DIR / "trust_12hr_summary.sql",
+    "operational_latest": (SQL_DIR / "seen_within_4hrs_latest.sql", {"n_periods": 1}),
+    "trust_directory": SQL_DIR / "trust_directory.sql",
+    "geospatial_latest": SQL_DIR / "geospatial_latest.sql",
+}
+
+# Figures shown when each page first opens
+DEFAULT_FIGURES = [
+    ("national_trend", {}),
+    ("performance_extremes", {}),
+    ("geo_map", {"level": None}),
+]
+
+
+def warm_caches() -> dict:
+    """
+    Fill the query and figure caches for the default view of every dashboard page.
+
+    The queries run concurrently, then the default figures are fetched, which
+    reads the ETL's prebuilt figures from disk where they exist. Run in the
+    dashboard process this means the first viewer after a load is served from
+    memory; run by the ETL it also primes the database's cache of the tables
+    the load has just rewritten.
+
+    Returns:
+        dict: Number of "queries" and "figures" warmed, any "errors" by name
+        and the "seconds" taken.
+    """
+    start = time.perf_counter()
+    results, errors = run_sql_queries_concurrently(DEFAULT_QUERIES)
+
+    figures = list(DEFAULT_FIGURES)
+    trusts = results.get("trust_directory")
+    if trusts is not None and not trusts.empty:
+        figures.append(("trust_trend", {"org_code": str(trusts["org_code"].iloc[0])}))
+
+    warmed = 0
+    for name, params in figures:
+        try:
+            get_figure(name, **params)
+            warmed += 1
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+
+    return {"queries": len(results), "figures": warmed, "errors": errors,
+            "seconds": round(time.perf_counter() - start, 3)}
+
+
+def warm_on_new_data(interval: float | None = None):
+    """
+    Warm the caches now and again whenever the ETL loads a new version. Runs forever.
+
+    Meant for a background thread in the dashboard process, so the first
+    viewer after each monthly refresh does not pay for every query cold.
+
+    Args:
+        interval (float | None): Seconds between load version checks.
+            Defaults to QUERY_CACHE_VERSION_CHECK_SECONDS.
+    """
+    interval = VERSION_CHECK_SECONDS if interval is None else interval
+    warmed_version = object()
+    while True:
+        try:
+            version = current_load_version()
+            if version != warmed_version:
+                report = warm_caches()
+                warmed_version = version
+                print(f"Dashboard caches warmed for load version {version} in {report['seconds']}s")
+                for name, error in report["errors"].items():
+                    print(f"- {name}: {error}")
+        except Exception as e:
+            # The database may be down or mid-load; try again at the next check
+            print(f"Dashboard cache warmup failed: {e}")
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    print(warm_caches())
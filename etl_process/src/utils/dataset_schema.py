@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd  # type: ignore
+
+# Canonical in-memory dtypes for the A&E dataset, shared by the transform, the
+# processed-store reader and the dashboard loaders. Values are stored compactly:
+#   - org identifiers repeat every month, so they are categoricals
+#   - counts have a fixed nullable integer type wide enough for their domain,
+#     so a column has the same dtype in every query and arithmetic cannot wrap
+#   - periods are month starts at second resolution (the coarsest pandas has)
+# Data is converted to this model where it is read (compact_frame) and back to
+# the storage types where it is written (coerce_processed for Parquet,
+# prepare_frame for Postgres).
+CATEGORY_COLUMNS = ("org_code", "org_name", "postcode")
+
+COUNT_DTYPES = {
+    # Per-trust monthly counts, INTEGER in ae_attendances and int32 in Parquet
+    "ae_attendances_type_1": "Int32",
+    "attendances_over_4hrs_type_1": "Int32",
+    "emergency_admissions_type_1": "Int32",
+    "rank_12hr": "Int32",
+    # Columns that also hold national sums in the summary tables (BIGINT)
+    "patients_12hr_wait": "Int64",
+    "attendances_type_1": "Int64",
+    "over_4hrs_type_1": "Int64",
+    "breaches": "Int64",
+}
+COUNT_COLUMNS = tuple(COUNT_DTYPES)
+
+PERIOD_COLUMNS = ("period", "month")
+PERIOD_DTYPE = "datetime64[s]"
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the known A&E columns of a DataFrame to the compact dtypes.
+
+    Columns not in CATEGORY_COLUMNS, COUNT_COLUMNS or PERIOD_COLUMNS are left
+    as they are, so this can be applied to any query result or dataset.
+
+    Args:
+        df (pd.DataFrame): Data as read from a CSV, Parquet or the database.
+
+    Returns:
+        pd.DataFrame: A copy with compact org, count and period columns.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS:
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("string").astype("category")
+        elif col in COUNT_COLUMNS:
+            counts = pd.to_numeric(df[col]).round()
+            check_int_range(counts, COUNT_DTYPES[col])
+            df[col] = counts.astype(COUNT_DTYPES[col])
+        elif col in PERIOD_COLUMNS:
+            df[col] = to_month(df[col])
+    return df
+
+
+def check_int_range(values: pd.Series, dtype: str):
+    """Raise OverflowError if any value in `values` does not fit in the nullable integer `dtype`."""
+    low, high = values.min(), values.max()
+    if pd.isna(low):
+        return
+
+    info = np.iinfo(dtype.lower())
+    if not (info.min <= low and high <= info.max):
+        raise OverflowError(f"Values between {low} and {high} do not fit in {dtype}")
+
+
+def to_month(values: pd.Series) -> pd.Series:
+    """Convert dates, timestamps or date strings to month starts with the PERIOD_DTYPE."""
+    periods = pd.to_datetime(values)
+    return periods.dt.to_period("M").dt.start_time.astype(PERIOD_DTYPE)
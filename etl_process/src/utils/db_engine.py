@@ -1,19 +1,44 @@
 import os
+import threading
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Engines are shared process-wide, keyed by database, environment and URL
+_ENGINES = {}
+_ENGINES_LOCK = threading.Lock()
+
+# Pool settings, overridable per database ({DB}_DB_POOL_SIZE) or globally (DB_POOL_SIZE)
+POOL_DEFAULTS = {
+    "POOL_SIZE": "5",
+    "MAX_OVERFLOW": "10",
+    "POOL_PRE_PING": "true",
+    "POOL_RECYCLE": "1800",            # seconds
+    "STATEMENT_TIMEOUT_MS": "0",       # 0 disables the timeout
+}
+
 
 def db_engine(db: str = 'SOURCE'):
     """
-    Create a SQLAlchemy engine for connecting to a PostgreSQL database.
+    Return a pooled SQLAlchemy engine for connecting to a PostgreSQL database.
 
     The database credentials are read from environment variables, following the pattern:
         {DB}_DB_USER, {DB}_DB_PASSWORD, {DB}_DB_HOST, {DB}_DB_PORT, {DB}_DB_NAME
     where {DB} is either "SOURCE" or "TARGET" by default.
 
+    Engines are cached per database, ENV and connection URL, so repeated calls
+    share one connection pool instead of opening a new one each time. Pool
+    behaviour is configured with {DB}_DB_<SETTING> or DB_<SETTING> variables
+    for POOL_SIZE, MAX_OVERFLOW, POOL_PRE_PING, POOL_RECYCLE and
+    STATEMENT_TIMEOUT_MS.
+
+    No statement timeout is set by default, because the ETL's loads and
+    summary refreshes share these engines and can legitimately run for
+    minutes. The dashboard bounds its own queries per transaction instead
+    (see DASHBOARD_QUERY_TIMEOUT in src.sql.sql_utils).
+
     Args:
         db (str): The database to connect to, either "SOURCE" or "TARGET". Default is "SOURCE".
 
@@ -23,15 +48,74 @@ def db_engine(db: str = 'SOURCE'):
     Example:
         engine = db_engine(db="TARGET")
     """
-    
+
     # Fetch database credentials from environment variables
     user = os.getenv(f'{db}_DB_USER')
     password = os.getenv(f'{db}_DB_PASSWORD')
     host = os.getenv(f'{db}_DB_HOST')
     port = os.getenv(f'{db}_DB_PORT')
     database = os.getenv(f'{db}_DB_NAME')
-    
+
     # Construct the SQLAlchemy engine URL
-    engine = create_engine(f'postgresql://{user}:{password}@{host}:{port}/{database}')
-    
+    url = f'postgresql://{user}:{password}@{host}:{port}/{database}'
+    key = (db, os.getenv('ENV'), url)
+
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(key)
+        if engine is None:
+            engine = _create_pooled_engine(db, url)
+            _ENGINES[key] = engine
+
     return engine
+
+
+def get_target() -> tuple[str, str]:
+    """
+    Return the schema and A&E table on the TARGET database.
+
+    Read from TARGET_DB_SCHEMA (default "public") and TARGET_DB_TABLE (default
+    "ae_attendances"). The ETL loads this table and the dashboard queries it,
+    so both take it from here.
+    """
+    schema = os.getenv("TARGET_DB_SCHEMA") or "public"
+    table = os.getenv("TARGET_DB_TABLE") or "ae_attendances"
+    return schema, table
+
+
+def dispose_engines():
+    """
+    Close every cached engine's connection pool and empty the registry.
+
+    Called when switching environments so no connections to the previous
+    environment's databases are reused.
+    """
+    with _ENGINES_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
+
+
+def _create_pooled_engine(db: str, url: str):
+    """Create an engine using the configured pool settings for `db`."""
+    statement_timeout = int(_pool_setting(db, "STATEMENT_TIMEOUT_MS"))
+    connect_args = {}
+    if statement_timeout > 0:
+        connect_args["options"] = f"-c statement_timeout={statement_timeout}"
+
+    return create_engine(
+        url,
+        pool_size=int(_pool_setting(db, "POOL_SIZE")),
+        max_overflow=int(_pool_setting(db, "MAX_OVERFLOW")),
+        pool_pre_ping=_pool_setting(db, "POOL_PRE_PING").lower() in ("1", "true", "yes"),
+        pool_recycle=int(_pool_setting(db, "POOL_RECYCLE")),
+        connect_args=connect_args,
+    )
+
+
+def _pool_setting(db: str, name: str) -> str:
+    """Read a pool setting from {DB}_DB_{NAME}, then DB_{NAME}, then the default."""
+    return (
+        os.getenv(f'{db}_DB_{name}')
+        or os.getenv(f'DB_{name}')
+        or POOL_DEFAULTS[name]
+    )
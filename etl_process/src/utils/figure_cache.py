@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from etl_process.src.utils.query_cache import QueryCache
+
+# Serialised figures are kept per data version under data/output/figures/<version>/
+FIGURE_DIR = Path(__file__).resolve().parents[2] / "data" / "output" / "figures"
+
+
+class FigureCache:
+    """
+    LRU cache of serialised Plotly figures, backed by JSON files on disk.
+
+    Figures are stored as plotly JSON, keyed by figure name, parameters
+    (e.g. the selected trust) and the data version they were built from.
+    Recently used figures are kept in memory; every figure is also written
+    to disk so other processes (and the ETL, which prebuilds the common
+    views) share them. Without a data version nothing is written to disk,
+    since there would be no way to tell when the files go stale.
+
+    Example:
+        cache = FigureCache()
+        figure = cache.get_or_build("national_trend", {}, version, build_figure)
+        st.plotly_chart(figure)
+    """
+
+    def __init__(self, directory: Path | None = FIGURE_DIR, maxsize: int = 64, ttl: float = 3600,
+                 clock=time.monotonic):
+        """
+        Args:
+            directory (Path | None): Folder for the JSON files, or None to keep figures in memory only.
+            maxsize (int): Maximum number of figures kept in memory.
+            ttl (float): Seconds a figure stays valid in memory.
+            clock: Function returning the current time in seconds.
+        """
+        self.directory = Path(directory) if directory is not None else None
+        self._memory = QueryCache(maxsize=maxsize, ttl=ttl, clock=clock)
+
+    def get(self, name: str, params: dict | None = None, version=None) -> dict | None:
+        """Return the cached figure as a dict, or None if it has not been built for this version."""
+        key = figure_key(name, params)
+        figure = self._memory.get(key, version)
+        if figure is None:
+            path = self._path(key, version)
+            if path is None or not path.exists():
+                return None
+            figure = json.loads(path.read_text())
+            self._memory.set(key, figure, version)
+        return figure
+
+    def set(self, name: str, params: dict | None, version, figure_json: str) -> dict:
+        """Store a figure's JSON (from Figure.to_json()) and return it as a dict."""
+        key = figure_key(name, params)
+        figure = json.loads(figure_json)
+        self._memory.set(key, figure, version)
+
+        path = self._path(key, version)
+        if path is not None:
+            # Written to a temporary file first so readers never see half a figure
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(figure_json)
+            os.replace(tmp_path, path)
+        return figure
+
+    def get_or_build(self, name: str, params: dict | None, version, build) -> dict:
+        """Return the cached figure, calling `build()` for a Plotly figure and caching it on a miss."""
+        figure = self.get(name, params, version)
+        if figure is None:
+            figure = self.set(name, params, version, build().to_json())
+        return figure
+
+    def prune(self, version):
+        """Delete the files of every data version except `version`."""
+        if self.directory is None or not self.directory.exists():
+            return
+        for path in self.directory.iterdir():
+            if path.is_dir() and path.name != str(version):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def clear(self):
+        """Remove every figure from memory (files on disk are kept)."""
+        self._memory.clear()
+
+    def _path(self, key: str, version) -> Path | None:
+        if self.directory is None or version is None:
+            return None
+        return self.directory / str(version) / f"{key}.json"
+
+
+def figure_key(name: str, params: dict | None = None) -> str:
+    """Return the file-safe cache key for a figure name and its parameters."""
+    if not params:
+        return name
+    encoded = json.dumps(params, sort_keys=True, default=str).encode()
+    return f"{name}-{hashlib.sha1(encoded).hexdigest()[:16]}"
@@ -0,0 +1,317 @@
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.utils.logging_utils import setup_logger
+
+try:
+    import resource
+except ImportError:  # Windows has no resource module; peak RSS is then not reported
+    resource = None
+
+try:
+    import psutil
+except ImportError:  # stage peaks then fall back to the process-lifetime peak
+    psutil = None
+
+# How often RSS is sampled during a stage where the kernel's peak cannot be reset
+RSS_SAMPLE_SECONDS = 0.05
+
+# Run reports are written next to the other pipeline outputs
+OUTPUT_DIR = Path(__file__).resolve().parents[2] / "data" / "output"
+
+# The report stages are recorded into while a run is active, see run_report
+_CURRENT_REPORT = contextvars.ContextVar("etl_run_report", default=None)
+
+
+class RunReport:
+    """
+    Per-stage timings and resource usage for one pipeline run.
+
+    Each stage records wall time, CPU time (including worker processes),
+    peak RSS and any counters the stage sets, such as rows_in, rows_out,
+    bytes_read and bytes_written. Every finished stage is logged, and the
+    whole report can be written out as JSON.
+
+    peak_rss_mb is the peak during the stage itself. On Linux the kernel's
+    high-water mark is reset at the start of each stage; elsewhere RSS is
+    sampled in a background thread with psutil. Without either, the stage
+    records process_peak_rss_mb instead, the peak of the whole process so
+    far. process_peak_rss_children_mb is always the largest finished worker
+    process's lifetime peak.
+
+    Example:
+        report = RunReport()
+        with report.stage("read") as record:
+            frames = read_ae_files(files)
+            record["rows_out"] = sum(len(df) for df in frames)
+        report.write()
+    """
+
+    def __init__(self, name: str = "etl_run", logger=None):
+        """
+        Args:
+            name (str): Name of the run, used in the report file name.
+            logger: Logger for stage summaries. Defaults to the "etl" logger
+                writing to logs/etl.log.
+        """
+        self.name = name
+        self.logger = logger or setup_logger("etl", "etl.log")
+        self.started_at = datetime.now(timezone.utc)
+        self.finished_at = None
+        self.status = "running"
+        self.error = None
+        self.stages = []
+        self._start_wall = time.perf_counter()
+        self._start_cpu = _cpu_seconds()
+        # Peaks seen so far by the run and by each open stage, innermost last
+        self._track_hwm = _reset_hwm()
+        self._peak_rss = _read_hwm_mb() or 0.0
+        self._open_peaks = []
+
+    @contextmanager
+    def stage(self, name: str, **fields):
+        """
+        Time a pipeline stage and record it in the report.
+
+        Args:
+            name (str): Stage name, e.g. "read" or "load".
+            **fields: Initial counters for the stage.
+
+        Yields:
+            dict: The stage record; set counters such as rows_out on it.
+        """
+        record = {"stage": name, **fields}
+        start_wall = time.perf_counter()
+        start_cpu = _cpu_seconds()
+        stop_peak = self._start_peak()
+        try:
+            yield record
+        finally:
+            record["wall_seconds"] = round(time.perf_counter() - start_wall, 4)
+            record["cpu_seconds"] = round(_cpu_seconds() - start_cpu, 4)
+            stage_peak = stop_peak()
+            if stage_peak is not None:
+                record["peak_rss_mb"] = stage_peak
+            else:
+                record["process_peak_rss_mb"] = peak_rss_mb()
+            record["process_peak_rss_children_mb"] = peak_rss_mb(children=True)
+            self.stages.append(record)
+            self.logger.info(_format_stage(record))
+
+    def _start_peak(self):
+        """Start measuring a stage's peak RSS; returns a function that stops and returns it in MB."""
+        if self._track_hwm:
+            # Resetting the high-water mark would lose the peaks of enclosing
+            # stages, so the value so far is handed to them first
+            self._note_peak(_read_hwm_mb())
+            _reset_hwm()
+            peak = [_read_hwm_mb() or 0.0]
+            self._open_peaks.append(peak)
+
+            def stop():
+                self._note_peak(_read_hwm_mb())
+                self._open_peaks.remove(peak)
+                return peak[0]
+            return stop
+
+        if psutil is not None:
+            return _sample_peak_rss()
+        return lambda: None
+
+    def _note_peak(self, value: float | None):
+        """Fold an RSS reading into the run's peak and every open stage's peak."""
+        if value is None:
+            return
+        self._peak_rss = max(self._peak_rss, value)
+        for peak in self._open_peaks:
+            peak[0] = max(peak[0], value)
+
+    def finish(self, error: BaseException | None = None):
+        """Mark the run as finished, failed if `error` is given."""
+        self.finished_at = datetime.now(timezone.utc)
+        self.status = "failed" if error is not None else "succeeded"
+        self.error = None if error is None else f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict:
+        """Return the report as JSON-serialisable data."""
+        return {
+            "name": self.name,
+            "env": os.getenv("ENV"),
+            "status": self.status,
+            "error": self.error,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "wall_seconds": round(time.perf_counter() - self._start_wall, 4),
+            "cpu_seconds": round(_cpu_seconds() - self._start_cpu, 4),
+            **self._run_peak(),
+            "stages": self.stages,
+        }
+
+    def _run_peak(self) -> dict:
+        """Return the run's peak RSS, or the process's where the run's cannot be told apart."""
+        if self._track_hwm:
+            self._note_peak(_read_hwm_mb())
+            return {"peak_rss_mb": self._peak_rss}
+        return {"process_peak_rss_mb": peak_rss_mb()}
+
+    def write(self, output_dir: Path = OUTPUT_DIR) -> Path:
+        """
+        Write the report as JSON to `output_dir`.
+
+        Returns:
+            Path: The report file, named <name>_<UTC start time>.json.
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        path = output_dir / f"{self.name}_{self.started_at:%Y%m%dT%H%M%SZ}.json"
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        return path
+
+
+@contextmanager
+def run_report(name: str = "etl_run", output_dir: Path = OUTPUT_DIR, logger=None):
+    """
+    Collect the stages run inside the block into a report, then write it as JSON.
+
+    Stages opened anywhere in the call stack with stage() are recorded. The
+    report is written even if the block raises, with its status set to "failed".
+
+    Args:
+        name (str): Name of the run, used in the report file name.
+        output_dir (Path): Folder the JSON report is written to.
+        logger: Logger for stage summaries, see RunReport.
+
+    Yields:
+        RunReport: The report being collected.
+    """
+    report = RunReport(name, logger)
+    token = _CURRENT_REPORT.set(report)
+    error = None
+    try:
+        yield report
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _CURRENT_REPORT.reset(token)
+        report.finish(error)
+        path = report.write(output_dir)
+        report.logger.info(f"Run report written to {path}")
+
+
+@contextmanager
+def stage(name: str, **fields):
+    """
+    Record a stage in the active run report, if there is one.
+
+    Outside run_report the block still runs and the yielded record can
+    still be updated; nothing is recorded.
+
+    Args:
+        name (str): Stage name, e.g. "read" or "load".
+        **fields: Initial counters for the stage.
+
+    Yields:
+        dict: The stage record; set counters such as rows_out on it.
+    """
+    report = _CURRENT_REPORT.get()
+    if report is None:
+        yield {"stage": name, **fields}
+        return
+
+    with report.stage(name, **fields) as record:
+        yield record
+
+
+def path_size(path) -> int:
+    """Return the size in bytes of a file, or of every file under a directory."""
+    path = Path(path)
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def peak_rss_mb(children: bool = False) -> float | None:
+    """
+    Return the peak resident memory of this process (or its largest child) in MB.
+
+    This is the peak over the process's lifetime, except that on Linux it
+    only covers the time since a RunReport last reset the high-water mark.
+    Returns None where the resource module is not available.
+    """
+    if resource is None:
+        return None
+
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    max_rss = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    bytes_ = max_rss if sys.platform == "darwin" else max_rss * 1024
+    return round(bytes_ / (1024 * 1024), 1)
+
+
+def _read_hwm_mb() -> float | None:
+    """Return this process's peak RSS since the last reset (Linux VmHWM) in MB, or None."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def _reset_hwm() -> bool:
+    """Reset this process's peak RSS to its current RSS. Returns False where unsupported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return _read_hwm_mb() is not None
+
+
+def _sample_peak_rss():
+    """Sample RSS with psutil in a background thread; returns a function that stops and returns the peak in MB."""
+    process = psutil.Process()
+    peak = [process.memory_info().rss]
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(RSS_SAMPLE_SECONDS):
+            peak[0] = max(peak[0], process.memory_info().rss)
+
+    thread = threading.Thread(target=sample, name="rss-sampler", daemon=True)
+    thread.start()
+
+    def stop():
+        done.set()
+        thread.join()
+        peak[0] = max(peak[0], process.memory_info().rss)
+        return round(peak[0] / (1024 * 1024), 1)
+    return stop
+
+
+def _cpu_seconds() -> float:
+    """Return the user + system CPU time of this process and its finished children."""
+    if resource is None:
+        return time.process_time()
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _format_stage(record: dict) -> str:
+    """Format a stage record as one log line."""
+    fields = " ".join(f"{key}={value}" for key, value in record.items() if key != "stage")
+    return f"stage={record['stage']} {fields}"
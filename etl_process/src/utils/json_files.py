@@ -0,0 +1,32 @@
+import json
+import os
+from pathlib import Path
+
+
+def write_json_atomic(data, path, **dump_kwargs) -> Path:
+    """
+    Write `data` as JSON to `path` so readers never see a half-written file.
+
+    The JSON is written to a temporary file in the same folder, then renamed
+    over `path`, so an interrupted run leaves the previous file in place.
+
+    Args:
+        data: JSON-serialisable data.
+        path: File to write. Its folder is created if needed.
+        **dump_kwargs: Passed to json.dump, e.g. indent=2.
+
+    Returns:
+        Path: The file written.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, **dump_kwargs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path
@@ -0,0 +1,291 @@
+import itertools
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd  # type: ignore
+import pyarrow as pa  # type: ignore
+import pyarrow.dataset as ds  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+
+from src.utils.dataset_schema import COUNT_DTYPES, compact_frame
+
+# Processed datasets are stored as Parquet, one directory per dataset,
+# partitioned by the year of the period (data/processed/<name>/year=2024/...)
+PROCESSED_DIR = Path(__file__).resolve().parents[2] / "data" / "processed"
+
+# Counts in the processed layer, stored with the integer width of their dtype in COUNT_DTYPES
+PROCESSED_COUNTS = (
+    "ae_attendances_type_1",
+    "attendances_over_4hrs_type_1",
+    "patients_12hr_wait",
+    "emergency_admissions_type_1",
+)
+
+# Explicit Arrow types for every column the processed layer can hold
+PROCESSED_SCHEMA = {
+    "period": pa.date32(),
+    "org_code": pa.string(),
+    "org_name": pa.string(),
+    **{col: pa.from_numpy_dtype(np.dtype(COUNT_DTYPES[col].lower())) for col in PROCESSED_COUNTS},
+    "postcode": pa.string(),
+    "latitude": pa.float64(),
+    "longitude": pa.float64(),
+}
+
+PARTITIONING = ds.partitioning(pa.schema([("year", pa.int16())]), flavor="hive")
+
+
+def dataset_path(name: str, processed_dir: Path = PROCESSED_DIR) -> Path:
+    """Return the Parquet directory for a processed dataset."""
+    return Path(processed_dir) / name
+
+
+def processed_exists(name: str, processed_dir: Path = PROCESSED_DIR) -> bool:
+    """Return True if the dataset exists as Parquet or as a legacy CSV."""
+    return (
+        _readable_path(name, processed_dir) is not None
+        or (Path(processed_dir) / f"{name}.csv").exists()
+    )
+
+
+def write_processed(df: pd.DataFrame, name: str, processed_dir: Path = PROCESSED_DIR) -> Path:
+    """
+    Write a processed dataset as year-partitioned Parquet with the explicit schema.
+
+    The dataset is written to a temporary directory and swapped in, so readers
+    never see a half-written dataset. The previous version is moved aside
+    rather than deleted before the swap, and readers fall back to it for the
+    moment between the two renames.
+
+    Args:
+        df (pd.DataFrame): Data with a 'period' column and columns from PROCESSED_SCHEMA.
+        name (str): Dataset name, e.g. "ae_data_cleaned".
+        processed_dir (Path): Folder holding the processed datasets.
+
+    Returns:
+        Path: The dataset directory.
+    """
+    path, _ = write_processed_batches([df], name, processed_dir)
+    return path
+
+
+def write_processed_batches(batches, name: str, processed_dir: Path = PROCESSED_DIR) -> tuple[Path, int]:
+    """
+    Write an iterable of DataFrames as one processed dataset, one batch at a time.
+
+    Only the current batch is held in memory, so this can write datasets that
+    do not fit in memory. Every batch must have the same columns as the first.
+    Like write_processed, the dataset is swapped in once fully written.
+
+    Args:
+        batches: Iterable of DataFrames with a 'period' column and columns from PROCESSED_SCHEMA.
+        name (str): Dataset name, e.g. "ae_data_cleaned".
+        processed_dir (Path): Folder holding the processed datasets.
+
+    Returns:
+        tuple[Path, int]: The dataset directory and the number of rows written.
+    """
+    batches = iter(batches)
+    first = next(batches, None)
+
+    path = dataset_path(name, processed_dir)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    old_path = _previous_path(path)
+    shutil.rmtree(tmp_path, ignore_errors=True)
+
+    rows = 0
+    if first is None:
+        tmp_path.mkdir(parents=True)
+    else:
+        schema = schema_for(first.columns)
+        rows_written = [0]
+
+        def record_batches():
+            for df in itertools.chain([first], batches):
+                rows_written[0] += len(df)
+                table = pa.Table.from_pandas(coerce_processed(df), schema=schema, preserve_index=False)
+                year = pa.array(pd.to_datetime(df["period"]).dt.year.to_numpy(), type=pa.int16())
+                yield from table.append_column("year", year).to_batches()
+
+        ds.write_dataset(
+            record_batches(),
+            tmp_path,
+            schema=schema.append(pa.field("year", pa.int16())),
+            format="parquet",
+            partitioning=PARTITIONING,
+            basename_template="part-{i}.parquet",
+        )
+        rows = rows_written[0]
+        if not rows:
+            # write_dataset writes no files for empty batches, so an empty file
+            # keeps the columns readable
+            tmp_path.mkdir(parents=True, exist_ok=True)
+            pq.write_table(schema.empty_table(), tmp_path / "part-0.parquet")
+
+    # A directory cannot be renamed over a non-empty one, so the previous
+    # version is renamed aside first and only deleted once the new one is in place
+    if path.exists():
+        shutil.rmtree(old_path, ignore_errors=True)
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return path, rows
+
+
+def read_processed(name: str, columns: list[str] | None = None, periods: list[str] | None = None,
+                   processed_dir: Path = PROCESSED_DIR) -> pd.DataFrame:
+    """
+    Read a processed dataset, only reading the requested columns and periods.
+
+    Period filters prune whole year partitions before the remaining row groups
+    are filtered. If the dataset has not been written as Parquet yet, the
+    legacy CSV of the same name is read and coerced to the same types.
+
+    Args:
+        name (str): Dataset name, e.g. "location_ae_combined".
+        columns (list[str] | None): Columns to read. Default is None (all).
+        periods (list[str] | None): ISO dates of the periods to read. Default is None (all).
+        processed_dir (Path): Folder holding the processed datasets.
+
+    Returns:
+        pd.DataFrame: Data with the compact dtypes of src.utils.dataset_schema.
+
+    Raises:
+        FileNotFoundError: If neither the Parquet dataset nor the CSV exists.
+    """
+    path = _readable_path(name, processed_dir)
+    if path is None:
+        return _read_legacy_csv(name, columns, periods, processed_dir)
+
+    dataset = ds.dataset(path, format="parquet", partitioning=PARTITIONING)
+    table = dataset.to_table(columns=_projection(dataset, columns), filter=_period_filter(periods))
+    df = _to_pandas(table)
+    if "period" in df.columns:
+        df = df.sort_values("period", kind="stable").reset_index(drop=True)
+    return df
+
+
+def iter_processed(name: str, columns: list[str] | None = None, periods: list[str] | None = None,
+                   exclude_periods: list[str] | None = None, batch_size: int = 100_000,
+                   processed_dir: Path = PROCESSED_DIR):
+    """
+    Yield a processed dataset as DataFrames of at most `batch_size` rows.
+
+    Takes the same column and period filters as read_processed, and can also
+    skip `exclude_periods`. Batches are not sorted by period.
+
+    Args:
+        name (str): Dataset name, e.g. "location_ae_combined".
+        columns (list[str] | None): Columns to read. Default is None (all).
+        periods (list[str] | None): ISO dates of the periods to read. Default is None (all).
+        exclude_periods (list[str] | None): ISO dates of periods to skip. Default is None.
+        batch_size (int): Maximum rows per DataFrame.
+        processed_dir (Path): Folder holding the processed datasets.
+
+    Yields:
+        pd.DataFrame: Typed batches of the dataset.
+    """
+    path = _readable_path(name, processed_dir)
+    if path is None:
+        df = _read_legacy_csv(name, columns, periods, processed_dir)
+        if exclude_periods:
+            df = df[~df["period"].isin(pd.to_datetime(pd.Series(exclude_periods)))]
+        for start in range(0, len(df), batch_size):
+            yield df.iloc[start:start + batch_size].reset_index(drop=True)
+        return
+
+    row_filter = _period_filter(periods)
+    if exclude_periods:
+        excluded = ~ds.field("period").isin(_date_array(exclude_periods))
+        row_filter = excluded if row_filter is None else row_filter & excluded
+
+    dataset = ds.dataset(path, format="parquet", partitioning=PARTITIONING)
+    for batch in dataset.to_batches(columns=_projection(dataset, columns), filter=row_filter,
+                                    batch_size=batch_size):
+        if batch.num_rows:
+            yield _to_pandas(pa.Table.from_batches([batch]))
+
+
+def coerce_processed(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast known columns to the pandas dtypes matching PROCESSED_SCHEMA."""
+    df = df.copy()
+    for col, arrow_type in PROCESSED_SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if col == "period":
+            df[col] = pd.to_datetime(df[col]).astype("datetime64[ns]")
+        elif col in COUNT_DTYPES:
+            # CSV round trips turn counts into floats (21420.0)
+            df[col] = pd.to_numeric(df[col]).round().astype(COUNT_DTYPES[col])
+        elif arrow_type == pa.float64():
+            df[col] = pd.to_numeric(df[col]).astype("float64")
+        else:
+            df[col] = df[col].astype("string")
+    return df
+
+
+def schema_for(columns) -> pa.Schema:
+    """Return the Arrow schema for `columns`, in order."""
+    unknown = [c for c in columns if c not in PROCESSED_SCHEMA]
+    if unknown:
+        raise ValueError(f"Columns not in the processed schema: {unknown}")
+    return pa.schema([(c, PROCESSED_SCHEMA[c]) for c in columns])
+
+
+def _previous_path(path: Path) -> Path:
+    """Return where the previous version of a dataset is kept while a new one is swapped in."""
+    return path.with_name(f"{path.name}.old")
+
+
+def _readable_path(name: str, processed_dir: Path) -> Path | None:
+    """Return the Parquet directory to read, the previous version mid-swap, or None."""
+    path = dataset_path(name, processed_dir)
+    for candidate in (path, _previous_path(path)):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _read_legacy_csv(name: str, columns: list[str] | None, periods: list[str] | None,
+                     processed_dir: Path) -> pd.DataFrame:
+    """Read a processed CSV written before the Parquet store existed."""
+    file_path = Path(processed_dir) / f"{name}.csv"
+    if not file_path.exists():
+        raise FileNotFoundError(f"No input found at {dataset_path(name, processed_dir)} or {file_path}")
+
+    print(f"No Parquet dataset for {name}, reading legacy CSV {file_path}")
+    df = compact_frame(coerce_processed(pd.read_csv(file_path, usecols=columns)))
+    df = df.dropna(subset=["period"])
+    if periods is not None:
+        df = df[df["period"].isin(pd.to_datetime(pd.Series(periods)))]
+    return df.reset_index(drop=True)
+
+
+def _projection(dataset, columns: list[str] | None) -> list[str]:
+    """Return the columns to read, never including the partition column."""
+    return [c for c in (columns or dataset.schema.names) if c != "year"]
+
+
+def _period_filter(periods: list[str] | None):
+    """Return a dataset filter for `periods`, pruning year partitions first, or None."""
+    if periods is None:
+        return None
+    years = pd.to_datetime(pd.Series(periods)).dt.year.unique().tolist()
+    return ds.field("year").isin(sorted(years)) & ds.field("period").isin(_date_array(periods))
+
+
+def _date_array(periods: list[str]) -> pa.Array:
+    """Convert ISO date strings to an Arrow date32 array."""
+    return pa.array(pd.to_datetime(pd.Series(periods)).dt.date.tolist(), type=pa.date32())
+
+
+def _to_pandas(table: pa.Table) -> pd.DataFrame:
+    """Convert an Arrow table to pandas with the compact dataset dtypes."""
+    df = table.to_pandas(
+        types_mapper={pa.int32(): pd.Int32Dtype(), pa.int64(): pd.Int64Dtype()}.get,
+        date_as_object=False,
+        strings_to_categorical=True,
+    )
+    return compact_frame(df)
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with a time-to-live and a data version.
+
+    Each entry remembers the data version it was loaded under. Asking for a
+    different version (e.g. after the ETL has loaded a new period) empties the
+    cache, so results are never served across loads.
+
+    Example:
+        cache = QueryCache(maxsize=64, ttl=3600)
+        df = cache.get_or_load(("latest_home.sql", ()), version, run_query)
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 3600, clock=time.monotonic):
+        """
+        Args:
+            maxsize (int): Maximum number of entries before the least recently used is evicted.
+            ttl (float): Seconds an entry stays valid.
+            clock: Function returning the current time in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version=None):
+        """Return the cached value for `key`, or None if it is missing, expired or from another version."""
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None or self._clock() - entry[0] > self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, version=None):
+        """Store `value` under `key`, evicting the least recently used entry if full."""
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, key, version, loader):
+        """Return the cached value for `key`, calling `loader()` and caching its result on a miss."""
+        value = self.get(key, version)
+        if value is None:
+            value = loader()
+            self.set(key, value, version)
+        return value
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _check_version(self, version):
+        """Drop all entries when the data version changes. Must be called with the lock held."""
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd  # type: ignore
+
+# Mean Earth radius (IUGG), in km
+EARTH_RADIUS_KM = 6371.0088
+
+
+class SpatialIndex:
+    """
+    Radius and nearest-neighbour queries over points with latitude and longitude.
+
+    Points are stored as 3D unit vectors, where the straight-line (chord)
+    distance between two points orders them exactly as their great-circle
+    distance does. Queries use a KD-tree over the vectors when scipy is
+    installed, and otherwise a vectorised scan, which is fast for the few
+    thousand NHS sites. Distances returned are haversine distances in km.
+
+    Build the index once per dataset version and reuse it for every query.
+
+    Example:
+        index = SpatialIndex(trusts_df)
+        index.within(51.55, -0.17, radius_km=10)
+        index.nearest(51.55, -0.17, k=5)
+    """
+
+    def __init__(self, points: pd.DataFrame, lat_col: str = "latitude", lon_col: str = "longitude",
+                 use_tree: bool = True):
+        """
+        Args:
+            points (pd.DataFrame): One row per point. Rows without coordinates are dropped.
+            lat_col (str): Latitude column, in degrees.
+            lon_col (str): Longitude column, in degrees.
+            use_tree (bool): Use scipy's KD-tree if it is installed. Default is True.
+        """
+        self.points = points.dropna(subset=[lat_col, lon_col]).reset_index(drop=True)
+        self.lat_col = lat_col
+        self.lon_col = lon_col
+        self._lat = self.points[lat_col].to_numpy(dtype=float)
+        self._lon = self.points[lon_col].to_numpy(dtype=float)
+        self._xyz = unit_vectors(self._lat, self._lon)
+
+        self._tree = None
+        if use_tree and len(self.points):
+            try:
+                from scipy.spatial import cKDTree  # optional: the scan below gives the same results
+                self._tree = cKDTree(self._xyz)
+            except ImportError:
+                pass
+
+    def __len__(self):
+        return len(self.points)
+
+    def within(self, lat: float, lon: float, radius_km: float) -> pd.DataFrame:
+        """
+        Return the points within `radius_km` of a location.
+
+        Returns:
+            pd.DataFrame: The matching points with a 'distance_km' column, nearest first.
+        """
+        query = unit_vectors(lat, lon)[0]
+        chord = 2 * np.sin(min(radius_km / EARTH_RADIUS_KM, np.pi) / 2)
+        if self._tree is not None:
+            positions = np.array(self._tree.query_ball_point(query, chord), dtype=int)
+        else:
+            positions = np.flatnonzero(np.linalg.norm(self._xyz - query, axis=1) <= chord)
+        return self._result(positions, lat, lon)
+
+    def nearest(self, lat: float, lon: float, k: int = 5) -> pd.DataFrame:
+        """
+        Return the `k` points nearest to a location.
+
+        Returns:
+            pd.DataFrame: Up to `k` points with a 'distance_km' column, nearest first.
+        """
+        k = min(k, len(self.points))
+        if k <= 0:
+            return self._result(np.array([], dtype=int), lat, lon)
+
+        query = unit_vectors(lat, lon)[0]
+        if self._tree is not None:
+            _, positions = self._tree.query(query, k=k)
+            positions = np.atleast_1d(positions)
+        else:
+            chords = np.linalg.norm(self._xyz - query, axis=1)
+            positions = np.argpartition(chords, k - 1)[:k]
+        return self._result(positions, lat, lon)
+
+    def _result(self, positions: np.ndarray, lat: float, lon: float) -> pd.DataFrame:
+        # Ordered on the arrays so only the matching rows are copied; ties in
+        # distance keep the points' original order, whichever way they were found
+        positions = np.sort(positions)
+        distances = haversine_km(lat, lon, self._lat[positions], self._lon[positions])
+        order = np.argsort(distances, kind="stable")
+        result = self.points.take(positions[order]).reset_index(drop=True)
+        result["distance_km"] = distances[order]
+        return result
+
+
+def unit_vectors(lat, lon) -> np.ndarray:
+    """Convert latitudes and longitudes in degrees to an (n, 3) array of unit vectors."""
+    lat = np.radians(np.atleast_1d(np.asarray(lat, dtype=float)))
+    lon = np.radians(np.atleast_1d(np.asarray(lon, dtype=float)))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between points given in degrees (scalars or arrays)."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
@@ -0,0 +1,387 @@
+"""
+Reproducible performance benchmarks for the ETL and dashboard query paths.
+
+Run from etl_process/ with:
+    python tests/run_tests.py bench [--scales 1,10,100] [--repeat 3]
+        [--baseline tests/benchmarks/baseline.json] [--save-baseline] [--tolerance 0.25]
+
+Benchmarks:
+    read[ingest,<n>x]       read_ae_files on synthetic raw files built from the real ones,
+                            with every trust repeated n times
+    read[read_csv,<n>x]     a plain pd.read_csv of every column of the same files, for reference
+    transform[<mode>,<n>x]  transform_ae_data (batch and streaming) on the same files
+    enrich[<n>x]            enrich_ae_data on the transformed synthetic data
+    load[<method>,<n>x]     copy_load / insert_load into a scratch table when a target
+                            Postgres is configured (TARGET_DB_*), otherwise a bulk
+                            DataFrame.to_sql into a SQLite file as a stand-in
+    query[<file>]           each dashboard SQL file against the target database, uncached
+                            (skipped without a target Postgres)
+    duckdb_build[<n>x]      building the embedded DuckDB dashboard database from the
+                            enriched synthetic data (skipped without duckdb)
+    query[duckdb,<file>,<n>x]  each dashboard SQL file on that DuckDB database
+
+Results are written to data/output/benchmarks/. With a baseline, any benchmark
+whose median time grew by more than the tolerance is reported as a regression
+and the command exits with status 1. Benchmarks missing from the baseline are
+not compared.
+
+The committed baseline.json was recorded with --scales 1,10 --repeat 5 on a
+single-CPU machine, so it only flags large regressions elsewhere; re-record it
+with --save-baseline on the machine the comparison runs on.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+ETL_ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ETL_ROOT))
+sys.path.append(str(ETL_ROOT.parent))
+
+import pandas as pd  # type: ignore  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from src.transform.ingest import RENAME_MAP  # noqa: E402
+
+RAW_DIR = ETL_ROOT / "data" / "raw"
+RESULTS_DIR = ETL_ROOT / "data" / "output" / "benchmarks"
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_TOLERANCE = 0.25
+# Slowdowns smaller than this are timer noise on millisecond queries, not regressions
+MIN_REGRESSION_SECONDS = 0.05
+
+# Parameters for the parameterised dashboard queries
+QUERY_PARAMS = {
+    "seen_within_4hrs_trust.sql": {"org_code": "RAL"},
+    "seen_within_4hrs_period_range.sql": {"start_period": "2024-01-01", "end_period": "2024-12-01"},
+    "seen_within_4hrs_latest.sql": {"n_periods": 1},
+    "geo_bins_latest.sql": {"level": 3},
+}
+
+
+def make_synthetic_raw(output_dir: Path, scale: int, source_dir: Path = RAW_DIR) -> Path:
+    """
+    Build a synthetic raw data folder `scale` times the size of the real one.
+
+    Every real ae_*.csv keeps its folder, header layout and periods; each
+    trust row is repeated `scale` times with a distinct org code and name
+    ("RAL", "RAL-1", ...) so deduplication keeps every copy.
+
+    Args:
+        output_dir (Path): Folder to write the synthetic raw files to.
+        scale (int): How many copies of each trust to write.
+        source_dir (Path): Real raw data folder to copy the layout from.
+
+    Returns:
+        Path: `output_dir`.
+    """
+    for source in sorted(Path(source_dir).rglob("ae_*.csv")):
+        df = pd.read_csv(source, dtype=str, keep_default_na=False)
+        org_cols = [c for c in df.columns if RENAME_MAP.get(c.strip()) in ("org_code", "org_name")]
+        # The national "Total" row appears once per file, as in the real data
+        is_trust = ~df[org_cols[0]].isin(["", "Total"])
+
+        copies = [df]
+        for copy in range(1, scale):
+            scaled = df[is_trust].copy()
+            for col in org_cols:
+                scaled[col] = scaled[col] + f"-{copy}"
+            copies.append(scaled)
+
+        target = Path(output_dir) / source.relative_to(source_dir)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        pd.concat(copies, ignore_index=True).to_csv(target, index=False)
+
+    return Path(output_dir)
+
+
+def measure(fn, repeat: int = 3, memory: bool = False) -> dict:
+    """
+    Time `fn` over `repeat` runs.
+
+    Args:
+        fn: Function to benchmark. It may return a row count.
+        repeat (int): Number of timed runs.
+        memory (bool): Also run it once under tracemalloc and report the peak.
+
+    Returns:
+        dict: min/median/max seconds, the runs, rows and (optionally) peak_mb.
+    """
+    times = []
+    rows = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = fn()
+        times.append(time.perf_counter() - start)
+
+    result = {
+        "min_seconds": round(min(times), 4),
+        "median_seconds": round(statistics.median(times), 4),
+        "max_seconds": round(max(times), 4),
+        "runs": len(times),
+        "rows": rows,
+    }
+    if memory:
+        tracemalloc.start()
+        fn()
+        result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        tracemalloc.stop()
+    return result
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """
+    List the benchmarks that got slower than the baseline by more than `tolerance`.
+
+    A benchmark only counts as a regression if it is also at least
+    MIN_REGRESSION_SECONDS slower, so fast queries do not fail on noise.
+
+    Args:
+        results (dict): Benchmark name -> result, as returned by measure.
+        baseline (dict): Baseline results in the same form.
+        tolerance (float): Allowed relative slowdown of the median, e.g. 0.25 for 25%.
+
+    Returns:
+        list[str]: One message per regression; empty if there are none.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or "median_seconds" not in result or not base.get("median_seconds"):
+            continue
+        ratio = result["median_seconds"] / base["median_seconds"]
+        slowdown = result["median_seconds"] - base["median_seconds"]
+        if ratio > 1 + tolerance and slowdown >= MIN_REGRESSION_SECONDS:
+            regressions.append(
+                f"{name}: {result['median_seconds']:.3f}s vs baseline "
+                f"{base['median_seconds']:.3f}s ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def run_benchmarks(scales: list[int], repeat: int = 3, memory: bool = False) -> dict:
+    """Run every benchmark and return name -> result."""
+    from src.load.copy_load import copy_load, prepare_frame
+    from src.load.db import get_target
+    from src.load.load import insert_load
+    from src.transform.enrich import enrich_ae_data
+    from src.transform.ingest import read_ae_files
+    from src.transform.transform_ae import OUTPUT_NAME, transform_ae_data
+
+    engine = _target_engine()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="etl_bench_") as tmp:
+        tmp = Path(tmp)
+        for scale in scales:
+            raw_dir = make_synthetic_raw(tmp / f"raw_{scale}x", scale)
+            processed_dir = tmp / f"processed_{scale}x"
+            raw_files = sorted(str(p) for p in raw_dir.rglob("ae_*.csv"))
+
+            def read_ingest():
+                return sum(len(df) for df in read_ae_files(raw_files))
+            results[f"read[ingest,{scale}x]"] = measure(read_ingest, repeat, memory)
+
+            def read_plain():
+                return sum(len(pd.read_csv(f)) for f in raw_files)
+            results[f"read[read_csv,{scale}x]"] = measure(read_plain, repeat, memory)
+
+            for mode in ("batch", "streaming"):
+                def transform(streaming=(mode == "streaming")):
+                    transform_ae_data(
+                        streaming=streaming,
+                        raw_dir=str(raw_dir),
+                        processed_dir=str(processed_dir),
+                        manifest_path=processed_dir / "manifest.json",
+                    )
+                    # Streaming returns nothing, so count the rows written instead
+                    return _processed_rows(OUTPUT_NAME, processed_dir)
+                results[f"transform[{mode},{scale}x]"] = measure(transform, repeat, memory)
+
+            cleaned = transform_ae_data(
+                raw_dir=str(raw_dir), processed_dir=str(processed_dir),
+                manifest_path=processed_dir / "manifest.json",
+            )
+
+            def enrich():
+                return len(enrich_ae_data(cleaned, cache_path=tmp / "geo_lookup.json",
+                                          processed_dir=processed_dir))
+            results[f"enrich[{scale}x]"] = measure(enrich, repeat, memory)
+
+            enriched = enrich_ae_data(cleaned, cache_path=tmp / "geo_lookup.json", processed_dir=processed_dir)
+            if engine is not None:
+                schema, table = get_target()
+                bench_table = f"{table}_bench"
+                for method, load in (("copy", copy_load), ("insert", insert_load)):
+                    def run_load(load=load):
+                        load(enriched, engine, schema, bench_table)
+                        return len(enriched)
+                    results[f"load[{method},{scale}x]"] = measure(run_load, repeat, memory)
+                with engine.begin() as conn:
+                    conn.execute(text(f'DROP TABLE IF EXISTS "{schema}"."{bench_table}"'))
+            else:
+                sqlite_engine = create_engine(f"sqlite:///{tmp / 'bench.sqlite'}")
+                frame = prepare_frame(enriched)
+
+                def run_sqlite_load():
+                    frame.to_sql("ae_attendances", sqlite_engine, if_exists="replace",
+                                 index=False, chunksize=10_000)
+                    return len(frame)
+                results[f"load[sqlite,{scale}x]"] = measure(run_sqlite_load, repeat, memory)
+
+            results.update(duckdb_query_benchmarks(processed_dir, scale, repeat, memory))
+            shutil.rmtree(raw_dir)
+
+    if engine is not None:
+        results.update(query_benchmarks(engine, repeat, memory))
+    return results
+
+
+def query_benchmarks(engine, repeat: int = 3, memory: bool = False) -> dict:
+    """Time each dashboard SQL file against the target database, bypassing the query cache."""
+    from sqlalchemy.exc import DBAPIError
+
+    from etl_process.src.sql.sql_utils import SQL_DIR, _execute_sql_file
+
+    results = {}
+    for query_path in sorted(SQL_DIR.glob("*.sql")):
+        if query_path.name == "load_version.sql":  # cache bookkeeping, not a dashboard query
+            continue
+        params = QUERY_PARAMS.get(query_path.name)
+
+        def run_query(query_path=query_path, params=params):
+            with engine.connect() as conn:
+                return len(_execute_sql_file(conn, query_path, params))
+
+        try:
+            results[f"query[{query_path.name}]"] = measure(run_query, repeat, memory)
+        except DBAPIError as e:
+            results[f"query[{query_path.name}]"] = {"error": str(e.orig).strip()}
+    return results
+
+
+def duckdb_query_benchmarks(processed_dir: Path, scale: int, repeat: int = 3, memory: bool = False) -> dict:
+    """Time each dashboard SQL file on the embedded DuckDB backend built from `processed_dir`."""
+    try:
+        import duckdb  # type: ignore  # noqa: F401
+    except ImportError:
+        return {}
+
+    from etl_process.src.sql.duckdb_backend import LOADED_DATASET, build_database, read_sql
+    from etl_process.src.sql.sql_utils import SQL_DIR, render_sql
+    from etl_process.src.utils.db_engine import get_target
+
+    dataset = processed_dir / LOADED_DATASET
+
+    def build():
+        build_database(dataset, *get_target()).close()
+
+    results = {f"duckdb_build[{scale}x]": measure(build, repeat, memory)}
+    con = build_database(dataset, *get_target())
+    for query_path in sorted(SQL_DIR.glob("*.sql")):
+        if query_path.name == "load_version.sql":
+            continue
+        query, params = render_sql(query_path), QUERY_PARAMS.get(query_path.name)
+
+        def run_query(query=query, params=params):
+            return len(read_sql(con, query, params))
+        results[f"query[duckdb,{query_path.name},{scale}x]"] = measure(run_query, repeat, memory)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the ETL and dashboard benchmarks.")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="Comma separated data scales (default: 1,10,100)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (default: 3)")
+    parser.add_argument("--memory", action="store_true", help="Also measure peak traced memory")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=float(os.getenv("BENCH_TOLERANCE") or DEFAULT_TOLERANCE),
+                        help="Allowed relative slowdown before failing (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    scales = [int(s) for s in args.scales.split(",") if s]
+    results = run_benchmarks(scales, args.repeat, args.memory)
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "scales": scales,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    results_path = RESULTS_DIR / f"bench_{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    results_path.write_text(json.dumps(report, indent=2))
+
+    print(f"\n{'benchmark':<56}{'median s':>10}{'min s':>10}{'rows':>10}")
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:<56}  error: {result['error']}")
+        else:
+            print(f"{name:<56}{result['median_seconds']:>10.3f}{result['min_seconds']:>10.3f}{result['rows'] or '':>10}")
+    print(f"\nResults written to {results_path}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("No baseline to compare with; run with --save-baseline to create one.")
+        return 0
+
+    regressions = compare_to_baseline(results, json.loads(args.baseline.read_text())["results"], args.tolerance)
+    if regressions:
+        print(f"\nRegressions against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"- {regression}")
+        return 1
+
+    print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+def _processed_rows(name: str, processed_dir: Path) -> int:
+    """Return the number of rows in a processed dataset from its Parquet metadata."""
+    import pyarrow.dataset as ds  # type: ignore
+
+    from src.utils.processed_store import PARTITIONING, dataset_path
+
+    return ds.dataset(dataset_path(name, processed_dir), format="parquet",
+                      partitioning=PARTITIONING).count_rows()
+
+
+def _target_engine():
+    """Return an engine for the target Postgres if one is configured and reachable, else None."""
+    if not os.getenv("TARGET_DB_HOST"):
+        return None
+
+    from sqlalchemy.exc import DBAPIError
+
+    from src.load.db import get_engine
+
+    engine = get_engine("TARGET")
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except DBAPIError as e:
+        print(f"Target database unavailable, using SQLite instead: {e.orig}")
+        return None
+    return engine
+
+
+if __name__ == "__main__":
+    sys.exit(main())
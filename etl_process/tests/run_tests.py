@@ -34,6 +34,12 @@ def main():
         subprocess.run(cov_command, shell=True)
     elif command == 'lint':
         subprocess.run(['flake8', '.'])
+    elif command == 'bench':
+        # Extra arguments are passed through, e.g. --scales 1,10 --save-baseline
+        result = subprocess.run(
+            [sys.executable, '-m', 'tests.benchmarks.bench', *sys.argv[2:]]
+        )
+        sys.exit(result.returncode)
     else:
         raise ValueError(f"Unknown command: {command}")
 
@@ -41,7 +47,7 @@ def main():
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         raise ValueError(
-            "Usage: run_tests.py <unit|integration|component|all|lint>"
+            "Usage: run_tests.py <unit|integration|component|all|lint|bench>"
         )
     else:
         main()
@@ -0,0 +1,53 @@
+import pandas as pd
+
+from tests.benchmarks.bench import compare_to_baseline, make_synthetic_raw, measure
+
+
+def _write_raw(source_dir):
+    folder = source_dir / "ae_2024"
+    folder.mkdir(parents=True)
+    pd.DataFrame({
+        "Period": ["MSitAE-JANUARY-2024"] * 2,
+        "Org Code": ["RAL", "Total"],
+        "Org name": ["ROYAL FREE LONDON", "Total"],
+        "A&E attendances Type 1": ["10", "10"],
+    }).to_csv(folder / "ae_2024_01.csv", index=False)
+
+
+def test_make_synthetic_raw_repeats_trusts_with_distinct_codes(tmp_path):
+    _write_raw(tmp_path / "raw")
+
+    make_synthetic_raw(tmp_path / "out", 3, source_dir=tmp_path / "raw")
+
+    df = pd.read_csv(tmp_path / "out" / "ae_2024" / "ae_2024_01.csv", dtype=str, keep_default_na=False)
+    assert len(df) == 4
+    assert sorted(df["Org Code"]) == ["RAL", "RAL-1", "RAL-2", "Total"]
+    assert (df["Org name"] == "Total").sum() == 1
+
+
+def test_measure_reports_runs_and_rows():
+    result = measure(lambda: 5, repeat=2)
+
+    assert result["runs"] == 2
+    assert result["rows"] == 5
+    assert result["min_seconds"] <= result["median_seconds"] <= result["max_seconds"]
+
+
+def test_compare_to_baseline_flags_slowdowns_beyond_tolerance():
+    baseline = {
+        "transform[batch,1x]": {"median_seconds": 1.0},
+        "enrich[1x]": {"median_seconds": 1.0},
+        "query[fast.sql]": {"median_seconds": 0.002},
+    }
+    results = {
+        "transform[batch,1x]": {"median_seconds": 1.5},
+        "enrich[1x]": {"median_seconds": 1.2},
+        "query[fast.sql]": {"median_seconds": 0.004},
+        "query[new.sql]": {"median_seconds": 9.0},
+        "query[broken.sql]": {"error": "relation does not exist"},
+    }
+
+    regressions = compare_to_baseline(results, baseline, tolerance=0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("transform[batch,1x]")
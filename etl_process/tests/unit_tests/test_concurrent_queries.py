@@ -0,0 +1,45 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# The dashboard query modules import through the etl_process package
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from etl_process.src.sql import sql_utils  # noqa: E402
+
+
+def test_queries_run_concurrently_and_report_failures(monkeypatch):
+    release = threading.Event()
+
+    def fake_query(query_path, params=None, use_cache=True, timeout=None):
+        if query_path == "broken.sql":
+            raise RuntimeError("relation does not exist\n[SQL: SELECT ...]")
+        if query_path == "stuck.sql":
+            release.wait(5)
+        time.sleep(0.2)
+        return pd.DataFrame({"query": [query_path], "org_code": [(params or {}).get("org_code")]})
+
+    monkeypatch.setattr(sql_utils, "run_sql_query", fake_query)
+
+    started = time.monotonic()
+    results, errors = sql_utils.run_sql_queries_concurrently({
+        "a": "a.sql",
+        "b": ("b.sql", {"org_code": "RAL"}),
+        "c": "c.sql",
+        "broken": "broken.sql",
+        "stuck": "stuck.sql",
+    }, timeout=0.5, use_cache=False)
+    elapsed = time.monotonic() - started
+    release.set()
+
+    # Three 0.2s queries in parallel finish well before running one after another would
+    assert sorted(results) == ["a", "b", "c"]
+    assert results["b"]["org_code"].tolist() == ["RAL"]
+    assert elapsed < 0.55
+    assert errors == {
+        "broken": "RuntimeError: relation does not exist",
+        "stuck": "Timed out after 0.5 seconds",
+    }
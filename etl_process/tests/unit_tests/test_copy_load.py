@@ -0,0 +1,117 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.load import copy_load as copy_load_module
+from src.load.copy_load import copy_dataframe, copy_load, delete_periods
+
+
+class FakeCursor:
+    """psycopg2-style cursor recording each COPY chunk."""
+
+    def __init__(self):
+        self.copies = []
+        self.closed = False
+
+    def copy_expert(self, sql, buffer):
+        self.copies.append((sql, buffer.read()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+
+class FakeConnection:
+    """SQLAlchemy-style connection recording each statement and its parameters."""
+
+    def __init__(self):
+        self.statements = []
+        self.copy_cursor = FakeCursor()
+        self.connection = self  # stands in for the DBAPI connection too
+
+    def cursor(self):
+        return self.copy_cursor
+
+    def execute(self, clause, params=None):
+        self.statements.append((" ".join(str(clause).split()), params, clause))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeEngine:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    def begin(self):
+        return self.conn
+
+
+def _frame():
+    return pd.DataFrame({
+        "period": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-02-01"]),
+        "org_code": ["RAL", "RXW", "RAL"],
+        "ae_attendances_type_1": [100.0, 200.0, 150.0],
+    })
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.delenv("TARGET_PARTITION_BY_YEAR", raising=False)
+    monkeypatch.setattr(copy_load_module, "prepare_target_table", lambda conn, schema, table: False)
+    return FakeEngine()
+
+
+def test_copy_dataframe_streams_csv_chunks():
+    cursor = FakeCursor()
+
+    copy_dataframe(cursor, _frame(), '"ae_staging"', chunk_size=2)
+
+    assert [sql for sql, _ in cursor.copies] == [
+        'COPY "ae_staging" ("period", "org_code", "ae_attendances_type_1") FROM STDIN WITH (FORMAT csv)'
+    ] * 2
+    assert cursor.copies[0][1] == "2024-01-01,RAL,100.0\n2024-01-01,RXW,200.0\n"
+    assert cursor.copies[1][1] == "2024-02-01,RAL,150.0\n"
+
+
+def test_delete_periods_binds_an_expanding_list():
+    conn = FakeConnection()
+
+    delete_periods(conn, "s", "ae", ["2024-02-01", "2024-03-01"])
+    delete_periods(conn, "s", "ae", None)
+
+    (sql, params, clause), (full_sql, full_params, _) = conn.statements
+    assert sql == 'DELETE FROM "s"."ae" WHERE period IN (__[POSTCOMPILE_periods])'
+    assert clause._bindparams["periods"].expanding
+    assert params == {"periods": [date(2024, 2, 1), date(2024, 3, 1)]}
+    assert (full_sql, full_params) == ('DELETE FROM "s"."ae"', None)
+
+
+def test_copy_load_replaces_only_the_given_periods(engine):
+    copy_load(_frame(), engine, "s", "ae", periods=["2024-02-01"], chunk_size=10)
+
+    statements = [sql for sql, _, _ in engine.conn.statements]
+    assert statements == [
+        'CREATE TEMP TABLE "ae_staging" (LIKE "s"."ae") ON COMMIT DROP',
+        'DELETE FROM "s"."ae" WHERE period IN (__[POSTCOMPILE_periods])',
+        'INSERT INTO "s"."ae" SELECT * FROM "ae_staging"',
+    ]
+    # Only the rows of the reloaded period are copied, as integers COPY accepts
+    [(_, rows)] = engine.conn.copy_cursor.copies
+    assert rows == "2024-02-01,RAL,150\n"
+    assert engine.conn.copy_cursor.closed
+
+
+def test_copy_load_into_a_new_table_loads_every_period(engine, monkeypatch):
+    monkeypatch.setattr(copy_load_module, "prepare_target_table", lambda conn, schema, table: True)
+
+    copy_load([_frame().iloc[:2], _frame().iloc[2:]], engine, "s", "ae", periods=["2024-02-01"])
+
+    assert engine.conn.statements[1][0] == 'DELETE FROM "s"."ae"'
+    assert [rows.count("\n") for _, rows in engine.conn.copy_cursor.copies] == [2, 1]
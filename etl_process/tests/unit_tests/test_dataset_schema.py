@@ -0,0 +1,50 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.dataset_schema import check_int_range, compact_frame, to_month
+
+
+def test_compact_frame_uses_compact_dtypes():
+    df = pd.DataFrame({
+        "period": [date(2024, 1, 1), date(2024, 2, 1)],
+        "org_code": ["RAL", "RAL"],
+        "attendances_type_1": [21420.0, None],
+        "patients_12hr_wait": [5, 9],
+        "pct_seen_within_4hrs": [77.5, 80.1],
+    })
+
+    compact = compact_frame(df)
+
+    assert isinstance(compact["org_code"].dtype, pd.CategoricalDtype)
+    assert str(compact["attendances_type_1"].dtype) == "Int64"
+    assert compact["attendances_type_1"].isna().tolist() == [False, True]
+    assert str(compact["patients_12hr_wait"].dtype) == "Int64"
+    assert str(compact["period"].dtype) == "datetime64[s]"
+    assert compact["pct_seen_within_4hrs"].dtype == "float64"
+    assert df["org_code"].dtype != compact["org_code"].dtype  # the input is left as it was
+
+
+def test_count_dtypes_do_not_depend_on_the_values():
+    small = compact_frame(pd.DataFrame({"ae_attendances_type_1": [100, 100, 20]}))
+    large = compact_frame(pd.DataFrame({"ae_attendances_type_1": [21420, 0, 5]}))
+
+    assert str(small["ae_attendances_type_1"].dtype) == str(large["ae_attendances_type_1"].dtype) == "Int32"
+    assert (small["ae_attendances_type_1"] * 2).tolist() == [200, 200, 40]
+
+
+def test_check_int_range():
+    check_int_range(pd.Series([-1, 40_000]), "Int32")
+    check_int_range(pd.Series([np.nan]), "Int32")
+    with pytest.raises(OverflowError):
+        check_int_range(pd.Series([2.0 ** 40]), "Int32")
+    with pytest.raises(OverflowError):
+        compact_frame(pd.DataFrame({"ae_attendances_type_1": [2.0 ** 40]}))
+
+
+def test_to_month_floors_to_month_start():
+    months = to_month(pd.Series(["2024-01-15 00:00", "2024-02-01 12:00"]))
+
+    assert months.tolist() == [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01")]
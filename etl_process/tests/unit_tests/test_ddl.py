@@ -0,0 +1,45 @@
+import pandas as pd
+
+from src.load.copy_load import filter_periods, prepare_frame
+from src.load.ddl import create_table_sql
+
+
+def test_create_table_sql_declares_primary_key():
+    sql = create_table_sql("de_2506_a", "ae_attendances")
+
+    assert '"period" DATE NOT NULL' in sql
+    assert 'PRIMARY KEY ("period", "org_code")' in sql
+    assert "PARTITION BY" not in sql
+
+
+def test_create_table_sql_partitioned_by_period():
+    sql = create_table_sql("de_2506_a", "ae_attendances", partitioned=True)
+
+    assert sql.endswith("PARTITION BY RANGE (period)")
+
+
+def test_prepare_frame_coerces_types_and_drops_extra_columns():
+    df = pd.DataFrame({
+        "period": ["2025-01-01"],
+        "org_code": ["RAL"],
+        "ae_attendances_type_1": [21420.0],
+        "not_a_column": [1],
+    })
+
+    result = prepare_frame(df)
+
+    assert "not_a_column" not in result.columns
+    assert str(result["period"].dtype).startswith("datetime64")
+    assert str(result["ae_attendances_type_1"].dtype) == "Int64"
+    assert result["ae_attendances_type_1"].iloc[0] == 21420
+
+
+def test_filter_periods_keeps_requested_periods():
+    df = prepare_frame(pd.DataFrame({
+        "period": ["2025-01-01", "2025-02-01"],
+        "org_code": ["RAL", "RAL"],
+    }))
+
+    result = filter_periods(df, ["2025-02-01"])
+
+    assert result["period"].tolist() == [pd.Timestamp("2025-02-01")]
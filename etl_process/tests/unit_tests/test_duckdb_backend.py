@@ -0,0 +1,107 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# The dashboard query modules import through the etl_process package
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+pytest.importorskip("duckdb")
+
+from etl_process.src.load.summaries import GEO_BIN_LEVELS  # noqa: E402
+from etl_process.src.sql import duckdb_backend  # noqa: E402
+from etl_process.src.sql.sql_utils import SQL_DIR, render_sql  # noqa: E402
+from src.load.db import get_target  # noqa: E402
+from src.utils.processed_store import write_processed  # noqa: E402
+
+
+@pytest.fixture
+def processed_dir(tmp_path):
+    df = pd.DataFrame({
+        "period": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-02-01", "2024-02-01"]),
+        "org_code": ["RAL", "RXW", "RAL", "RXW"],
+        "org_name": ["ROYAL FREE", "SHREWSBURY", "ROYAL FREE", "SHREWSBURY"],
+        "ae_attendances_type_1": [100, 200, 100, 0],
+        "attendances_over_4hrs_type_1": [40, 50, 30, 0],
+        "patients_12hr_wait": [5, 9, 7, 1],
+        "emergency_admissions_type_1": [10, 20, 10, 0],
+        "postcode": ["NW3 2QG", "SY3 8XQ", "NW3 2QG", "SY3 8XQ"],
+        "latitude": [51.55, 52.70, 51.55, 52.70],
+        "longitude": [-0.17, -2.77, -0.17, -2.77],
+    })
+    write_processed(df, duckdb_backend.LOADED_DATASET, tmp_path)
+    return tmp_path
+
+
+def _query(con, name, params=None):
+    query = render_sql(SQL_DIR / name)
+    return duckdb_backend.read_sql(con, query, params)
+
+
+def test_dashboard_queries_default_to_the_table_the_etl_loads(monkeypatch):
+    monkeypatch.delenv("TARGET_DB_SCHEMA", raising=False)
+    monkeypatch.delenv("TARGET_DB_TABLE", raising=False)
+    schema, table = get_target()
+
+    assert f"{schema}.{table}" in render_sql(SQL_DIR / "geospatial_latest.sql")
+
+
+def test_dashboard_queries_run_on_processed_files(processed_dir, monkeypatch):
+    monkeypatch.setenv("TARGET_DB_SCHEMA", "de_2506_a")
+    monkeypatch.delenv("TARGET_DB_TABLE", raising=False)
+    con = duckdb_backend.build_database(processed_dir / duckdb_backend.LOADED_DATASET, "de_2506_a", "ae_attendances")
+
+    national = _query(con, "latest_home.sql")
+    assert national["attendances_type_1"].tolist() == [300, 100]
+    assert national["pct_seen_within_4hrs"].tolist() == [70.0, 70.0]
+
+    latest = _query(con, "seen_within_4hrs_latest.sql", {"n_periods": 1})
+    assert latest["org_code"].tolist() == ["RAL", "RXW"]
+    assert latest["pct_seen_within_4hrs"].isna().tolist() == [False, True]
+
+    trust = _query(con, "seen_within_4hrs_trust.sql", {"org_code": "RXW", "unused": 1})
+    assert len(trust) == 2
+
+    in_range = _query(con, "seen_within_4hrs_period_range.sql",
+                      {"start_period": date(2024, 2, 1), "end_period": date(2024, 12, 1)})
+    assert set(in_range["period"].dt.date) == {date(2024, 2, 1)}
+
+    ranking = _query(con, "trust_12hr_summary.sql")
+    assert ranking["org_code"].tolist() == ["RAL", "RXW"]
+
+
+def test_connect_rebuilds_when_processed_files_change(processed_dir, monkeypatch):
+    monkeypatch.setenv("DASHBOARD_PROCESSED_DIR", str(processed_dir))
+    dataset = processed_dir / duckdb_backend.LOADED_DATASET
+
+    with duckdb_backend.connect("s", "t") as con:
+        assert con.execute('SELECT COUNT(*) FROM "s"."t"').fetchone() == (4,)
+    version = duckdb_backend.data_version(dataset)
+
+    write_processed(pd.read_parquet(dataset).head(1).drop(columns="year"), duckdb_backend.LOADED_DATASET, processed_dir)
+
+    assert duckdb_backend.data_version(dataset) != version
+    with duckdb_backend.connect("s", "t") as con:
+        assert con.execute('SELECT COUNT(*) FROM "s"."t"').fetchone() == (1,)
+
+
+def test_build_database_requires_processed_data(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        duckdb_backend.build_database(tmp_path / "missing", "s", "t")
+
+
+def test_geo_bins_sum_the_latest_period_at_each_level(processed_dir):
+    con = duckdb_backend.build_database(processed_dir / duckdb_backend.LOADED_DATASET, *get_target())
+
+    for level in sorted(GEO_BIN_LEVELS):
+        bins = _query(con, "geo_bins_latest.sql", {"level": level})
+
+        assert set(bins["period"].dt.date) == {date(2024, 2, 1)}
+        assert bins["trusts"].sum() == 2
+        assert bins["patients_12hr_wait"].sum() == 8
+
+    # The two trusts are about 200km apart, so the finest level keeps them apart
+    assert len(bins) == 2
+    assert sorted(bins["patients_12hr_wait"]) == [1, 7]
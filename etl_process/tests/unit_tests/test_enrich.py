@@ -0,0 +1,87 @@
+import pandas as pd
+
+from src.transform.enrich import enrich_ae_data, geo_lookup, normalise_names
+from src.utils.processed_store import read_processed, write_processed
+
+
+def _write_reference(tmp_path):
+    pd.DataFrame({
+        "org_name": ["WIGAN AND LEIGH NHS TRUST", "ROYAL FREE LONDON NHS TRUST"],
+        "postcode": ["WN1 2NN", "NW3 2QG"],
+        "latitude": [53.55, 51.55],
+        "longitude": [-2.63, -0.16],
+    }).to_csv(tmp_path / "orgs.csv", index=False)
+    pd.DataFrame({
+        "OrganisationCode": ["RJ101", "RX901"],
+        "Sector": ["NHS Sector", "Independent Sector"],
+        "Postcode": ["SE1 7EH", "AB1 1AA"],
+        "Latitude": [51.49, 57.1],
+        "Longitude": [-0.11, -2.1],
+        "ParentODSCode": ["RJ1", "RX9"],
+    }).to_csv(tmp_path / "hospital.csv", index=False)
+    return tmp_path / "orgs.csv", tmp_path / "hospital.csv"
+
+
+def _ae():
+    return pd.DataFrame({
+        "period": pd.to_datetime(["2024-01-01"] * 5),
+        "org_code": ["RRF", "RJ1", "RAL", "RX9", "ZZZ"],
+        "org_name": [
+            "WIGAN, AND LEIGH NHS TRUST",
+            "GUY'S AND ST THOMAS' NHS TRUST",
+            "ROYAL FREE LONDON NHS TRUSTS",
+            "PRIVATE TRUST",
+            "UNKNOWN TRUST",
+        ],
+        "ae_attendances_type_1": [1, 2, 3, 4, 5],
+    })
+
+
+def test_normalise_names_drops_punctuation_and_spaces():
+    names = pd.Series([" Wigan,  and Leigh ", "GUY'S"])
+
+    assert normalise_names(names).tolist() == ["WIGAN AND LEIGH", "GUY'S"]
+
+
+def test_geo_lookup_match_order(tmp_path):
+    orgs, hospital = _write_reference(tmp_path)
+
+    lookup = geo_lookup(_ae()[["org_code", "org_name"]], orgs, hospital, tmp_path / "cache.json")
+
+    assert lookup["match"].tolist() == ["name", "org_code", "fuzzy", "unmatched", "unmatched"]
+    assert lookup["postcode"].tolist()[:3] == ["WN1 2NN", "SE1 7EH", "NW3 2QG"]
+
+
+def test_geo_lookup_reuses_cache_until_reference_changes(tmp_path, capsys):
+    orgs, hospital = _write_reference(tmp_path)
+    keys = _ae()[["org_code", "org_name"]]
+    geo_lookup(keys, orgs, hospital, tmp_path / "cache.json")
+
+    geo_lookup(keys, orgs, hospital, tmp_path / "cache.json")
+    assert "loaded from cache" in capsys.readouterr().out
+
+    with open(orgs, "a") as f:
+        f.write("NEW TRUST,E1 1BB,51.5,-0.05\n")
+    geo_lookup(keys, orgs, hospital, tmp_path / "cache.json")
+    assert "Resolving locations for 5 trusts (0 cached)" in capsys.readouterr().out
+
+
+def test_enrich_ae_data_writes_located_rows(tmp_path):
+    orgs, hospital = _write_reference(tmp_path)
+
+    enriched = enrich_ae_data(_ae(), orgs, hospital, tmp_path / "cache.json", processed_dir=tmp_path)
+
+    assert len(enriched) == 5
+    assert enriched["latitude"].notna().sum() == 3
+    assert (tmp_path / "location_ae_combined").is_dir()
+
+
+def test_enrich_ae_data_streams_an_empty_dataset(tmp_path):
+    orgs, hospital = _write_reference(tmp_path)
+    write_processed(_ae().iloc[:0], "ae_data_cleaned", tmp_path)
+
+    enriched = enrich_ae_data(None, orgs, hospital, tmp_path / "cache.json", processed_dir=tmp_path, streaming=True)
+
+    assert enriched.empty
+    assert list(enriched.columns) == list(_ae().columns) + ["postcode", "latitude", "longitude"]
+    assert read_processed("location_ae_combined", processed_dir=tmp_path).columns.equals(enriched.columns)
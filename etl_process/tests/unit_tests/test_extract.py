@@ -0,0 +1,131 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.extract.extract import catalogue_path, download_file, extract_ae_data
+
+JANUARY = b"Period,Org Code\nMSitAE-JANUARY-2024,RAL\n" * 50
+FEBRUARY = b"Period,Org Code\nMSitAE-FEBRUARY-2024,RAL\n" * 50
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local stand-in for the NHS file server, supporting ETags and Range requests."""
+
+    def __init__(self, files):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.files = files
+        self.requests = []
+        self.truncate_next = set()
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self.server_address[1]}/{name}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        name = self.path.lstrip("/")
+        self.server.requests.append((name, dict(self.headers)))
+        body = self.server.files.get(name)
+        if body is None:
+            self.send_error(404)
+            return
+
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") == etag:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+
+        if name in self.server.truncate_next:
+            # Drop the connection half way through the body
+            self.server.truncate_next.discard(name)
+            self.wfile.write(body[start:start + (len(body) - start) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body[start:])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = StandInServer({"jan.csv": JANUARY, "feb.csv": FEBRUARY})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _catalogue(server):
+    return [
+        {"period": "2024-01", "url": server.url("jan.csv"), "sha256": hashlib.sha256(JANUARY).hexdigest()},
+        {"period": "2024-02", "url": server.url("feb.csv")},
+    ]
+
+
+def test_catalogue_path_uses_the_raw_layout():
+    assert catalogue_path({"period": "2024-3"}) == "ae_2024/ae_2024_03.csv"
+    assert catalogue_path({"path": "ae_2020/ae_2020_04.csv", "period": "2020-04"}) == "ae_2020/ae_2020_04.csv"
+
+
+def test_extract_downloads_then_skips_unchanged_files(server, tmp_path):
+    results = extract_ae_data(_catalogue(server), raw_dir=tmp_path, max_workers=2)
+
+    assert [r["status"] for r in results] == ["downloaded", "downloaded"]
+    assert (tmp_path / "ae_2024" / "ae_2024_01.csv").read_bytes() == JANUARY
+    state = json.loads((tmp_path / "download_state.json").read_text())
+    assert state["files"]["ae_2024/ae_2024_02.csv"]["sha256"] == hashlib.sha256(FEBRUARY).hexdigest()
+
+    server.files["feb.csv"] = FEBRUARY + b"MSitAE-FEBRUARY-2024,RXW\n"
+    results = extract_ae_data(_catalogue(server), raw_dir=tmp_path, max_workers=2)
+
+    assert [r["status"] for r in results] == ["not_modified", "downloaded"]
+    assert (tmp_path / "ae_2024" / "ae_2024_02.csv").read_bytes().endswith(b"RXW\n")
+
+
+def test_interrupted_download_is_resumed_with_a_range_request(server, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.extract.extract.time.sleep", lambda seconds: None)
+    server.truncate_next.add("jan.csv")
+    target = tmp_path / "ae_2024" / "ae_2024_01.csv"
+
+    result, record = download_file(server.url("jan.csv"), target, retries=1)
+
+    assert result["status"] == "resumed"
+    assert target.read_bytes() == JANUARY
+    assert record["sha256"] == hashlib.sha256(JANUARY).hexdigest()
+    assert "Range" in server.requests[-1][1]
+    assert not target.with_name(target.name + ".part").exists()
+
+
+def test_checksum_mismatch_fails_without_replacing_the_file(server, tmp_path):
+    catalogue = [{"period": "2024-01", "url": server.url("jan.csv"), "sha256": "0" * 64}]
+
+    [result] = extract_ae_data(catalogue, raw_dir=tmp_path)
+
+    assert result["status"] == "failed"
+    assert "Checksum mismatch" in result["error"]
+    assert not (tmp_path / "ae_2024" / "ae_2024_01.csv").exists()
+
+
+def test_missing_file_is_reported_as_failed(server, tmp_path):
+    [result] = extract_ae_data([{"period": "2024-03", "url": server.url("mar.csv")}], raw_dir=tmp_path)
+
+    assert result["status"] == "failed"
+    assert "404" in result["error"]
@@ -0,0 +1,62 @@
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# The dashboard modules import through the etl_process package
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from etl_process.src.utils.figure_cache import FigureCache, figure_key  # noqa: E402
+
+
+class FakeFigure:
+    def __init__(self, title):
+        self.title = title
+
+    def to_json(self):
+        return json.dumps({"data": [], "layout": {"title": {"text": self.title}}})
+
+
+def test_figures_are_built_once_per_version_and_params(tmp_path):
+    cache = FigureCache(tmp_path)
+    build = MagicMock(side_effect=lambda: FakeFigure("RAL"))
+
+    first = cache.get_or_build("trust_trend", {"org_code": "RAL"}, 7, build)
+    again = cache.get_or_build("trust_trend", {"org_code": "RAL"}, 7, build)
+    cache.get_or_build("trust_trend", {"org_code": "RXW"}, 7, build)
+
+    assert first == again == {"data": [], "layout": {"title": {"text": "RAL"}}}
+    assert build.call_count == 2
+    assert (tmp_path / "7" / f"{figure_key('trust_trend', {'org_code': 'RAL'})}.json").exists()
+
+    cache.get_or_build("trust_trend", {"org_code": "RAL"}, 8, build)
+    assert build.call_count == 3
+
+
+def test_prebuilt_figures_are_read_from_disk(tmp_path):
+    FigureCache(tmp_path).set("national_trend", {}, 7, FakeFigure("national").to_json())
+    build = MagicMock()
+
+    figure = FigureCache(tmp_path).get_or_build("national_trend", {}, 7, build)
+
+    assert figure["layout"]["title"]["text"] == "national"
+    build.assert_not_called()
+
+
+def test_least_recently_used_figure_is_evicted_from_memory():
+    cache = FigureCache(directory=None, maxsize=1)
+    cache.set("a", {}, 1, FakeFigure("a").to_json())
+    cache.set("b", {}, 1, FakeFigure("b").to_json())
+
+    assert cache.get("a", {}, 1) is None
+    assert cache.get("b", {}, 1) is not None
+
+
+def test_prune_keeps_only_the_current_version(tmp_path):
+    cache = FigureCache(tmp_path)
+    cache.set("national_trend", {}, 7, FakeFigure("old").to_json())
+    cache.set("national_trend", {}, 8, FakeFigure("new").to_json())
+
+    cache.prune(8)
+
+    assert [p.name for p in tmp_path.iterdir()] == ["8"]
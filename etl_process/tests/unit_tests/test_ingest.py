@@ -0,0 +1,111 @@
+import pandas as pd
+
+from src.transform.ingest import (
+    detect_header_variant,
+    normalise_headers,
+    read_ae_file,
+    read_ae_files,
+)
+
+LEGACY_CSV = (
+    "Period,Org Code,Parent Org,Org name,Number of A&E attendances Type 1,"
+    "Number of A&E attendances Type 2,Number of attendances over 4hrs Type 1,"
+    "Patients who have waited 12+ hrs from DTA to admission,"
+    "Emergency admissions via A&E - Type 1\n"
+    "MSitAE-JANUARY-2020,RAL,LONDON,ROYAL FREE,21420,5,4812,55,4533\n"
+)
+
+CURRENT_CSV = (
+    "Period,Org Code,Parent Org,Org name,A&E attendances Type 1,"
+    "Attendances over 4hrs Type 1,"
+    "Patients who have waited 12+ hrs from DTA to admission,"
+    "Emergency admissions via A&E - Type 1 \n"
+    "MSitAE-JUNE-2023,RWY,NORTH EAST,CALDERDALE,15048,4214,1,2899\n"
+)
+
+
+def _write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content)
+    return str(path)
+
+
+def test_detect_header_variant_legacy(tmp_path):
+    path = _write(tmp_path, "ae_2020_01.csv", LEGACY_CSV)
+
+    variant, columns = detect_header_variant(path)
+
+    assert variant == "legacy"
+    assert columns["Number of A&E attendances Type 1"] == "ae_attendances_type_1"
+    assert "Parent Org" not in columns
+    assert "Number of A&E attendances Type 2" not in columns
+
+
+def test_detect_header_variant_current_maps_padded_headers(tmp_path):
+    path = _write(tmp_path, "ae_2023_06.csv", CURRENT_CSV)
+
+    variant, columns = detect_header_variant(path)
+
+    assert variant == "current"
+    assert columns["Emergency admissions via A&E - Type 1 "] == "emergency_admissions_type_1"
+
+
+def test_read_ae_file_keeps_needed_columns_with_compact_dtypes(tmp_path):
+    path = _write(tmp_path, "ae_2020_01.csv", LEGACY_CSV)
+
+    df = read_ae_file(path)
+
+    assert list(df.columns) == [
+        "period",
+        "org_code",
+        "org_name",
+        "ae_attendances_type_1",
+        "attendances_over_4hrs_type_1",
+        "patients_12hr_wait",
+        "emergency_admissions_type_1",
+    ]
+    assert isinstance(df["period"].dtype, pd.CategoricalDtype)
+    assert df["ae_attendances_type_1"].dtype == "Int32"
+    assert df["ae_attendances_type_1"].iloc[0] == 21420
+
+
+def test_read_ae_files_preserves_order(tmp_path):
+    paths = [
+        _write(tmp_path, "ae_2020_01.csv", LEGACY_CSV),
+        _write(tmp_path, "ae_2023_06.csv", CURRENT_CSV),
+    ]
+
+    serial = read_ae_files(paths, max_workers=1)
+    parallel = read_ae_files(paths, max_workers=2)
+
+    assert [df["org_code"].iloc[0] for df in serial] == ["RAL", "RWY"]
+    assert [df["org_code"].iloc[0] for df in parallel] == ["RAL", "RWY"]
+    assert list(parallel[1].columns)[-1] == "emergency_admissions_type_1"
+
+
+def test_normalise_headers_combines_headers_for_the_same_column():
+    df = pd.DataFrame({
+        "Org Code ": ["RAL", "RWY"],
+        "Period": ["MSitAE-JANUARY-2020", None],
+        "Reporting Period": ["ignored", "MSitAE-JUNE-2023"],
+        "Parent Org": ["LONDON", "NORTH EAST"],
+    })
+
+    result = normalise_headers(df)
+
+    assert list(result.columns) == ["period", "org_code"]
+    assert result["period"].tolist() == ["MSitAE-JANUARY-2020", "MSitAE-JUNE-2023"]
+
+
+def test_read_ae_file_combines_categorical_period_headers(tmp_path):
+    path = _write(tmp_path, "ae_mixed.csv", (
+        "Period,Reporting Period,Org Code,A&E attendances Type 1\n"
+        "MSitAE-JANUARY-2024,,RAL,100\n"
+        ",MSitAE-FEBRUARY-2024,RWY,200\n"
+    ))
+
+    df = read_ae_file(path)
+
+    assert isinstance(df["period"].dtype, pd.CategoricalDtype)
+    assert df["period"].tolist() == ["MSitAE-JANUARY-2024", "MSitAE-FEBRUARY-2024"]
+    assert df["ae_attendances_type_1"].tolist() == [100, 200]
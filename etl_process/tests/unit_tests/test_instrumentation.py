@@ -0,0 +1,100 @@
+import json
+import logging
+
+import pytest
+
+from src.utils import instrumentation
+from src.utils.instrumentation import RunReport, path_size, run_report, stage
+
+LOGGER = logging.getLogger("test_instrumentation")
+
+
+def test_stage_outside_a_run_is_not_recorded():
+    with stage("read", files=2) as record:
+        record["rows_out"] = 10
+
+    assert record == {"stage": "read", "files": 2, "rows_out": 10}
+
+
+def test_run_report_records_stages_and_writes_json(tmp_path):
+    with run_report("test_run", output_dir=tmp_path, logger=LOGGER) as report:
+        with stage("read") as record:
+            record["rows_out"] = 10
+        with stage("write", rows_in=10):
+            pass
+
+    [report_file] = tmp_path.glob("test_run_*.json")
+    data = json.loads(report_file.read_text())
+
+    assert data["status"] == "succeeded"
+    assert [s["stage"] for s in data["stages"]] == ["read", "write"]
+    assert data["stages"][0]["rows_out"] == 10
+    assert data["stages"][1]["wall_seconds"] >= 0
+    assert "cpu_seconds" in data["stages"][1]
+    assert report.stages == data["stages"]
+
+
+def test_run_report_marks_failed_runs(tmp_path):
+    with pytest.raises(ValueError):
+        with run_report("test_run", output_dir=tmp_path, logger=LOGGER):
+            with stage("load"):
+                raise ValueError("boom")
+
+    data = json.loads(next(tmp_path.glob("test_run_*.json")).read_text())
+
+    assert data["status"] == "failed"
+    assert data["error"] == "ValueError: boom"
+    assert data["stages"][0]["stage"] == "load"
+
+
+def test_report_stage_is_logged():
+    records = []
+    logger = logging.getLogger("test_instrumentation_logged")
+    logger.addHandler(type("H", (logging.Handler,), {"emit": lambda self, r: records.append(r)})())
+    logger.setLevel(logging.INFO)
+
+    with RunReport(logger=logger).stage("glob", files=3):
+        pass
+
+    assert records[0].getMessage().startswith("stage=glob files=3")
+
+
+def test_path_size_sums_directories(tmp_path):
+    (tmp_path / "a").write_bytes(b"12345")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b").write_bytes(b"123")
+
+    assert path_size(tmp_path) == 8
+    assert path_size(tmp_path / "a") == 5
+
+
+def test_stage_peak_rss_covers_only_that_stage():
+    report = RunReport(logger=LOGGER)
+    if not report._track_hwm and instrumentation.psutil is None:
+        pytest.skip("per-stage peak RSS needs /proc/self/clear_refs or psutil")
+
+    with report.stage("outer"):
+        with report.stage("allocate"):
+            block = bytearray(64 * 1024 * 1024)
+            block[::4096] = b"x" * len(block[::4096])
+            del block
+        with report.stage("small"):
+            pass
+
+    allocate, small, outer = report.stages
+    assert allocate["peak_rss_mb"] - small["peak_rss_mb"] > 50
+    assert outer["peak_rss_mb"] >= allocate["peak_rss_mb"]
+    assert "process_peak_rss_children_mb" in small
+
+
+def test_stage_falls_back_to_the_process_peak(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_reset_hwm", lambda: False)
+    monkeypatch.setattr(instrumentation, "psutil", None)
+    report = RunReport(logger=LOGGER)
+
+    with report.stage("read"):
+        pass
+
+    assert "peak_rss_mb" not in report.stages[0]
+    assert "process_peak_rss_mb" in report.stages[0]
+    assert "process_peak_rss_mb" in report.to_dict()
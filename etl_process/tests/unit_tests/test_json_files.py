@@ -0,0 +1,24 @@
+import json
+
+import pytest
+
+from src.utils import json_files
+from src.utils.json_files import write_json_atomic
+
+
+def test_write_json_atomic_creates_the_folder(tmp_path):
+    path = write_json_atomic({"b": 1, "a": [2]}, tmp_path / "state" / "s.json", sort_keys=True)
+
+    assert json.loads(path.read_text()) == {"a": [2], "b": 1}
+    assert [p.name for p in path.parent.iterdir()] == ["s.json"]
+
+
+def test_failed_write_keeps_the_previous_file(tmp_path, monkeypatch):
+    path = write_json_atomic({"version": 1}, tmp_path / "s.json")
+    monkeypatch.setattr(json_files.json, "dump", lambda *args, **kwargs: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        write_json_atomic({"version": 2}, path)
+
+    assert json.loads(path.read_text()) == {"version": 1}
+    assert [p.name for p in tmp_path.iterdir()] == ["s.json"]
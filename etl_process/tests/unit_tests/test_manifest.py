@@ -0,0 +1,98 @@
+import os
+
+from src.transform.manifest import (
+    clear_pending_periods,
+    diff_manifest,
+    file_fingerprint,
+    load_manifest,
+    manifest_key,
+    pending_periods,
+    save_manifest,
+)
+from src.transform.transform_ae import transform_ae_data
+
+
+def _manifest_for(file_path, raw_dir):
+    return {
+        "files": {
+            manifest_key(file_path, raw_dir): {
+                **file_fingerprint(file_path),
+                "row_count": 1,
+                "periods": ["2024-01-01"],
+            }
+        },
+        "pending_periods": [],
+    }
+
+
+def test_load_manifest_missing_file_returns_empty(tmp_path):
+    manifest = load_manifest(tmp_path / "manifest.json")
+
+    assert manifest == {"files": {}, "pending_periods": []}
+
+
+def test_save_and_load_manifest_round_trip(tmp_path):
+    path = tmp_path / "manifest.json"
+    save_manifest({"files": {}, "pending_periods": ["2024-01-01"]}, path)
+
+    assert load_manifest(path)["pending_periods"] == ["2024-01-01"]
+    assert pending_periods(path) == ["2024-01-01"]
+
+    clear_pending_periods(path)
+    assert pending_periods(path) == []
+
+
+def test_diff_manifest_detects_new_changed_and_removed(tmp_path):
+    raw_dir = tmp_path / "raw"
+    (raw_dir / "ae_2024").mkdir(parents=True)
+    unchanged = raw_dir / "ae_2024" / "ae_2024_01.csv"
+    changed = raw_dir / "ae_2024" / "ae_2024_02.csv"
+    new = raw_dir / "ae_2024" / "ae_2024_03.csv"
+    for f in (unchanged, changed, new):
+        f.write_text("Period\nMSitAE-JANUARY-2024\n")
+
+    manifest = _manifest_for(str(unchanged), str(raw_dir))
+    manifest["files"].update(_manifest_for(str(changed), str(raw_dir))["files"])
+    manifest["files"]["ae_2023/ae_2023_12.csv"] = {"periods": ["2023-12-01"]}
+
+    changed.write_text("Period\nMSitAE-FEBRUARY-2024\n")
+
+    new_or_changed, removed = diff_manifest(
+        [str(unchanged), str(changed), str(new)], manifest, str(raw_dir)
+    )
+
+    assert new_or_changed == [str(changed), str(new)]
+    assert removed == ["ae_2023/ae_2023_12.csv"]
+
+
+def test_diff_manifest_ignores_touched_but_identical_file(tmp_path):
+    raw_file = tmp_path / "ae_2024_01.csv"
+    raw_file.write_text("Period\nMSitAE-JANUARY-2024\n")
+    manifest = _manifest_for(str(raw_file), str(tmp_path))
+
+    stat = os.stat(raw_file)
+    os.utime(raw_file, (stat.st_atime, stat.st_mtime + 60))
+
+    new_or_changed, removed = diff_manifest([str(raw_file)], manifest, str(tmp_path))
+
+    assert new_or_changed == []
+    assert removed == []
+    assert manifest["files"]["ae_2024_01.csv"]["mtime"] == stat.st_mtime + 60
+
+
+def test_unchanged_run_saves_refreshed_mtimes(tmp_path, monkeypatch):
+    raw_file = tmp_path / "raw" / "ae_2024_01.csv"
+    raw_file.parent.mkdir()
+    raw_file.write_text("Period,Org Code,A&E attendances Type 1\nMSitAE-JANUARY-2024,RAL,100\n")
+    paths = {"raw_dir": str(tmp_path / "raw"), "processed_dir": str(tmp_path / "processed"),
+             "manifest_path": tmp_path / "manifest.json", "incremental": True}
+    transform_ae_data(**paths)
+
+    stat = os.stat(raw_file)
+    os.utime(raw_file, (stat.st_atime, stat.st_mtime + 60))
+    transform_ae_data(**paths)
+
+    assert load_manifest(paths["manifest_path"])["files"]["ae_2024_01.csv"]["mtime"] == stat.st_mtime + 60
+    # The next run matches the saved mtime and hashes nothing
+    monkeypatch.setattr("src.transform.manifest.file_fingerprint", lambda path: 1 / 0)
+    assert len(transform_ae_data(**paths)) == 1
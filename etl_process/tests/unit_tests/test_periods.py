@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from src.transform.periods import parse_periods
+
+
+@pytest.mark.parametrize("label, expected", [
+    ("MSitAE-JANUARY-2020", "2020-01-01"),
+    ("msitae-december-2024 ", "2024-12-01"),
+    ("September 2023", "2023-09-01"),
+    ("W/E 05/01/2025", "2025-01-05"),
+    ("Q1 2024-25", "2024-04-01"),
+    ("Q4 2024-25", "2025-01-01"),
+    ("2024-Q3", "2024-07-01"),
+    ("2024-02", "2024-02-01"),
+    ("2024-02-15", "2024-02-15"),
+])
+def test_parse_periods_supported_formats(label, expected):
+    result = parse_periods(pd.Series([label]))
+
+    assert result.iloc[0] == pd.Timestamp(expected)
+
+
+def test_parse_periods_unparseable_and_missing_are_nat():
+    result = parse_periods(pd.Series(["TOTAL", None, float("nan")]))
+
+    assert result.isna().all()
+
+
+def test_parse_periods_broadcasts_to_every_row_and_keeps_index():
+    labels = pd.Series(
+        ["MSitAE-MARCH-2021", None, "MSitAE-MARCH-2021", "MSitAE-APRIL-2021"],
+        index=[10, 11, 12, 13],
+        name="period",
+    )
+
+    result = parse_periods(labels)
+
+    assert list(result.index) == [10, 11, 12, 13]
+    assert result.name == "period"
+    assert result[10] == result[12] == pd.Timestamp("2021-03-01")
+    assert pd.isna(result[11])
+    assert result[13] == pd.Timestamp("2021-04-01")
@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+
+from src.transform.ingest import read_ae_file
+from src.utils import processed_store
+from src.utils.dataset_schema import COUNT_DTYPES, compact_frame
+from src.utils.processed_store import read_processed, write_processed
+
+
+def _sample():
+    return pd.DataFrame({
+        "period": pd.to_datetime(["2023-12-01", "2024-01-01", "2024-02-01"]),
+        "org_code": ["RAL", "RAL", "RJ1"],
+        "ae_attendances_type_1": [21420.0, None, 300.0],
+    })
+
+
+def test_round_trip_keeps_integer_types(tmp_path):
+    write_processed(_sample(), "ae", tmp_path)
+
+    df = read_processed("ae", processed_dir=tmp_path)
+
+    assert str(df["ae_attendances_type_1"].dtype) == "Int32"
+    assert isinstance(df["org_code"].dtype, pd.CategoricalDtype)
+    assert df["ae_attendances_type_1"].tolist()[0] == 21420
+    assert df["ae_attendances_type_1"].isna().sum() == 1
+    assert (tmp_path / "ae" / "year=2024").is_dir()
+
+
+def test_read_projects_columns_and_filters_periods(tmp_path):
+    write_processed(_sample(), "ae", tmp_path)
+
+    df = read_processed("ae", columns=["period", "org_code"], periods=["2024-02-01"], processed_dir=tmp_path)
+
+    assert list(df.columns) == ["period", "org_code"]
+    assert df["org_code"].tolist() == ["RJ1"]
+
+
+def test_rewrite_replaces_previous_dataset(tmp_path):
+    write_processed(_sample(), "ae", tmp_path)
+    write_processed(_sample().iloc[:1], "ae", tmp_path)
+
+    df = read_processed("ae", processed_dir=tmp_path)
+
+    assert len(df) == 1
+    assert not (tmp_path / "ae" / "year=2024").exists()
+
+
+def test_readers_see_the_previous_version_while_it_is_swapped(tmp_path, monkeypatch):
+    write_processed(_sample(), "ae", tmp_path)
+    _sample().iloc[:1].to_csv(tmp_path / "ae.csv", index=False)  # stale legacy CSV
+    replace = processed_store.os.replace
+    seen = []
+
+    def replace_and_read(src, dst):
+        replace(src, dst)
+        seen.append(len(read_processed("ae", processed_dir=tmp_path)))
+
+    monkeypatch.setattr(processed_store.os, "replace", replace_and_read)
+    write_processed(_sample().iloc[1:], "ae", tmp_path)
+
+    # After moving the old version aside, then after swapping the new one in
+    assert seen == [3, 2]
+    assert not (tmp_path / "ae.old").exists()
+
+
+def test_falls_back_to_legacy_csv(tmp_path):
+    _sample().to_csv(tmp_path / "ae.csv", index=False)
+
+    df = read_processed("ae", periods=["2023-12-01"], processed_dir=tmp_path)
+
+    assert df["ae_attendances_type_1"].tolist() == [21420]
+
+
+def test_missing_dataset_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        read_processed("ae", processed_dir=tmp_path)
+
+
+def test_unknown_columns_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_processed(_sample().assign(extra=1), "ae", tmp_path)
+
+
+def test_counts_keep_their_declared_dtype_from_read_to_store(tmp_path):
+    raw = tmp_path / "ae_2024_01.csv"
+    raw.write_text(
+        "Period,Org Code,A&E attendances Type 1,Patients who have waited 12+ hrs from DTA to admission\n"
+        "MSitAE-JANUARY-2024,RAL,100,5\n"
+    )
+    df = read_ae_file(str(raw)).assign(period=pd.Timestamp("2024-01-01"))
+    write_processed(df, "ae", tmp_path)
+    stored = read_processed("ae", processed_dir=tmp_path)
+
+    for col in ("ae_attendances_type_1", "patients_12hr_wait"):
+        assert str(df[col].dtype) == str(stored[col].dtype) == COUNT_DTYPES[col]
+        assert str(compact_frame(df)[col].dtype) == COUNT_DTYPES[col]
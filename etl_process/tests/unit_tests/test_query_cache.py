@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+
+from src.utils.query_cache import QueryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_or_load_caches_result():
+    cache = QueryCache()
+    loader = MagicMock(return_value="result")
+
+    assert cache.get_or_load("key", 1, loader) == "result"
+    assert cache.get_or_load("key", 1, loader) == "result"
+
+    loader.assert_called_once()
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = QueryCache(ttl=60, clock=clock)
+    cache.set("key", "value")
+
+    clock.now = 59
+    assert cache.get("key") == "value"
+
+    clock.now = 61
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_new_version_invalidates_all_entries():
+    cache = QueryCache()
+    cache.set("a", 1, version=1)
+    cache.set("b", 2, version=1)
+
+    assert cache.get("a", version=2) is None
+    assert len(cache) == 0
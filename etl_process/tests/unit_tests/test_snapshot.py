@@ -0,0 +1,69 @@
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# The dashboard modules import through the etl_process package
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+pytest.importorskip("plotly")
+
+from etl_process.src.transform import snapshot  # noqa: E402
+
+FIGURE = {"data": [{"type": "scatter", "x": [1, 2], "y": [3, 4]}], "layout": {}}
+
+
+@pytest.fixture
+def dashboard(monkeypatch):
+    """Stand-ins for the dashboard loaders, with the history held in a mutable frame."""
+    data = {"history": pd.DataFrame({
+        "period": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-02-01", "2024-02-01"]),
+        "org_code": ["RAL", "RXW", "RAL", "RXW"],
+        "org_name": ["ROYAL FREE", "SHREWSBURY", "ROYAL FREE", "SHREWSBURY"],
+        "attendances_type_1": [100, 200, 100, 50],
+        "over_4hrs_type_1": [40, 50, 30, 10],
+        "pct_seen_within_4hrs": [60.0, 75.0, 70.0, 80.0],
+    })}
+    geo = pd.DataFrame({"org_code": ["RAL"], "patients_12hr_wait": [7]})
+
+    monkeypatch.setattr(snapshot, "load_operational_data", lambda: data["history"].copy())
+    monkeypatch.setattr(snapshot, "load_latest_operational_data", lambda: data["history"].tail(2).copy())
+    monkeypatch.setattr(snapshot, "load_trust_directory",
+                        lambda: data["history"][["org_code", "org_name"]].drop_duplicates())
+    monkeypatch.setattr(snapshot, "load_latest_summary", lambda: pd.DataFrame(
+        {"month": [pd.Timestamp("2024-02-01")], "attendances_type_1": [150], "patients_12hr_wait": [7],
+         "pct_seen_within_4hrs": [73.3]}))
+    monkeypatch.setattr(snapshot, "load_latest_geospatial_data", lambda: geo)
+    monkeypatch.setattr(snapshot, "get_figure", lambda name, **params: FIGURE)
+    return data
+
+
+def test_snapshot_renders_pages_and_only_changed_trusts(dashboard, tmp_path):
+    counts = snapshot.export_snapshot(tmp_path)
+
+    assert counts["trusts_rendered"] == 2
+    for page in ("index", "operational", "geospatial", "trusts/RAL", "trusts/RXW"):
+        assert (tmp_path / f"{page}.html").exists()
+    assert 'href="trusts/RAL.html"' in (tmp_path / "operational.html").read_text()
+    assert '<script src="../plotly.min.js">' in (tmp_path / "trusts" / "RAL.html").read_text()
+    bundle = json.loads((tmp_path / "trusts" / "RXW.json").read_text())
+    assert [row["pct_seen_within_4hrs"] for row in bundle["data"]] == [75.0, 80.0]
+
+    # A revised month for one trust re-renders only that trust's page
+    dashboard["history"].loc[3, "pct_seen_within_4hrs"] = 85.0
+    counts = snapshot.export_snapshot(tmp_path)
+
+    assert (counts["trusts_rendered"], counts["trusts_unchanged"]) == (1, 1)
+    assert "85.0" in (tmp_path / "trusts" / "RXW.html").read_text()
+
+
+def test_pages_of_trusts_no_longer_reported_are_removed(dashboard, tmp_path):
+    snapshot.export_snapshot(tmp_path)
+    dashboard["history"] = dashboard["history"][dashboard["history"]["org_code"] == "RAL"]
+
+    counts = snapshot.export_snapshot(tmp_path)
+
+    assert counts["trusts_removed"] == 1
+    assert not (tmp_path / "trusts" / "RXW.html").exists()
@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.utils.spatial_index import SpatialIndex, haversine_km
+
+# The dashboard modules import through the etl_process package
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from etl_process.src.transform import load_spatial  # noqa: E402
+
+TRUSTS = pd.DataFrame({
+    "org_code": ["RAL", "RKE", "RRV", "RXW", "RBS", "RWD"],
+    "org_name": ["ROYAL FREE", "WHITTINGTON", "UCLH", "SHREWSBURY", "ALDER HEY", "LINCOLN"],
+    "ae_attendances_type_1": [100, 200, 300, 100, 50, 0],
+    "attendances_over_4hrs_type_1": [40, 50, 30, 10, 5, 0],
+    "patients_12hr_wait": [5, 9, 1, 20, 2, 0],
+    "latitude": [51.553, 51.566, 51.524, 52.708, 53.419, None],
+    "longitude": [-0.166, -0.139, -0.136, -2.789, -2.897, -0.523],
+})
+
+
+@pytest.fixture(params=["tree", "scan"])
+def index(request):
+    if request.param == "tree":
+        pytest.importorskip("scipy")
+    return SpatialIndex(TRUSTS, use_tree=request.param == "tree")
+
+
+def test_haversine_km():
+    # London to Manchester is about 262 km
+    assert haversine_km(51.5074, -0.1278, 53.4808, -2.2426) == pytest.approx(262, abs=1)
+    assert haversine_km(51.5, 0.0, 51.5, 0.0) == 0
+
+
+def test_within_returns_points_in_radius_nearest_first(index):
+    nearby = index.within(51.553, -0.166, radius_km=10)
+
+    assert nearby["org_code"].tolist() == ["RAL", "RKE", "RRV"]
+    assert nearby["distance_km"].iloc[0] == 0
+    assert index.within(51.553, -0.166, radius_km=0.5)["org_code"].tolist() == ["RAL"]
+    assert len(index) == 5  # the point without coordinates is dropped
+
+
+def test_nearest_returns_k_points(index):
+    nearest = index.nearest(52.70, -2.77, k=2)
+
+    assert nearest["org_code"].tolist() == ["RXW", "RBS"]
+    assert nearest["distance_km"].is_monotonic_increasing
+    assert len(index.nearest(52.70, -2.77, k=10)) == 5
+
+
+def test_compare_with_neighbours_excludes_the_trust(monkeypatch):
+    monkeypatch.setattr(load_spatial, "load_latest_geospatial_data", lambda: TRUSTS.copy())
+    monkeypatch.setattr(load_spatial, "current_load_version", lambda: "test")
+    monkeypatch.setitem(load_spatial._TRUST_INDEX, "index", None)
+
+    trust, neighbours = load_spatial.compare_with_neighbours("RAL", k=2)
+
+    assert trust["pct_seen_within_4hrs"] == 60.0
+    assert neighbours["org_code"].tolist() == ["RKE", "RRV"]
+    with pytest.raises(KeyError):
+        load_spatial.compare_with_neighbours("RWD")
+
+
+def test_postcode_location_falls_back_to_the_district(monkeypatch, tmp_path):
+    names = tmp_path / "unique_org_names.csv"
+    TRUSTS.assign(postcode=["NW3 2QG", "N19 5NF", "NW1 2BU", "SY3 8XQ", "L12 2AP", "LN2 5QY"]).to_csv(names, index=False)
+    monkeypatch.setattr(load_spatial, "ORG_NAMES_PATH", names)
+    monkeypatch.setattr(load_spatial, "HOSPITAL_PATH", tmp_path / "missing.csv")
+
+    assert load_spatial.postcode_location("nw32qg") == (51.553, -0.166)
+    assert load_spatial.postcode_location("NW3 9ZZ") == (51.553, -0.166)
+    assert load_spatial.postcode_location("ZZ9 9ZZ") is None
@@ -0,0 +1,73 @@
+import pandas as pd
+
+from src.transform.transform_ae import clean_ae_data, drop_seen_rows, stream_clean_ae_data
+from src.transform.ingest import read_ae_file
+from src.utils.processed_store import iter_processed, read_processed, write_processed_batches
+
+CURRENT_CSV = (
+    "Period,Org Code,Org name,A&E attendances Type 1,Attendances over 4hrs Type 1,"
+    "Patients who have waited 12+ hrs from DTA to admission,"
+    "Emergency admissions via A&E - Type 1\n"
+    "MSitAE-JUNE-2023,RWY,CALDERDALE,15048,4214,1,2899\n"
+    "MSitAE-JUNE-2023,RAL,ROYAL FREE,21420,4812,55,4533\n"
+    "MSitAE-JUNE-2023,RWY,CALDERDALE,15048,4214,1,2899\n"
+    "TOTAL,,,36468,9026,56,7432\n"
+)
+
+LEGACY_CSV = (
+    "Period,Org Code,Org name,Number of A&E attendances Type 1,"
+    "Number of attendances over 4hrs Type 1\n"
+    "MSitAE-JANUARY-2020,RAL,ROYAL FREE,21420,4812\n"
+    "MSitAE-JUNE-2023,RAL,ROYAL FREE,21420,4812\n"
+)
+
+
+def test_drop_seen_rows_across_batches():
+    first = pd.DataFrame({"a": [1, 1, 2]})
+    second = pd.DataFrame({"a": [2, 3]})
+
+    batches = list(drop_seen_rows([first, second]))
+
+    assert [b["a"].tolist() for b in batches] == [[1, 2], [3]]
+
+
+def test_stream_clean_matches_in_memory_clean(tmp_path):
+    current = tmp_path / "ae_2023_06.csv"
+    current.write_text(CURRENT_CSV)
+    legacy = tmp_path / "ae_2020_01.csv"
+    legacy.write_text(LEGACY_CSV)
+    files = [str(current), str(legacy)]
+
+    streamed = pd.concat(stream_clean_ae_data(files, chunksize=2), ignore_index=True)
+    in_memory = clean_ae_data([read_ae_file(f) for f in files])
+
+    key = ["period", "org_code"]
+    assert len(streamed) == len(in_memory) == 4
+    # Batches keep fixed storage dtypes; the in-memory frame uses the compact ones
+    pd.testing.assert_frame_equal(
+        streamed.sort_values(key)[key].reset_index(drop=True),
+        in_memory.sort_values(key)[key].astype({"period": "datetime64[ns]", "org_code": "string"})
+        .reset_index(drop=True),
+    )
+    assert streamed["patients_12hr_wait"].isna().sum() == 2
+
+
+def test_write_and_iter_processed_batches(tmp_path):
+    batches = [
+        pd.DataFrame({"period": pd.to_datetime(["2023-12-01"]), "org_code": ["RAL"]}),
+        pd.DataFrame({"period": pd.to_datetime(["2024-01-01", "2024-02-01"]), "org_code": ["RAL", "RJ1"]}),
+    ]
+
+    _, rows = write_processed_batches(batches, "ae", tmp_path)
+    remaining = pd.concat(iter_processed("ae", exclude_periods=["2024-01-01"], processed_dir=tmp_path))
+
+    assert rows == 3
+    assert len(read_processed("ae", processed_dir=tmp_path)) == 3
+    assert sorted(remaining["org_code"]) == ["RAL", "RJ1"]
+
+
+def test_write_processed_batches_with_no_batches(tmp_path):
+    path, rows = write_processed_batches(iter([]), "ae", tmp_path)
+
+    assert rows == 0
+    assert path.is_dir()
@@ -0,0 +1,55 @@
+from datetime import date
+
+from src.load.summaries import SUMMARY_TABLES, refresh_summary_tables
+
+
+class FakeConnection:
+    """SQLAlchemy-style connection recording each statement and its parameters."""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, clause, params=None):
+        self.statements.append((" ".join(str(clause).split()), params, clause))
+
+    def begin(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _rewrites_of(conn, summary):
+    """Return the DELETE and INSERT statements that rewrite one summary table."""
+    prefixes = (f'DELETE FROM "s".{summary}', f'INSERT INTO "s".{summary} ')
+    return [statement for statement in conn.statements if statement[0].startswith(prefixes)]
+
+
+def test_refresh_rebuilds_only_the_changed_periods():
+    conn = FakeConnection()
+
+    refresh_summary_tables(conn, "s", "ae", periods=["2024-01-01", "2024-02-01"])
+
+    for summary, sql in SUMMARY_TABLES.items():
+        delete, refresh = _rewrites_of(conn, summary)
+        assert delete[0] == f'DELETE FROM "s".{summary} WHERE {sql["period_column"]} IN (__[POSTCOMPILE_periods])'
+        assert refresh[0].startswith(f'INSERT INTO "s".{summary}')
+        assert "WHERE period IN (__[POSTCOMPILE_periods])" in refresh[0]
+        for _, params, clause in (delete, refresh):
+            assert clause._bindparams["periods"].expanding
+            assert params == {"periods": [date(2024, 1, 1), date(2024, 2, 1)]}
+
+
+def test_refresh_without_periods_rebuilds_everything():
+    conn = FakeConnection()
+
+    refresh_summary_tables(conn, "s", "ae")
+
+    deletes = [sql for sql, _, _ in conn.statements if sql.startswith("DELETE")]
+    assert deletes == [f'DELETE FROM "s".{summary}' for summary in SUMMARY_TABLES] + ['DELETE FROM "s".ae_latest_12hr']
+    assert not any("POSTCOMPILE" in sql for sql, _, _ in conn.statements)
+    # The latest-period table is always rebuilt from the whole target table
+    assert conn.statements[-1][0].startswith('INSERT INTO "s".ae_latest_12hr')
@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# The dashboard modules import through the etl_process package
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+pytest.importorskip("plotly")
+
+from etl_process.src.transform import warmup  # noqa: E402
+
+
+def test_warm_caches_runs_default_queries_and_figures(monkeypatch):
+    figures = []
+
+    def fake_queries(queries):
+        directory = pd.DataFrame({"org_code": ["RAL", "RXW"], "org_name": ["ROYAL FREE", "SHREWSBURY"]})
+        return {"trust_directory": directory}, {"geospatial_latest": "Timed out after 30 seconds"}
+
+    def fake_figure(name, **params):
+        if name == "geo_map":
+            raise RuntimeError("no bins")
+        figures.append((name, params))
+        return {}
+
+    monkeypatch.setattr(warmup, "run_sql_queries_concurrently", fake_queries)
+    monkeypatch.setattr(warmup, "get_figure", fake_figure)
+
+    report = warmup.warm_caches()
+
+    assert figures == [("national_trend", {}), ("performance_extremes", {}), ("trust_trend", {"org_code": "RAL"})]
+    assert (report["queries"], report["figures"]) == (1, 3)
+    assert set(report["errors"]) == {"geospatial_latest", "geo_map"}
@@ -1,12 +1,38 @@
+import importlib
 import sys
 import os
+import threading
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import streamlit as st
-from nav_pages.home import show_home
-from nav_pages.operational import show_operational
-from nav_pages.geospatial import show_geospatial
 
+# Page name -> (module, function). Pages are imported on first visit rather than
+# at startup, so opening the dashboard only pays for the page being viewed.
+PAGES = {
+    "Overview": ("nav_pages.home", "show_home"),
+    "Operational Pressure": ("nav_pages.operational", "show_operational"),
+    "Geospatial Mapping": ("nav_pages.geospatial", "show_geospatial"),
+}
+
+
+@st.cache_resource
+def start_cache_warmup():
+    """
+    Start warming the query and figure caches in the background, once per server process.
+
+    The warmup re-runs whenever the ETL loads new data. Set DASHBOARD_WARMUP=0 to disable it.
+    """
+    if os.getenv("DASHBOARD_WARMUP", "1").lower() in ("0", "false", "no"):
+        return None
+
+    def warm():
+        # Imported here so the page and plotly imports also happen off the request path
+        from etl_process.src.transform.warmup import warm_on_new_data
+        warm_on_new_data()
+
+    thread = threading.Thread(target=warm, name="dashboard-warmup", daemon=True)
+    thread.start()
+    return thread
 
 
 def main():
@@ -16,26 +42,20 @@ def main():
         layout="wide"
     )
 
-    
+    # Warm the caches in the background (once per server process)
+    start_cache_warmup()
 
     # Sidebar navigation
     st.sidebar.header("Navigation")
     page = st.sidebar.selectbox(
         "Choose a view to explore A&E performance:",
-        [
-            "Overview",
-            "Operational Pressure",
-            "Geospatial Mapping"
-        ]
+        list(PAGES)
     )
 
-    if page == "Overview":
-        show_home()
-    elif page == "Operational Pressure":
-        show_operational()
-    elif page == "Geospatial Mapping":
-        show_geospatial()
-    
+    module_name, function_name = PAGES[page]
+    show_page = getattr(importlib.import_module(module_name), function_name)
+    show_page()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
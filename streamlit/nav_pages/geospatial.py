@@ -1,7 +1,16 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from etl_process.src.transform.load_operational import load_geospatial_data
+from etl_process.src.transform.figures import get_figure
+from etl_process.src.transform.load_operational import load_latest_geospatial_data
+from etl_process.src.transform.load_spatial import compare_with_neighbours, postcode_location, trusts_within
+
+# Map detail options: trust points, or the ETL's hex bins by level (see GEO_BIN_LEVELS)
+MAP_DETAIL = {
+    "Trusts": None,
+    "Local areas": 3,
+    "Areas": 2,
+    "Regions": 1,
+}
 
 def show_geospatial():
     """
@@ -9,24 +18,25 @@ def show_geospatial():
 
     Features:
     - KPI showing total 12-hour waits for the latest period.
-    - Scatter map showing NHS trusts with 12-hour breaches.
+    - Scatter map showing NHS trusts with 12-hour breaches, or the hex bins
+      precomputed by the ETL at a chosen level of detail.
     - Interactive hover showing trust name, patients waiting, and type 1 attendances.
+    - Trusts within a distance of a postcode, and a trust's 4-hour and 12-hour
+      performance compared with its nearest trusts (from the spatial index).
     """
     # Configure Streamlit page
     st.set_page_config(page_title="Geospatial Mapping", layout="wide")
     st.title("🗺️ NHS A&E Pressure: Geospatial View")
 
-    # Load data
-    df = load_geospatial_data()
+    # Load the latest period only
+    latest_df = load_latest_geospatial_data()
 
     # Stop early if no data
-    if df.empty:
+    if latest_df.empty:
         st.warning("No data available to display.")
         st.stop()
 
-    # Filter for latest period
-    latest_period = df["period"].max()
-    latest_df = df[df["period"] == latest_period]
+    latest_period = latest_df["period"].max()
 
     st.markdown(f"Showing trusts with 12-hour waits in **{latest_period.strftime('%B %Y')}**")
 
@@ -37,28 +47,57 @@ def show_geospatial():
         value=f"{total_12hr_waits:,}"
     )
 
-    # Map Visualization
-    fig = px.scatter_mapbox(
-        latest_df,
-        lat="latitude",
-        lon="longitude",
-        hover_name="org_name",
-        hover_data=["patients_12hr_wait", "ae_attendances_type_1"],
-        color="patients_12hr_wait",
-        size="patients_12hr_wait",
-        color_continuous_scale="Reds",  # Red for high 12-hour waits
-        size_max=30,
-        zoom=5,
-        height=600
-    )
+    # Map detail: trusts, or precomputed hex bins so the map gets one point per occupied hex
+    detail = st.radio("Map detail", list(MAP_DETAIL), horizontal=True)
+    level = MAP_DETAIL[detail]
 
-    fig.update_layout(
-        mapbox_style="carto-positron",
-        margin={"r":0,"t":0,"l":0,"b":0},
-        coloraxis_colorbar=dict(title="12-Hour Waits")
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(get_figure("geo_map", level=level), use_container_width=True)
     
     with st.expander("Show full trust-level table"):
         st.dataframe(latest_df.sort_values("patients_12hr_wait", ascending=False).reset_index(drop=True))
+
+    show_nearby_trusts(latest_df)
+
+
+def show_nearby_trusts(latest_df):
+    """Radius search around a postcode and nearest-neighbour comparison for a trust."""
+    st.subheader("Nearby Trusts")
+    columns = ["org_name", "distance_km", "pct_seen_within_4hrs", "patients_12hr_wait", "ae_attendances_type_1"]
+    near_postcode, compare = st.tabs(["Trusts near a postcode", "Compare with nearest trusts"])
+
+    with near_postcode:
+        postcode = st.text_input("Postcode", placeholder="e.g. NW3 2QG")
+        radius_km = st.slider("Distance (km)", min_value=5, max_value=100, value=25, step=5)
+        if postcode:
+            location = postcode_location(postcode)
+            if location is None:
+                st.warning(f"Location of {postcode.upper()} is not known.")
+            else:
+                nearby = trusts_within(*location, radius_km)
+                st.markdown(f"**{len(nearby)}** trusts within {radius_km} km of {postcode.upper()}")
+                st.dataframe(nearby[columns].round(1), hide_index=True)
+
+    with compare:
+        trust_names = dict(zip(latest_df["org_code"].astype(str), latest_df["org_name"].astype(str)))
+        org_code = st.selectbox("Trust", sorted(trust_names, key=trust_names.get), format_func=trust_names.get)
+        k = st.slider("Nearest trusts", min_value=3, max_value=10, value=5)
+        try:
+            trust, neighbours = compare_with_neighbours(org_code, k)
+        except KeyError as e:
+            st.warning(str(e))
+            return
+
+        # Deltas against the neighbours' average; fewer 12-hour waits is better
+        col1, col2 = st.columns(2)
+        col1.metric(
+            "% Seen Within 4hrs",
+            f"{trust['pct_seen_within_4hrs']:.1f}%",
+            f"{trust['pct_seen_within_4hrs'] - neighbours['pct_seen_within_4hrs'].mean():+.1f} pts vs nearest {k}",
+        )
+        col2.metric(
+            "12-Hour Waits",
+            f"{int(trust['patients_12hr_wait']):,}",
+            f"{trust['patients_12hr_wait'] - neighbours['patients_12hr_wait'].mean():+,.0f} vs nearest {k} average",
+            delta_color="inverse",
+        )
+        st.dataframe(neighbours[columns].round(1), hide_index=True)
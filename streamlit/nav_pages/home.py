@@ -1,18 +1,8 @@
 import streamlit as st
-import sys
-from pathlib import Path
-import pandas as pd
-import plotly.express as px
 
-# Ensure project root is in sys.path for clean imports
-project_root = Path(__file__).resolve().parents[3]
-sys.path.append(str(project_root))
-
-from etl_process.src.transform.load_summary import (
-    load_latest_summary,
-    load_national_trends,
-    load_trust_12hr_summary
-)
+# app.py puts the project root on sys.path
+from etl_process.src.transform.figures import get_figure
+from etl_process.src.transform.load_summary import load_home_data
 
 
 def show_home():
@@ -33,37 +23,35 @@ def show_home():
         "from breach rates to extreme delays and geospatial hotspots."
     )
 
-    # --- Load Data ---
-    summary_df = load_latest_summary()
-    trend_df = load_national_trends()
-    trust_df = load_trust_12hr_summary()
+    # --- Load Data (all homepage datasets fetched concurrently) ---
+    home_data, errors = load_home_data()
+    trend_df = home_data.get("trends")
+    trust_df = home_data.get("trust_12hr")
+
+    # Sections whose query failed are skipped; the rest of the page still renders
+    for name, error in errors.items():
+        if name != "trends":
+            st.warning(f"Could not load the {name.replace('_', ' ')} data: {error}")
 
-    # Stop early if any dataset is empty
-    if summary_df.empty or trend_df.empty or trust_df.empty:
+    # Stop early if nothing loaded or every dataset is empty
+    if all(df is None or df.empty for df in (trend_df, trust_df)):
         st.warning("No data available for the selected period.")
         st.stop()
 
-    latest_month = summary_df['month'].max()
-
     # --- Trend Chart: National Performance ---
-    st.subheader("📈 National Performance Over Time")
-    fig = px.line(
-        trend_df,
-        x="month",
-        y="pct_seen_within_4hrs",
-        title="National % Seen Within 4 Hours",
-        markers=True,
-        labels={"pct_seen_within_4hrs": "% Seen Within 4 Hours", "month": "Month"},
-    )
-    fig.update_layout(height=400)
-    st.plotly_chart(fig, use_container_width=True)
-    
-    st.markdown(
-    "This chart shows how the percentage of patients seen within 4 hours at A&E has "
-    "changed over time across all NHS trusts nationally. (2020 - 2025)"
-    )
+    if trend_df is not None and not trend_df.empty:
+        st.subheader("📈 National Performance Over Time")
+        st.plotly_chart(get_figure("national_trend"), use_container_width=True)
+
+        st.markdown(
+            "This chart shows how the percentage of patients seen within 4 hours at A&E has "
+            "changed over time across all NHS trusts nationally. (2020 - 2025)"
+        )
 
     # --- Trusts to Watch: 12-Hour Breaches ---
+    if trust_df is None or trust_df.empty:
+        return
+
     st.subheader("Trusts to Watch — 12-Hour Breaches")
 
     if "org_name" in trust_df.columns and "patients_12hr_wait" in trust_df.columns:
@@ -1,15 +1,11 @@
 import streamlit as st
-import sys
-from pathlib import Path
-import plotly.express as px
-import pandas as pd
 
-# Add project root to sys.path so modules can be imported
-project_root = Path(__file__).resolve().parents[3]
-sys.path.append(str(project_root))
-
-# Import the operational dataset loader
-from etl_process.src.transform.load_operational import load_operational_data
+# Import the operational dataset loaders and cached figures (app.py puts the project root on sys.path)
+from etl_process.src.transform.figures import get_figure
+from etl_process.src.transform.load_operational import (
+    load_latest_operational_data,
+    load_trust_directory,
+)
 
 
 def show_operational():
@@ -32,8 +28,8 @@ def show_operational():
     
     st.header("Operational Pressure")
 
-    # Load operational dataset
-    df = load_operational_data()
+    # Load the latest month only; trust histories are fetched on demand below
+    df = load_latest_operational_data()
     if df is None or df.empty:
         st.error("No data available")
         return
@@ -43,8 +39,7 @@ def show_operational():
 
     # --- KPI Summary Cards (latest month) ---
     latest_period = df_filtered['period'].max()  # Find the most recent period
-    latest_df = df_filtered[df_filtered['period'] == latest_period]  # Filter to latest month
-    latest_df = latest_df[latest_df['attendances_type_1'] > 0]  # Exclude rows with no attendances
+    latest_df = df_filtered[df_filtered['attendances_type_1'] > 0]  # Exclude rows with no attendances
 
     # Calculate KPIs
     total_attendances = latest_df['attendances_type_1'].sum()
@@ -72,46 +67,17 @@ def show_operational():
     # --- Top vs Bottom Performing Trusts ---
     st.subheader(f"Top vs Bottom Performing Trusts – {latest_period.strftime('%B %Y')}")
 
-    # Get top 5 and bottom 5 trusts based on % seen within 4hrs
-    top5 = latest_df.sort_values('pct_seen_within_4hrs', ascending=False).head(5)
-    bottom5 = latest_df.sort_values('pct_seen_within_4hrs').head(5)
-
-    # Label them as "Top" or "Bottom" for chart colouring
-    top5['Performance'] = 'Top'
-    bottom5['Performance'] = 'Bottom'
-    combined = pd.concat([top5, bottom5])
-    combined['Color'] = combined['Performance'].map({'Top': 'blue', 'Bottom': 'red'})
-
-    # Horizontal bar chart showing top vs bottom trusts
-    fig_dual = px.bar(
-        combined,
-        x='pct_seen_within_4hrs',
-        y='org_name',
-        orientation='h',
-        color='Performance',
-        color_discrete_map={'Top': 'blue', 'Bottom': 'red'},
-        labels={'pct_seen_within_4hrs': '% Seen Within 4hrs', 'org_name': 'Trust'}
-    )
-    fig_dual.update_layout(xaxis=dict(ticksuffix='%'), yaxis_title='', xaxis_title='Performance')
-
-    st.plotly_chart(fig_dual, use_container_width=True)
+    # Horizontal bar chart of the five best and worst trusts (cached until the next load)
+    st.plotly_chart(get_figure("performance_extremes"), use_container_width=True)
 
     st.markdown("---")
 
     # --- Trust-Level Performance Over Time ---
     # Dropdown for user to select a trust
-    selected_trust = st.selectbox("Select Trust", df_filtered['org_name'].unique())
-    trust_df = df_filtered[df_filtered['org_name'] == selected_trust]
+    trusts = load_trust_directory()
+    trust_names = dict(zip(trusts['org_code'], trusts['org_name']))
+    selected_code = st.selectbox("Select Trust", list(trust_names), format_func=trust_names.get)
 
     # Line chart showing performance trend over time for the selected trust
-    fig = px.line(
-        trust_df,
-        x='period',
-        y='pct_seen_within_4hrs',
-        title=f"{selected_trust} – % Seen Within 4 Hours Over Time",
-        markers=True,
-        labels={'pct_seen_within_4hrs': '% Seen Within 4hrs', 'period': 'Date'}
-    )
-    fig.update_layout(yaxis=dict(ticksuffix='%'), xaxis_title='Month', yaxis_title='Performance')
-
-    st.plotly_chart(fig, use_container_width=True)
+    # (only the selected trust's rows are fetched, and the figure is cached per trust)
+    st.plotly_chart(get_figure("trust_trend", org_code=selected_code), use_container_width=True)